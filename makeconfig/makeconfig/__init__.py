@@ -1,12 +1,53 @@
 """
 
 """
+import importlib
+
 from .launcher import setup_logging
 
 # configure the logging system first.
 setup_logging()
 
-from . import config
-from .config import ingredients
-from .config import recipes
-from .config.recipes import BaseConfig
\ No newline at end of file
+# loaded on first access so `import makeconfig` doesn't pay for
+# PyOpenColorIO, numpy or colour : {attribute: (module, name in module)}
+_LAZY_ATTRIBUTES = {
+    "config": (".config", None),
+    "ingredients": (".config.ingredients", None),
+    "recipes": (".config.recipes", None),
+    "BaseConfig": (".config.recipes", "BaseConfig"),
+    "benchmark": (".benchmark", None),
+    "benchmark_processors": (".benchmark_processors", None),
+    "buildcache": (".buildcache", None),
+    "cache": (".cache", None),
+    "cli": (".cli", None),
+    "diff": (".diff", None),
+    "imaging": (".imaging", None),
+    "launcher": (".launcher", None),
+    "matrixpack": (".matrixpack", None),
+    "optimize": (".optimize", None),
+    "profiler": (".profiler", None),
+    "regression": (".regression", None),
+    "roundtrip": (".roundtrip", None),
+    "runtime": (".runtime", None),
+    "setup": (".setup", None),
+    "tracing": (".tracing", None),
+    "utils": (".utils", None),
+}
+
+
+def __getattr__(name):
+
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    value = importlib.import_module(module_name, __name__)
+    if attribute:
+        value = getattr(value, attribute)
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
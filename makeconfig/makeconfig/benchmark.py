@@ -0,0 +1,356 @@
+"""
+Benchmark the build pipeline of BaseConfig subclasses.
+
+Each stage is timed separately :
+- init : BaseConfig.__init__ (cook + bake)
+- validate : BaseConfig.validate()
+- serialize : str(BaseConfig)
+- write_to_disk : BaseConfig.write_to_disk() in a temporary directory
+
+The time to import the package in a fresh interpreter can also be checked
+against a budget (setup.IMPORT_BUDGET).
+
+Usage :
+
+    python -m makeconfig.benchmark path/to/Versatile.py:Versatile
+        --repeat 20 --output bench.json --baseline bench.previous.json
+    python -m makeconfig.benchmark --import-budget
+"""
+import argparse
+import json
+import logging
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy
+import PyOpenColorIO as ocio
+
+from . import setup
+from .config.recipes import load_recipe
+
+logger = logging.getLogger("mkc.benchmark")
+
+STAGES = ("init", "validate", "serialize", "write_to_disk")
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def time_stages(recipe, write_dir):
+    """
+    Build the given recipe once and time each stage.
+
+    Args:
+        recipe(type): BaseConfig subclass
+        write_dir(Path): directory where the config is written.
+
+    Returns:
+        dict: stage name: duration in seconds
+    """
+
+    timings = dict()
+
+    start = time.perf_counter()
+    config = recipe()
+    timings["init"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    config.validate()
+    timings["validate"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    str(config)
+    timings["serialize"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    config.write_to_disk(Path(write_dir) / "config.ocio")
+    timings["write_to_disk"] = time.perf_counter() - start
+
+    return timings
+
+
+def summarize(samples):
+    """
+    Args:
+        samples(list of float): durations in seconds
+
+    Returns:
+        dict: statistics for the given samples
+    """
+
+    summary = {
+        "median": statistics.median(samples),
+        "mean": statistics.mean(samples),
+        "min": min(samples),
+        "max": max(samples),
+    }
+    for percentile, value in zip(
+            PERCENTILES,
+            numpy.percentile(samples, PERCENTILES)
+    ):
+        summary[f"p{percentile}"] = float(value)
+    summary["samples"] = list(samples)
+
+    return summary
+
+
+def benchmark(recipe, warmup=2, repeat=10):
+    """
+    Time each stage of the build of the given recipe.
+
+    Args:
+        recipe(type): BaseConfig subclass
+        warmup(int): number of builds performed before timing.
+        repeat(int): number of timed builds.
+
+    Returns:
+        dict: results for this recipe, ready to be serialized to json.
+    """
+
+    samples = {stage: list() for stage in STAGES}
+
+    with tempfile.TemporaryDirectory(prefix="mkc_benchmark_") as write_dir:
+
+        for _ in range(warmup):
+            time_stages(recipe, write_dir)
+
+        for _ in range(repeat):
+            timings = time_stages(recipe, write_dir)
+            for stage in STAGES:
+                samples[stage].append(timings[stage])
+
+    result = {
+        "recipe": recipe.name or recipe.__name__,
+        "warmup": warmup,
+        "repeat": repeat,
+        "stages": {stage: summarize(samples[stage]) for stage in STAGES},
+    }
+
+    logger.info(
+        f"[benchmark] <{result['recipe']}> "
+        + ", ".join([
+            f"{stage}={result['stages'][stage]['median'] * 1000:.3f}ms"
+            for stage in STAGES
+        ])
+    )
+    return result
+
+
+def compare(results, baseline, threshold=0.1):
+    """
+    Find the stages whose median got slower than the baseline.
+
+    Args:
+        results(dict): as returned by run()
+        baseline(dict): as returned by run(), from a previous execution.
+        threshold(float): allowed relative slowdown, 0.1 = 10% slower.
+
+    Returns:
+        list of str: one message per regression, empty if none.
+    """
+
+    regressions = list()
+    baseline_recipes = {
+        result["recipe"]: result for result in baseline["results"]
+    }
+
+    for result in results["results"]:
+
+        baseline_result = baseline_recipes.get(result["recipe"])
+        if not baseline_result:
+            continue
+
+        for stage, summary in result["stages"].items():
+
+            baseline_summary = baseline_result["stages"].get(stage)
+            if not baseline_summary:
+                continue
+
+            limit = baseline_summary["median"] * (1.0 + threshold)
+            if summary["median"] > limit:
+                regressions.append(
+                    f"<{result['recipe']}> {stage}: median "
+                    f"{summary['median'] * 1000:.3f}ms > "
+                    f"{baseline_summary['median'] * 1000:.3f}ms "
+                    f"(+{threshold:.0%} allowed)"
+                )
+
+    return regressions
+
+
+def time_import(module="makeconfig", repeat=5):
+    """
+    Time the import of the module in fresh interpreters with
+    ``python -X importtime``, so the interpreter startup is not included.
+
+    Args:
+        module(str): name of the module to import.
+        repeat(int): number of interpreters started.
+
+    Returns:
+        dict: statistics in seconds, see summarize()
+    """
+
+    pattern = re.compile(
+        rf"^import time:\s+\d+\s+\|\s+(\d+)\s+\|\s{re.escape(module)}$",
+        re.MULTILINE
+    )
+    samples = list()
+
+    for _ in range(repeat):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        match = pattern.search(process.stderr)
+        if not match:
+            raise RuntimeError(
+                f"[time_import] Can't find the import time of <{module}> in:"
+                f"\n{process.stderr}"
+            )
+        samples.append(int(match.group(1)) / 1e6)
+
+    return summarize(samples)
+
+
+def run(recipes, warmup=2, repeat=10):
+    """
+    Args:
+        recipes(list of type): BaseConfig subclasses
+        warmup(int): number of builds performed before timing.
+        repeat(int): number of timed builds.
+
+    Returns:
+        dict: results for all recipes, ready to be serialized to json.
+    """
+    return {
+        "python": platform.python_version(),
+        "ocio": ocio.__version__,
+        "platform": platform.platform(),
+        "results": [
+            benchmark(recipe, warmup=warmup, repeat=repeat)
+            for recipe in recipes
+        ]
+    }
+
+
+def format_table(results):
+    """
+    Args:
+        results(dict): as returned by run()
+
+    Returns:
+        str: human readable table of the medians and percentiles in ms.
+    """
+
+    columns = ["median"] + [f"p{percentile}" for percentile in PERCENTILES[1:]]
+    lines = [
+        f"{'recipe':<20} {'stage':<14} "
+        + " ".join([f"{column:>10}" for column in columns])
+    ]
+    for result in results["results"]:
+        for stage, summary in result["stages"].items():
+            lines.append(
+                f"{result['recipe']:<20} {stage:<14} "
+                + " ".join([
+                    f"{summary[column] * 1000:>10.3f}" for column in columns
+                ])
+            )
+
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Command line entry point.
+
+    Returns:
+        int: exit code, 1 if a regression has been found.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="makeconfig.benchmark",
+        description="Time each stage of the build of BaseConfig subclasses."
+    )
+    parser.add_argument(
+        "recipes",
+        nargs="*",
+        help="module:ClassName or path/to/file.py:ClassName"
+    )
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", type=Path, help="json file to write.")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="json file from a previous run to compare with."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="allowed relative slowdown of the median, 0.1 = 10%%."
+    )
+    parser.add_argument(
+        "--log-level",
+        default="WARNING",
+        help="level of the mkc logger during the builds."
+    )
+    parser.add_argument(
+        "--import-budget",
+        type=float,
+        nargs="?",
+        const=setup.IMPORT_BUDGET,
+        help="fail if the median time of `import makeconfig` is above this "
+             "number of seconds, default to setup.IMPORT_BUDGET."
+    )
+    args = parser.parse_args(argv)
+
+    logging.getLogger("mkc").setLevel(args.log_level)
+
+    exit_code = 0
+    if args.import_budget is not None:
+        import_time = time_import(repeat=args.repeat)["median"]
+        print(
+            f"import makeconfig: {import_time * 1000:.3f}ms "
+            f"(budget {args.import_budget * 1000:.3f}ms)"
+        )
+        if import_time > args.import_budget:
+            print("REGRESSION import makeconfig is over budget")
+            exit_code = 1
+
+    if not args.recipes:
+        return exit_code
+
+    results = run(
+        [load_recipe(spec) for spec in args.recipes],
+        warmup=args.warmup,
+        repeat=args.repeat
+    )
+    print(format_table(results))
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=4), encoding="utf-8")
+        print(f"Results written to <{args.output}>")
+
+    if not args.baseline:
+        return exit_code
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare(results, baseline, threshold=args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+
+    return 1 if regressions else exit_code
+
+
+if __name__ == '__main__':
+
+    sys.exit(main())
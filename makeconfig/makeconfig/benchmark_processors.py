@@ -0,0 +1,412 @@
+"""
+Benchmark the processors of every display/view of a config across
+bit-depths and optimization flags.
+
+For each combination the throughput is measured with imaging.apply_processor()
+and the max error is computed against the float32 unoptimized processor, so
+the fastest path accurate enough can be picked per deployment.
+
+Usage :
+
+    python -m makeconfig.benchmark_processors path/to/config.ocio
+        --bitdepths uint8 half float uint8:float --optimizations default draft
+        --tolerance 0.002 --output processors.json
+"""
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+from pathlib import Path
+
+import numpy
+import PyOpenColorIO as ocio
+
+from . import imaging
+from . import runtime
+
+logger = logging.getLogger("mkc.benchmark_processors")
+
+OPTIMIZATIONS = {
+    "none": ocio.OPTIMIZATION_NONE,
+    "lossless": ocio.OPTIMIZATION_LOSSLESS,
+    "very_good": ocio.OPTIMIZATION_VERY_GOOD,
+    "good": ocio.OPTIMIZATION_GOOD,
+    "draft": ocio.OPTIMIZATION_DRAFT,
+    "default": ocio.OPTIMIZATION_DEFAULT,
+}
+
+
+def parse_bitdepths(value):
+    """
+    Args:
+        value(str): "uint8" for the same input and output bit-depth,
+            "uint8:float" for different ones. See imaging.BIT_DEPTHS.
+
+    Returns:
+        tuple of str: (input bit-depth, output bit-depth)
+    """
+
+    in_bitdepth, _, out_bitdepth = value.partition(":")
+    out_bitdepth = out_bitdepth or in_bitdepth
+    for bitdepth in (in_bitdepth, out_bitdepth):
+        if bitdepth not in imaging.BIT_DEPTHS:
+            raise ValueError(
+                f"bit-depth <{bitdepth}> not supported, expected one of "
+                f"{list(imaging.BIT_DEPTHS)}"
+            )
+
+    return in_bitdepth, out_bitdepth
+
+
+def get_display_views(config):
+    """
+    Args:
+        config(ocio.Config):
+
+    Returns:
+        list of tuple: (display, view) for every view of every display.
+    """
+    return [
+        (display, view)
+        for display in config.getDisplays()
+        for view in config.getViews(display)
+    ]
+
+
+def make_image(width, height, seed=0):
+    """
+    Args:
+        width(int):
+        height(int):
+        seed(int):
+
+    Returns:
+        numpy.ndarray: float32 (height, width, 3) random values in [0-1]
+    """
+    generator = numpy.random.default_rng(seed)
+    return generator.random((height, width, 3), dtype=numpy.float32)
+
+
+def time_processor(create, image, out=None, repeat=3, workers=None):
+    """
+    Time the creation of a processor and its execution on the image, both
+    `repeat` times, keeping the fastest run. Shared by the benchmark and
+    the profiler so they measure the same way.
+
+    Args:
+        create(callable or ocio.CPUProcessor):
+            return a new ocio.CPUProcessor, called each repeat. An already
+            created processor is only executed, creation_ms is then None.
+        image(numpy.ndarray): not modified if out is given.
+        out(numpy.ndarray or None): see imaging.apply_processor()
+        repeat(int): number of timed executions, the fastest is kept.
+        workers(int or None): see imaging.apply_processor()
+
+    Returns:
+        tuple: (dict of timings, last ocio.CPUProcessor created)
+
+    Raises:
+        ocio.Exception: if the processor can't be created.
+    """
+
+    creation = list()
+    if isinstance(create, ocio.CPUProcessor):
+        cpu = create
+    else:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cpu = create()
+            creation.append(time.perf_counter() - start)
+
+    throughput = max([
+        imaging.apply_processor(
+            cpu,
+            image,
+            out=out,
+            workers=workers
+        )["megapixels_per_second"]
+        for _ in range(repeat)
+    ])
+    megapixels = image.shape[0] * image.shape[1] / 1e6
+
+    timings = {
+        "creation_ms": min(creation) * 1000 if creation else None,
+        "megapixels_per_second": throughput,
+        "frame_ms": megapixels / throughput * 1000 if throughput else 0.0,
+    }
+    return timings, cpu
+
+
+def measure(config, src, display, view, in_bitdepth, out_bitdepth,
+            optimization, image, repeat=3, workers=None):
+    """
+    Args:
+        config(ocio.Config):
+        src(str): source colorspace or role.
+        display(str):
+        view(str):
+        in_bitdepth(str): key of imaging.BIT_DEPTHS
+        out_bitdepth(str): key of imaging.BIT_DEPTHS
+        optimization(str): key of OPTIMIZATIONS
+        image(numpy.ndarray): float32 image in [0-1] from make_image()
+        repeat(int): number of timed executions, the fastest is kept.
+        workers(int or None): see imaging.apply_processor()
+
+    Returns:
+        dict: throughput and max error of this combination.
+    """
+
+    source = imaging.from_float(image, imaging.BIT_DEPTHS[in_bitdepth][1])
+    out = numpy.empty(image.shape, dtype=imaging.BIT_DEPTHS[out_bitdepth][1])
+
+    # only the execution is measured, the cached processor can be used.
+    cpu = runtime.get_cpu_processor(
+        config,
+        src,
+        display=display,
+        view=view,
+        optimization=OPTIMIZATIONS[optimization],
+        in_bitdepth=imaging.BIT_DEPTHS[in_bitdepth][0],
+        out_bitdepth=imaging.BIT_DEPTHS[out_bitdepth][0],
+    )
+    timings, _ = time_processor(
+        cpu,
+        source,
+        out=out,
+        repeat=repeat,
+        workers=workers
+    )
+
+    # reference from the exact same input values
+    reference = imaging.to_float(source)
+    cpu_reference = runtime.get_cpu_processor(
+        config,
+        src,
+        display=display,
+        view=view,
+        optimization=ocio.OPTIMIZATION_NONE,
+        in_bitdepth=ocio.BIT_DEPTH_F32,
+        out_bitdepth=ocio.BIT_DEPTH_F32,
+    )
+    imaging.apply_processor(cpu_reference, reference, workers=workers)
+    if numpy.issubdtype(out.dtype, numpy.integer):
+        # integers can't store values outside [0-1]
+        reference = numpy.clip(reference, 0.0, 1.0)
+
+    error = numpy.abs(imaging.to_float(out) - reference)
+    max_error = float(numpy.nanmax(error)) if error.size else 0.0
+
+    return {
+        "display": display,
+        "view": view,
+        "in_bitdepth": in_bitdepth,
+        "out_bitdepth": out_bitdepth,
+        "optimization": optimization,
+        "megapixels_per_second": timings["megapixels_per_second"],
+        "max_error": max_error,
+    }
+
+
+def run(config, src=ocio.ROLE_SCENE_LINEAR, bitdepths=(("float", "float"),),
+        optimizations=("default",), width=1024, height=1024, repeat=3,
+        workers=None):
+    """
+    Measure every display/view of the config for every combination of
+    bit-depths and optimization flags.
+
+    Args:
+        config(ocio.Config):
+        src(str): source colorspace or role.
+        bitdepths(list of tuple): (input, output) keys of imaging.BIT_DEPTHS
+        optimizations(list of str): keys of OPTIMIZATIONS
+        width(int): of the image processed.
+        height(int): of the image processed.
+        repeat(int): number of timed executions per combination.
+        workers(int or None): see imaging.apply_processor()
+
+    Returns:
+        dict: results ready to be serialized to json.
+    """
+
+    image = make_image(width, height)
+    results = list()
+
+    for display, view in get_display_views(config):
+        for in_bitdepth, out_bitdepth in bitdepths:
+            for optimization in optimizations:
+                result = measure(
+                    config,
+                    src,
+                    display,
+                    view,
+                    in_bitdepth,
+                    out_bitdepth,
+                    optimization,
+                    image,
+                    repeat=repeat,
+                    workers=workers
+                )
+                logger.info(
+                    f"[run] {display}/{view} {in_bitdepth}->{out_bitdepth} "
+                    f"{optimization}: "
+                    f"{result['megapixels_per_second']:.1f}MP/s, "
+                    f"max error {result['max_error']:.6f}"
+                )
+                results.append(result)
+
+    return {
+        "python": platform.python_version(),
+        "ocio": ocio.__version__,
+        "platform": platform.platform(),
+        "config": config.getName(),
+        "src": src,
+        "size": [width, height],
+        "results": results,
+    }
+
+
+def fastest(results, tolerance):
+    """
+    Args:
+        results(dict): as returned by run()
+        tolerance(float): max error allowed.
+
+    Returns:
+        dict: fastest result whose max error is below tolerance,
+         per "display/view". None if no result is accurate enough.
+    """
+
+    best = dict()
+    for result in results["results"]:
+
+        key = f"{result['display']}/{result['view']}"
+        best.setdefault(key, None)
+        if result["max_error"] > tolerance:
+            continue
+
+        current = best[key]
+        if (
+                current is None
+                or result["megapixels_per_second"]
+                > current["megapixels_per_second"]
+        ):
+            best[key] = result
+
+    return best
+
+
+def format_table(results, tolerance=None):
+    """
+    Args:
+        results(dict): as returned by run()
+        tolerance(float or None): to mark the fastest result per view.
+
+    Returns:
+        str: human readable table.
+    """
+
+    best = fastest(results, tolerance) if tolerance is not None else dict()
+    best_ids = set([id(result) for result in best.values() if result])
+
+    lines = [
+        f"{'display/view':<32} {'bitdepths':<14} {'optimization':<12} "
+        f"{'MP/s':>9} {'max error':>11}"
+    ]
+    for result in results["results"]:
+        lines.append(
+            f"{result['display'] + '/' + result['view']:<32} "
+            f"{result['in_bitdepth'] + '>' + result['out_bitdepth']:<14} "
+            f"{result['optimization']:<12} "
+            f"{result['megapixels_per_second']:>9.1f} "
+            f"{result['max_error']:>11.6f}"
+            + (" *" if id(result) in best_ids else "")
+        )
+
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Command line entry point.
+
+    Returns:
+        int: exit code, 1 if a view has no combination within tolerance.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="makeconfig.benchmark_processors",
+        description="Measure throughput and error of the display/view "
+                    "processors across bit-depths and optimization flags."
+    )
+    parser.add_argument("config", type=Path, help="path to the config.ocio")
+    parser.add_argument(
+        "--src",
+        default=ocio.ROLE_SCENE_LINEAR,
+        help="source colorspace or role."
+    )
+    parser.add_argument(
+        "--bitdepths",
+        nargs="+",
+        default=list(imaging.BIT_DEPTHS),
+        help="<depth> or <in depth>:<out depth> with depth in "
+             f"{list(imaging.BIT_DEPTHS)}"
+    )
+    parser.add_argument(
+        "--optimizations",
+        nargs="+",
+        default=list(OPTIMIZATIONS),
+        choices=list(OPTIMIZATIONS),
+    )
+    parser.add_argument("--width", type=int, default=1024)
+    parser.add_argument("--height", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.002,
+        help="max error allowed to be picked as the fastest path."
+    )
+    parser.add_argument("--output", type=Path, help="json file to write.")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("mkc").setLevel(args.log_level)
+
+    config = ocio.Config.CreateFromFile(str(args.config))
+    results = run(
+        config,
+        src=args.src,
+        bitdepths=[parse_bitdepths(value) for value in args.bitdepths],
+        optimizations=args.optimizations,
+        width=args.width,
+        height=args.height,
+        repeat=args.repeat,
+        workers=args.workers
+    )
+    print(format_table(results, args.tolerance))
+
+    best = fastest(results, args.tolerance)
+    results["fastest"] = best
+    for key, result in best.items():
+        if result is None:
+            print(f"{key}: no combination within tolerance {args.tolerance}")
+        else:
+            print(
+                f"{key}: {result['in_bitdepth']}>{result['out_bitdepth']} "
+                f"{result['optimization']} "
+                f"({result['megapixels_per_second']:.1f}MP/s)"
+            )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=4), encoding="utf-8")
+        print(f"Results written to <{args.output}>")
+
+    return 1 if None in best.values() else 0
+
+
+if __name__ == '__main__':
+
+    sys.exit(main())
@@ -0,0 +1,320 @@
+"""
+Content-addressed cache of built configs.
+
+The key is a hash of everything that can change the result of a build :
+the recipe sources, the makeconfig sources and data, setup.NUM_ROUND,
+setup.CAT, setup.OPTIMIZE_TRANSFORMS and the python/OCIO/colour-science
+versions. A hit restores the config.ocio and its disk dependencies without
+importing nor cooking the recipe.
+
+    from makeconfig import buildcache
+    buildcache.build("path/to/Versatile.py:Versatile", "config/config.ocio")
+"""
+import hashlib
+import importlib.metadata
+import importlib.util
+import json
+import logging
+import os
+import platform
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from . import setup
+
+logger = logging.getLogger("mkc.buildcache")
+
+MANIFEST_NAME = "manifest.json"
+
+# bump to invalidate all the entries when the storage format change.
+CACHE_VERSION = 1
+
+
+def _package_version(name):
+    """
+    Read from the package metadata to not pay the import of the package.
+
+    Returns:
+        str: version of the installed distribution, empty if not installed.
+    """
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return ""
+
+
+def _makeconfig_files():
+    """
+    Returns:
+        list of Path: makeconfig sources and data that can change a build.
+    """
+
+    root = Path(__file__).parent
+    files = [
+        path for path in root.rglob("*.py")
+        if "tests" not in path.relative_to(root).parts
+    ]
+    if setup.MATRIX_PACK and Path(setup.MATRIX_PACK).exists():
+        files.append(Path(setup.MATRIX_PACK))
+
+    return sorted(files)
+
+
+def build_key(sources):
+    """
+    Args:
+        sources(list of str or Path): recipe files to include in the key.
+
+    Returns:
+        str: hash identifying the result of the build.
+    """
+
+    ocio_version = _package_version("opencolorio")
+    if not ocio_version:
+        # not installed as a distribution, ex: shipped with a DCC
+        import PyOpenColorIO as ocio
+        ocio_version = ocio.__version__
+
+    hasher = hashlib.sha1()
+
+    for name, value in [
+        ("cache", CACHE_VERSION),
+        ("python", platform.python_version()),
+        ("ocio", ocio_version),
+        ("colour", _package_version("colour-science")),
+        ("NUM_ROUND", setup.NUM_ROUND),
+        ("CAT", setup.CAT),
+        ("OPTIMIZE_TRANSFORMS", setup.OPTIMIZE_TRANSFORMS),
+    ]:
+        hasher.update(f"{name}={value}\n".encode("utf-8"))
+
+    root = Path(__file__).parent
+    for path in _makeconfig_files():
+        hasher.update(str(path.relative_to(root.parent)).encode("utf-8"))
+        hasher.update(path.read_bytes())
+
+    for path in sorted([Path(source).resolve() for source in sources]):
+        hasher.update(path.name.encode("utf-8"))
+        hasher.update(path.read_bytes())
+
+    return hasher.hexdigest()
+
+
+class BuildCache:
+    """
+    Store built configs on disk, one directory per key containing the
+    config.ocio, its disk dependencies and a manifest.
+
+    Args:
+        directory(str or Path or None):
+            default to <setup.CACHE_DIR>/builds.
+        maxsize(int or None):
+            max number of builds kept, oldest used are removed first.
+            Default to setup.BUILD_CACHE_SIZE.
+    """
+
+    def __init__(self, directory=None, maxsize=None):
+
+        if directory is None and setup.CACHE_DIR:
+            directory = Path(setup.CACHE_DIR) / "builds"
+        self.directory = Path(directory) if directory else None
+        self.maxsize = maxsize
+
+        return
+
+    def _entry(self, key):
+        return self.directory / key
+
+    def get(self, key):
+        """
+        Args:
+            key(str): as returned by build_key()
+
+        Returns:
+            dict or None: manifest of the build, None if not cached.
+        """
+
+        if not self.directory:
+            return None
+
+        manifest_path = self._entry(key) / MANIFEST_NAME
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        # mark as recently used for the pruning
+        try:
+            os.utime(str(manifest_path))
+        except OSError:
+            pass
+        return manifest
+
+    def restore(self, key, write_path):
+        """
+        Write the cached config and its dependencies. Files already
+        up-to-date are not written.
+
+        Args:
+            key(str): as returned by build_key()
+            write_path(str or Path): path of the config.ocio file to write.
+
+        Returns:
+            bool: False if the build is not cached.
+        """
+
+        manifest = self.get(key)
+        if manifest is None:
+            return False
+
+        # imported only when there is something to restore
+        from .config.ingredients import DiskDependency
+
+        entry = self._entry(key)
+        write_path = Path(write_path).absolute()
+
+        DiskDependency(
+            write_path.name,
+            (entry / manifest["config"]).read_bytes()
+        ).write(write_path.parent)
+
+        for path_relative in manifest["dependencies"]:
+            DiskDependency(
+                path_relative,
+                (entry / "files" / path_relative).read_bytes()
+            ).write(write_path.parent)
+
+        logger.info(
+            "[BuildCache][restore] <%s> restored from <%s> to <%s>",
+            manifest["recipe"],
+            entry,
+            write_path
+        )
+        return True
+
+    def store(self, key, config, recipe=""):
+        """
+        Args:
+            key(str): as returned by build_key()
+            config(BaseConfig): built config.
+            recipe(str): name stored in the manifest for information.
+        """
+
+        if not self.directory:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # built in a temporary directory, then renamed, so concurrent builds
+        # never see a partial entry.
+        tmp_dir = Path(tempfile.mkdtemp(dir=str(self.directory), prefix=".tmp"))
+        try:
+
+            (tmp_dir / "config.ocio").write_text(str(config), encoding="utf-8")
+            for dependency in config.disk_dependencies:
+                dependency.write(tmp_dir / "files")
+
+            manifest = {
+                "key": key,
+                "recipe": recipe,
+                "created": time.time(),
+                "config": "config.ocio",
+                "dependencies": [
+                    dependency.path_relative.as_posix()
+                    for dependency in config.disk_dependencies
+                ],
+            }
+            (tmp_dir / MANIFEST_NAME).write_text(
+                json.dumps(manifest, indent=4),
+                encoding="utf-8"
+            )
+
+            entry = self._entry(key)
+            if entry.exists():
+                shutil.rmtree(str(entry), ignore_errors=True)
+            os.replace(str(tmp_dir), str(entry))
+
+        except OSError as excp:
+            logger.warning(
+                "[BuildCache][store] Can't store <%s>: %s", key, excp
+            )
+            return
+        finally:
+            if tmp_dir.exists():
+                shutil.rmtree(str(tmp_dir), ignore_errors=True)
+
+        self.prune()
+        return
+
+    def prune(self):
+        """
+        Remove the least recently used builds above maxsize.
+        """
+
+        maxsize = self.maxsize or setup.BUILD_CACHE_SIZE
+        if not self.directory or not self.directory.exists():
+            return
+
+        entries = [
+            path for path in self.directory.iterdir()
+            if (path / MANIFEST_NAME).exists()
+        ]
+        entries.sort(key=lambda path: (path / MANIFEST_NAME).stat().st_mtime)
+        for path in entries[:max(len(entries) - maxsize, 0)]:
+            shutil.rmtree(str(path), ignore_errors=True)
+            logger.debug("[BuildCache][prune] Removed <%s>", path)
+
+        return
+
+    def clear(self):
+        """
+        Remove all the cached builds.
+        """
+        if self.directory and self.directory.exists():
+            shutil.rmtree(str(self.directory), ignore_errors=True)
+        return
+
+
+def build(spec, write_path, validate=True, use_cache=True, sources=None,
+          cache=None):
+    """
+    Build the recipe and write it, or restore it from the cache if nothing
+    that could change the result changed since it was cached.
+
+    Args:
+        spec(str): "path/to/file.py:ClassName", see recipes.load_recipe()
+        write_path(str or Path): path of the config.ocio file to write.
+        validate(bool): True to call validate() on the config when built.
+        use_cache(bool): False to always build (the result is still cached).
+        sources(list of str or Path or None):
+            files the recipe depends on, default to the file of the spec
+            (or of the module).
+        cache(BuildCache or None): default to a BuildCache in setup.CACHE_DIR
+
+    Returns:
+        bool: True if restored from the cache.
+    """
+
+    if sources is None:
+        source = spec.rpartition(":")[0]
+        if not source.endswith(".py"):
+            source = importlib.util.find_spec(source).origin
+        sources = [source]
+    cache = cache or BuildCache()
+
+    key = build_key(sources)
+    if use_cache and cache.restore(key, write_path):
+        return True
+
+    # only paid when the recipe is cooked
+    from .config import recipes
+
+    config = recipes.load_recipe(spec)()
+    if validate:
+        config.validate()
+    config.write_to_disk(write_path)
+    cache.store(key, config, recipe=spec.rpartition(":")[2])
+
+    logger.info("[build] <%s> built and cached as <%s>", spec, key)
+    return False
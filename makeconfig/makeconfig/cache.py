@@ -0,0 +1,333 @@
+"""
+
+"""
+import atexit
+import collections
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy
+
+from . import setup
+
+logger = logging.getLogger("mkc.cache")
+
+
+def write_json(path, data):
+    """
+    Write to a temporary file first then move it, so concurrent processes
+    never read a partially written file.
+
+    Args:
+        path(Path): json file to write, parent directories are created.
+        data(dict or list): json serializable.
+
+    Raises:
+        OSError: if the file can't be written.
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=str(path.parent),
+        prefix=f".{path.stem}.",
+        suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+            json.dump(data, tmp_file)
+        os.replace(tmp_path, str(path))
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    return
+
+
+class JsonStore:
+    """
+    Values stored in a json file in setup.CACHE_DIR, shared between
+    processes. The file is read lazily, new entries are written when save()
+    is called or when the interpreter exits, if setup.CACHE_DIR is set at
+    that time.
+
+    Keys must be tuples of objects that can be converted to string, values
+    must be json serializable.
+
+    Args:
+        name(str): json file name on disk.
+    """
+
+    def __init__(self, name):
+
+        self.name = name
+
+        self._disk = None  # type: dict  # loaded lazily
+        self._pending = dict()  # entries not written to disk yet
+        self._lock = threading.RLock()
+        self._atexit_registered = False
+
+        return
+
+    @property
+    def path(self):
+        """
+        Returns:
+            Path or None: json file, None if setup.CACHE_DIR is disabled.
+        """
+        if not setup.CACHE_DIR:
+            return None
+        return Path(setup.CACHE_DIR) / f"{self.name}.json"
+
+    @staticmethod
+    def _key_to_str(key):
+        return "|".join(map(str, key))
+
+    def _read_disk(self):
+
+        path = self.path
+        if not path or not path.exists():
+            return dict()
+
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as excp:
+            logger.warning(
+                "[%s][_read_disk] Can't read <%s>, file ignored: %s",
+                self.__class__.__name__, path, excp
+            )
+
+        return dict()
+
+    def save(self):
+        """
+        Write the entries added since the last save to the json file.
+        Entries written by other processes in the meantime are preserved.
+        """
+
+        path = self.path
+
+        with self._lock:
+
+            if not path or not self._pending:
+                return
+
+            self._disk = self._read_disk()
+            self._disk.update(self._pending)
+
+            try:
+                write_json(path, self._disk)
+            except OSError as excp:
+                logger.warning(
+                    "[%s][save] Can't write <%s>: %s",
+                    self.__class__.__name__, path, excp
+                )
+                return
+
+            self._pending.clear()
+
+        return
+
+    def _get(self, key):
+        """
+        Args:
+            key(str): as returned by _key_to_str()
+
+        Returns:
+            object or None: stored value, None if missing.
+        """
+
+        with self._lock:
+
+            if self._disk is None:
+                self._disk = self._read_disk()
+
+            return self._pending.get(key, self._disk.get(key))
+
+    def _set(self, key, value):
+        """
+        Args:
+            key(str): as returned by _key_to_str()
+            value: json serializable, written on save()
+        """
+
+        with self._lock:
+
+            self._pending[key] = value
+
+            # only flush at exit when there is something to write,
+            # save() checks setup.CACHE_DIR at that time.
+            if not self._atexit_registered:
+                atexit.register(self.save)
+                self._atexit_registered = True
+
+        return
+
+    def get(self, key):
+        """
+        Args:
+            key(tuple):
+
+        Returns:
+            object or None: stored value, None if missing.
+        """
+        return self._get(self._key_to_str(key))
+
+    def set(self, key, value):
+        """
+        Args:
+            key(tuple):
+            value: json serializable, written on save()
+        """
+        self._set(self._key_to_str(key), value)
+        return
+
+    def clear(self, disk=False):
+        """
+        Forget the entries read from disk.
+        Entries not saved yet are written to disk first.
+
+        Args:
+            disk(bool): if True also delete the json file on disk.
+        """
+
+        with self._lock:
+
+            if not disk:
+                self.save()
+
+            self._pending.clear()
+            self._disk = None
+
+            path = self.path
+            if disk and path and path.exists():
+                path.unlink()
+
+        return
+
+
+class MatrixCache(JsonStore):
+    """
+    Cache of numpy matrices with a LRU eviction in memory and a json file
+    on disk so results survive between processes (see JsonStore).
+
+    Args:
+        name(str): name of the cache, used as the json file name on disk.
+        maxsize(int or None): max number of matrices kept in memory,
+            default to setup.CACHE_SIZE.
+    """
+
+    def __init__(self, name, maxsize=None):
+
+        super().__init__(name)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        self._memory = collections.OrderedDict()
+
+        return
+
+    def __len__(self):
+        return len(self._memory)
+
+    def get(self, key):
+        """
+        Args:
+            key(tuple):
+
+        Returns:
+            numpy.ndarray or None: copy of the cached matrix, None if missing.
+        """
+
+        key = self._key_to_str(key)
+
+        with self._lock:
+
+            matrix = self._memory.get(key)
+
+            if matrix is None:
+
+                value = self._get(key)
+                if value is None:
+                    self.misses += 1
+                    return None
+
+                matrix = numpy.array(value)
+                self._store(key, matrix)
+                self.disk_hits += 1
+
+            else:
+                self._memory.move_to_end(key)
+
+            self.hits += 1
+
+        return matrix.copy()
+
+    def set(self, key, matrix):
+        """
+        Add the given matrix to the memory cache and schedule it to be
+        written on disk.
+
+        Args:
+            key(tuple):
+            matrix(numpy.ndarray):
+        """
+
+        key = self._key_to_str(key)
+        matrix = numpy.array(matrix)
+
+        with self._lock:
+            self._store(key, matrix)
+            self._set(key, matrix.tolist())
+
+        return
+
+    def _store(self, key, matrix):
+
+        maxsize = setup.CACHE_SIZE if self.maxsize is None else self.maxsize
+
+        self._memory[key] = matrix
+        self._memory.move_to_end(key)
+        while len(self._memory) > maxsize:
+            self._memory.popitem(last=False)
+
+        return
+
+    def clear(self, disk=False):
+        """
+        Empty the memory cache and reset the counters.
+        Entries not saved yet are written to disk first.
+
+        Args:
+            disk(bool): if True also delete the json file on disk.
+        """
+
+        with self._lock:
+
+            super().clear(disk=disk)
+            self._memory.clear()
+            self.hits = 0
+            self.misses = 0
+            self.disk_hits = 0
+
+        return
+
+    def info(self):
+        """
+        Returns:
+            dict: statistics about the cache usage.
+        """
+        maxsize = setup.CACHE_SIZE if self.maxsize is None else self.maxsize
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "size": len(self._memory),
+            "maxsize": maxsize,
+        }
@@ -0,0 +1,296 @@
+"""
+Command line interface of makeconfig, run with `python -m makeconfig`.
+
+    python -m makeconfig build path/to/recipes/ --output-dir ./build --workers 8
+"""
+import argparse
+import concurrent.futures
+import logging
+import os
+import sys
+import time
+import traceback
+from pathlib import Path
+
+from .config import recipes
+
+logger = logging.getLogger("mkc.cli")
+
+# recipes already imported in this process, reused between tasks
+_RECIPES_LOADED = dict()
+
+
+def _init_worker(log_level, preload_colour):
+    """
+    Executed once when a worker process start so the heavy imports are
+    not paid for each recipe built by this worker.
+
+    Args:
+        log_level(str): level for the mkc logger.
+        preload_colour(bool): True to also import colour-science.
+    """
+
+    logging.getLogger("mkc").setLevel(log_level)
+
+    import PyOpenColorIO  # noqa: F401
+
+    if preload_colour:
+        import colour  # noqa: F401
+
+    return
+
+
+def build_recipe(spec, output_path, validate=True):
+    """
+    Build, validate and write the given recipe.
+    Never raise, errors are returned in the result.
+
+    Args:
+        spec(str): "path/to/file.py:ClassName" or "package.module:ClassName"
+        output_path(str or Path): path of the config.ocio file to write.
+        validate(bool): True to call validate() on the config.
+
+    Returns:
+        dict: timings in seconds for each stage and error traceback if any.
+    """
+
+    result = {
+        "spec": spec,
+        "recipe": spec.rpartition(":")[2],
+        "output": str(output_path),
+        "pid": os.getpid(),
+        "error": None,
+    }
+    start = time.perf_counter()
+
+    try:
+
+        stage_start = time.perf_counter()
+        recipe = _RECIPES_LOADED.get(spec)
+        if recipe is None:
+            recipe = recipes.load_recipe(spec)
+            _RECIPES_LOADED[spec] = recipe
+        result["recipe"] = recipe.name or recipe.__name__
+        result["load"] = time.perf_counter() - stage_start
+
+        stage_start = time.perf_counter()
+        config = recipe()
+        result["cook"] = time.perf_counter() - stage_start
+
+        stage_start = time.perf_counter()
+        if validate:
+            config.validate()
+        result["validate"] = time.perf_counter() - stage_start
+
+        stage_start = time.perf_counter()
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        config.write_to_disk(output_path)
+        result["write"] = time.perf_counter() - stage_start
+
+    except Exception:
+        result["error"] = traceback.format_exc()
+
+    result["total"] = time.perf_counter() - start
+    return result
+
+
+def recipe_output_path(spec, output_dir):
+    """
+    Args:
+        spec(str): "path/to/file.py:ClassName" or "package.module:ClassName"
+        output_dir(str or Path): root directory for the configs.
+
+    Returns:
+        Path: <output_dir>/<file stem or module>/<ClassName>/config.ocio
+    """
+
+    source, _, class_name = spec.rpartition(":")
+    if source.endswith(".py"):
+        source = Path(source).stem
+    return Path(output_dir) / source / class_name / "config.ocio"
+
+
+def build_recipes(specs, output_dir, workers=None, validate=True,
+                  log_level="WARNING", preload_colour=False):
+    """
+    Build the given recipes in a pool of processes.
+
+    Each config is written to the path given by recipe_output_path(),
+    duplicated specs are only built once.
+
+    Args:
+        specs(list of str): recipes specifications, see load_recipe()
+        output_dir(str or Path): root directory for the configs.
+        workers(int or None):
+            number of processes, os.cpu_count() if None,
+            0 to build in the current process.
+        validate(bool): True to call validate() on each config.
+        log_level(str): level for the mkc logger in the workers.
+        preload_colour(bool): True to import colour-science in each worker
+            when it starts.
+
+    Returns:
+        list of dict: result of build_recipe() for each unique spec, same
+         order.
+
+    Raises:
+        ValueError: if two specs would write the same config.
+    """
+
+    specs = list(dict.fromkeys(specs))
+
+    outputs = dict()
+    for spec in specs:
+        output_path = recipe_output_path(spec, output_dir)
+        if output_path in outputs:
+            raise ValueError(
+                f"Recipes <{outputs[output_path]}> and <{spec}> would both "
+                f"be written to <{output_path}>"
+            )
+        outputs[output_path] = spec
+
+    tasks = [
+        (spec, output_path, validate)
+        for output_path, spec in outputs.items()
+    ]
+
+    if workers == 0:
+        return [build_recipe(*task) for task in tasks]
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks)) or 1
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(log_level, preload_colour),
+    ) as executor:
+        futures = [executor.submit(build_recipe, *task) for task in tasks]
+        results = [future.result() for future in futures]
+
+    return results
+
+
+def format_summary(results, duration):
+    """
+    Args:
+        results(list of dict): as returned by build_recipes()
+        duration(float): wall time of the whole build in seconds.
+
+    Returns:
+        str: human readable table of the timings in ms.
+    """
+
+    columns = ("load", "cook", "validate", "write", "total")
+    lines = [
+        f"{'recipe':<24} {'status':<7} {'pid':>7} "
+        + " ".join([f"{column:>10}" for column in columns])
+    ]
+    for result in results:
+        status = "FAILED" if result["error"] else "ok"
+        lines.append(
+            f"{result['recipe']:<24} {status:<7} {result['pid']:>7} "
+            + " ".join([
+                f"{result.get(column, 0.0) * 1000:>10.1f}"
+                for column in columns
+            ])
+        )
+
+    cpu_time = sum([result["total"] for result in results])
+    lines.append(
+        f"{len(results)} recipes built in {duration:.3f}s "
+        f"(sum of builds {cpu_time:.3f}s)"
+    )
+    return "\n".join(lines)
+
+
+def _cmd_build(args):
+
+    specs = list()
+    for source in args.recipes:
+        if ":" in source and not Path(source).exists():
+            specs.append(source)
+        else:
+            specs.extend(recipes.discover_recipes(source))
+
+    if not specs:
+        print("No recipe found.")
+        return 1
+
+    start = time.perf_counter()
+    try:
+        results = build_recipes(
+            specs,
+            output_dir=args.output_dir,
+            workers=args.workers,
+            validate=not args.no_validate,
+            log_level=args.log_level,
+            preload_colour=args.preload_colour,
+        )
+    except ValueError as excp:
+        print(excp)
+        return 1
+    duration = time.perf_counter() - start
+
+    for result in results:
+        if result["error"]:
+            print(f"[{result['recipe']}] {result['spec']} failed:")
+            print(result["error"])
+
+    print(format_summary(results, duration))
+
+    return 1 if any([result["error"] for result in results]) else 0
+
+
+def main(argv=None):
+    """
+    Command line entry point.
+
+    Returns:
+        int: exit code
+    """
+
+    parser = argparse.ArgumentParser(prog="makeconfig")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    parser_build = subparsers.add_parser(
+        "build",
+        help="build, validate and write recipes in parallel."
+    )
+    parser_build.add_argument(
+        "recipes",
+        nargs="+",
+        help=(
+            "python files or directories to search for BaseConfig "
+            "subclasses, or explicit module:ClassName/file.py:ClassName."
+        )
+    )
+    parser_build.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path("build"),
+        help="configs are written to "
+             "<output-dir>/<file stem or module>/<ClassName>/config.ocio"
+    )
+    parser_build.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="number of processes, default to the number of cpus, 0 to "
+             "build in the current process."
+    )
+    parser_build.add_argument("--no-validate", action="store_true")
+    parser_build.add_argument("--preload-colour", action="store_true")
+    parser_build.add_argument("--log-level", default="WARNING")
+    parser_build.set_defaults(func=_cmd_build)
+
+    args = parser.parse_args(argv)
+
+    logging.getLogger("mkc").setLevel(args.log_level)
+
+    return args.func(args)
+
+
+if __name__ == '__main__':
+
+    sys.exit(main())
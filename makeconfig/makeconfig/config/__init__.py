@@ -1,5 +1,29 @@
 """
 
 """
-from . import ingredients
-from . import recipes
+import importlib
+
+# loaded on first access, see makeconfig.__init__
+_LAZY_ATTRIBUTES = {
+    "constants": (".constants", None),
+    "ingredients": (".ingredients", None),
+    "recipes": (".recipes", None),
+}
+
+
+def __getattr__(name):
+
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    value = importlib.import_module(module_name, __name__)
+    if attribute:
+        value = getattr(value, attribute)
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
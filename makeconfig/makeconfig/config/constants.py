@@ -0,0 +1,38 @@
+"""
+We defined "data" classes to hold names used in various parameters.
+This avoid human-mistakes as typos and give auto-completions to 
+see availables options.
+
+Kept free of heavy imports so tools only needing the names don't pay for
+PyOpenColorIO.
+"""
+
+
+class Families:
+    """
+    arbitrary
+    """
+    scene = "Scene"
+    display = "Display"
+    aces = "ACES"
+
+
+class Categories:
+    """
+    arbitrary
+    """
+    input = "input"
+    workspace = "workspace"
+    output = "output"
+
+
+class Encodings:
+    """
+    standard defined in OCIO doc, can add new ones.
+    """
+    scene_linear = "scene-linear"  # numeric repr proportional to scene luminance.
+    display_linear = "display-linear"  # numeric repr proportional to display luminance.
+    log = "log"  # numeric repr roughly proportional to the logarithm of scene-luminance
+    sdr_video = "sdr-video"  # numeric repr proportional to sdr video signal.
+    hdr_video = "hdr-video"  # numeric repr proportional to hdr video signal.
+    data = "data"  # A non-color channel. (usually + isdata attribute = true.)
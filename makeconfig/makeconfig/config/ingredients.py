@@ -1,14 +1,19 @@
 """
 
 """
+import hashlib
 import json
 import logging
+import os
+import tempfile
 from abc import ABC, abstractproperty
 from pathlib import Path
 from typing import List, Tuple
 
 import PyOpenColorIO as ocio
 
+from .constants import Families, Categories, Encodings
+
 logger = logging.getLogger("mkc.config.ingredients")
 
 __all__ = [
@@ -20,49 +25,14 @@ __all__ = [
     "ColorspaceDisplay",
     "Display",
     "View",
+    "attach_views",
     "Look",
     "ViewTransform",
     "NamedTransform",
-    "DiskDependency"
+    "DiskDependency",
+    "BakedView"
 ]
 
-"""----------------------------------------------------------------------------
-We defined "data" classes to hold names used in various parameters.
-This avoid human-mistakes as typos and give auto-completions to 
-see availables options.
-"""
-
-
-class Families:
-    """
-    arbitrary
-    """
-    scene = "Scene"
-    display = "Display"
-    aces = "ACES"
-
-
-class Categories:
-    """
-    arbitrary
-    """
-    input = "input"
-    workspace = "workspace"
-    output = "output"
-
-
-class Encodings:
-    """
-    standard defined in OCIO doc, can add new ones.
-    """
-    scene_linear = "scene-linear"  # numeric repr proportional to scene luminance.
-    display_linear = "display-linear"  # numeric repr proportional to display luminance.
-    log = "log"  # numeric repr roughly proportional to the logarithm of scene-luminance
-    sdr_video = "sdr-video"  # numeric repr proportional to sdr video signal.
-    hdr_video = "hdr-video"  # numeric repr proportional to hdr video signal.
-    data = "data"  # A non-color channel. (usually + isdata attribute = true.)
-
-
 """----------------------------------------------------------------------------
 These classes represent OCIO config components. SOme of them subclass the one
 define in the OCIO python package while other are created from scratch.
@@ -195,6 +165,79 @@ class Look(BaseOCIOComponent, ocio.Look):
         return self.getName()
 
 
+class OrderedSet:
+    """
+    Set keeping the insertion order, with O(1) membership test.
+    Used to store the Display/View relationships.
+
+    Args:
+        items(iterable or None):
+    """
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items=None):
+        self._items = dict.fromkeys(items or ())
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        return list(self._items)[index]
+
+    def __repr__(self):
+        return f"OrderedSet({list(self._items)})"
+
+    def add(self, item):
+        """
+        Returns:
+            bool: False if the item was already in the set.
+        """
+        if item in self._items:
+            return False
+        self._items[item] = None
+        return True
+
+    def discard(self, item):
+        self._items.pop(item, None)
+
+
+def _link(display, view):
+    """
+    Register the relationship on both sides, without the two objects
+    calling each other.
+
+    Args:
+        display(Display):
+        view(View):
+    """
+    display.views.add(view)
+    view.parents.add(display)
+    return
+
+
+def attach_views(displays, views):
+    """
+    Add all the given views to all the given displays.
+    Linear in the number of display/view pairs.
+
+    Args:
+        displays(list of Display):
+        views(list of View):
+    """
+    views = list(views)
+    for display in displays:
+        for view in views:
+            _link(display, view)
+    return
+
+
 class Display(BaseOCIOComponent):
 
     def __init__(self, name, views=None):
@@ -205,12 +248,11 @@ class Display(BaseOCIOComponent):
             views(list or tuple or set or View): list or tuple of View instances.
         """
         self._name = str()
-        self.views = list()
+        self.views = OrderedSet()
         self.name = str(name)
 
-        if isinstance(views, (list, tuple, set)):
-            for view in views:
-                self.add_view(view=view)
+        if isinstance(views, (list, tuple, set, OrderedSet)):
+            self.add_views(views)
         elif isinstance(views, View):
             self.add_view(view=views)
         else:
@@ -227,9 +269,17 @@ class Display(BaseOCIOComponent):
         Args:
             view(View):
         """
-        if view not in self.views:
-            self.views.append(view)
-            view.add_parent(parent=self)
+        _link(self, view)
+        return
+
+    def add_views(self, views):
+        """ Add multiple Views to this Display, order is preserved.
+
+        Args:
+            views(list or tuple or set or OrderedSet): of View
+        """
+        for view in views:
+            _link(self, view)
         return
 
     @property
@@ -283,7 +333,7 @@ class View(BaseOCIOComponent):
             rule_name(str or None)
         """
         self._name = str()
-        self.parents = list()
+        self.parents = OrderedSet()
         self.looks = str()
 
         self.name = name
@@ -305,9 +355,9 @@ class View(BaseOCIOComponent):
         # apply the parent/children system for Display/View
         if not parents:
             pass
-        elif isinstance(parents, (list, tuple, set)):
+        elif isinstance(parents, (list, tuple, set, OrderedSet)):
             for parent in parents:
-                self.add_parent(parent=parent)
+                _link(parent, self)
         elif isinstance(parents, Display):
             self.add_parent(parent=parents)
         else:
@@ -341,9 +391,7 @@ class View(BaseOCIOComponent):
         Args:
             parent(Display):
         """
-        if parent not in self.parents:
-            self.parents.append(parent)
-            parent.add_view(view=self)
+        _link(parent, self)
         return
 
     def validate(self):
@@ -424,7 +472,7 @@ class NamedTransform(BaseOCIOComponent, ocio.NamedTransform):
             inverse_transform,
             categories if categories else list(),
         )
-        self.setEncoding(encodig=encoding)
+        self.setEncoding(encoding=encoding)
         return
 
     @property
@@ -451,7 +499,7 @@ class DiskDependency:
 
         Args:
             path_relative (str or Path):
-            data (str): data to write
+            data (str or bytes): data to write
             write_encoding (str): python.codecs encoding for write
 
         """
@@ -459,23 +507,315 @@ class DiskDependency:
         self.data = data
         self.encoding = write_encoding
 
+    def __str__(self) -> str:
+        return self.path_relative.as_posix()
+
+    @property
+    def data_bytes(self):
+        """
+        Returns:
+            bytes: data encoded as it will be written on disk.
+        """
+        if isinstance(self.data, bytes):
+            return self.data
+        return self.data.encode(self.encoding)
+
+    @staticmethod
+    def _hash(data):
+        return hashlib.sha1(data).hexdigest()
+
     def write(self, path):
         """
         Write to disk.
 
+        The data is written to a temporary file which is then renamed, so the
+        file is never partially written. Nothing is written if the file on
+        disk already has the same content, to preserve its modification time.
+
         Args:
-            path(str or Path):
+            path(str or Path): directory of the config.ocio file.
 
+        Returns:
+            bool: False if the file was already up-to-date.
         """
 
         write_path = Path(path) / self.path_relative
         write_path = write_path.resolve()
-        write_path.write_text(self.data, encoding=self.encoding)
+        data = self.data_bytes
+
+        if (
+                write_path.exists()
+                and write_path.stat().st_size == len(data)
+                and self._hash(write_path.read_bytes()) == self._hash(data)
+        ):
+            logger.debug(
+                "[DiskDependency][write] <%s> is up-to-date.", write_path
+            )
+            return False
+
+        write_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=str(write_path.parent),
+            prefix=f".{write_path.name}.",
+            suffix=".tmp"
+        )
+        # mkstemp create the file only readable by the owner
+        mode = write_path.stat().st_mode if write_path.exists() else 0o644
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, str(write_path))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
 
         if not write_path.exists():
             raise FileNotFoundError(
                 f"The file <{write_path}> doesn't exists on disk while it should."
             )
 
-        logger.info(f"[DiskDependency][write] Finished writing to <{write_path}>")
-        return
+        logger.info(
+            "[DiskDependency][write] Finished writing to <%s>", write_path
+        )
+        return True
+
+
+class BakedView:
+
+    # formats from ocio.Baker.getFormats() and the extension of their file
+    formats = {
+        "resolve_cube": "cube",
+        "iridas_cube": "cube",
+        "cinespace": "csp",
+        "clf": "clf",
+        "houdini": "lut",
+        "spi3d": "spi3d",
+        "truelight": "cub",
+    }
+
+    shaper_name = "__mkc_lut_shaper__"
+
+    def __init__(
+            self,
+            display,
+            view,
+            input_space=ocio.ROLE_SCENE_LINEAR,
+            shaper_space=None,
+            shaper_range=(-10.0, 8.0),
+            cube_size=33,
+            shaper_size=4096,
+            lut_format="resolve_cube",
+            fallback=True,
+    ):
+        """
+        A display/view pair to bake as a shaper + 3D LUT written next to the
+        config.ocio. Added to the config with BaseConfig.add().
+
+        The LUT convert <input_space> to the display/view encoding so hosts
+        without (full) OCIO v2 support only perform a LUT lookup.
+
+        Args:
+            display(str or Display):
+            view(str or View):
+            input_space(str): colorspace or role the LUT expects as input.
+            shaper_space(str or None):
+                colorspace used as 1D shaper, must not have channel crosstalk.
+                If None, one is generated from <shaper_range>.
+            shaper_range(tuple or None):
+                (min, max) in log2 stops of <input_space> covered by the
+                generated shaper. None to bake a 3D LUT without shaper,
+                only valid for input spaces in the [0-1] range.
+            cube_size(int): size of the 3D LUT.
+            shaper_size(int): size of the 1D shaper.
+            lut_format(str): one of the keys of BakedView.formats.
+            fallback(bool):
+                True to add a "<view> (LUT)" view to the display using the
+                baked LUT.
+        """
+
+        if lut_format not in self.formats:
+            raise ValueError(
+                f"lut_format <{lut_format}> not supported, "
+                f"expected one of {list(self.formats)}"
+            )
+
+        self.display = str(display)
+        self.view = str(view)
+        self.input_space = input_space
+        self.shaper_space = shaper_space
+        self.shaper_range = shaper_range
+        self.cube_size = cube_size
+        self.shaper_size = shaper_size
+        self.lut_format = lut_format
+        self.fallback = fallback
+
+    def __str__(self) -> str:
+        return f"{self.display}/{self.view}"
+
+    @property
+    def name(self) -> str:
+        """
+        Returns:
+            str: name of the fallback view and its colorspace.
+        """
+        return f"{self.view} (LUT)"
+
+    @property
+    def path_relative(self) -> Path:
+        """
+        Returns:
+            Path: path of the LUT relative to the config.ocio file.
+        """
+        stem = "".join([
+            char if char.isalnum() or char in "-." else "_"
+            for char in f"{self.display}_{self.view}"
+        ])
+        return Path("luts") / f"{stem}.{self.formats[self.lut_format]}"
+
+    def cache_key(self, config):
+        """
+        Args:
+            config(ocio.Config): config containing the display/view to bake.
+
+        Returns:
+            tuple or None:
+                identify the LUT baked from this config, it only changes if
+                the processing of the display/view changed. None if the
+                processors can't be created (ex: files not found).
+        """
+
+        try:
+            processors = [
+                config.getProcessor(
+                    self.input_space,
+                    self.display,
+                    self.view,
+                    ocio.TRANSFORM_DIR_FORWARD
+                ).getCacheID()
+            ]
+            if self.shaper_space:
+                processors.append(
+                    config.getProcessor(
+                        self.input_space,
+                        self.shaper_space
+                    ).getCacheID()
+                )
+        except ocio.Exception:
+            return None
+
+        return (
+            str(self),
+            self.input_space,
+            self.shaper_space,
+            tuple(self.shaper_range or ()),
+            self.cube_size,
+            self.shaper_size,
+            self.lut_format,
+            *processors
+        )
+
+    def _from_input_space(self, config, name, transform, description=""):
+        """
+        Args:
+            config(ocio.Config): config containing the input space.
+            name(str): name of the colorspace to create
+            transform(ocio.Transform): applied on the input space.
+            description(str):
+
+        Returns:
+            ocio.ColorSpace:
+                colorspace defined as <transform> applied on the input space,
+                which doesn't need the reference role to be defined.
+        """
+
+        input_colorspace = config.getColorSpace(self.input_space)
+        if not input_colorspace:
+            raise ValueError(
+                f"[BakedView] input_space <{self.input_space}> for <{self}> "
+                f"is not in the config."
+            )
+
+        transforms = list()
+        from_reference = input_colorspace.getTransform(
+            ocio.COLORSPACE_DIR_FROM_REFERENCE
+        )
+        to_reference = input_colorspace.getTransform(
+            ocio.COLORSPACE_DIR_TO_REFERENCE
+        )
+        if from_reference:
+            transforms.append(from_reference)
+        elif to_reference:
+            transforms.append(
+                ocio.GroupTransform(
+                    [to_reference],
+                    direction=ocio.TRANSFORM_DIR_INVERSE
+                )
+            )
+        transforms.append(transform)
+
+        colorspace = ocio.ColorSpace(
+            referenceSpace=input_colorspace.getReferenceSpaceType(),
+            name=name,
+            family=Families.display,
+            description=description,
+        )
+        colorspace.setTransform(
+            ocio.GroupTransform(transforms),
+            ocio.COLORSPACE_DIR_FROM_REFERENCE
+        )
+        return colorspace
+
+    def bake(self, config):
+        """
+        Args:
+            config(ocio.Config): config containing the display/view to bake.
+                Might be modified to add the shaper colorspace.
+
+        Returns:
+            str: content of the LUT file.
+        """
+
+        baker = ocio.Baker()
+        baker.setFormat(self.lut_format)
+        baker.setInputSpace(self.input_space)
+        baker.setDisplayView(self.display, self.view)
+        baker.setCubeSize(self.cube_size)
+
+        shaper_space = self.shaper_space
+        if not shaper_space and self.shaper_range:
+            shaper_space = self.shaper_name
+            config.addColorSpace(
+                self._from_input_space(
+                    config,
+                    shaper_space,
+                    ocio.AllocationTransform(
+                        allocation=ocio.ALLOCATION_LG2,
+                        vars=list(self.shaper_range)
+                    )
+                )
+            )
+
+        if shaper_space:
+            baker.setShaperSpace(shaper_space)
+            baker.setShaperSize(self.shaper_size)
+
+        baker.setConfig(config)
+        return baker.bake()
+
+    def to_colorspace(self, config):
+        """
+        Args:
+            config(ocio.Config): config containing the input space.
+
+        Returns:
+            ocio.ColorSpace: colorspace applying the baked LUT on the input
+             space, used by the fallback view.
+        """
+        return self._from_input_space(
+            config,
+            f"{self.display} - {self.name}",
+            ocio.FileTransform(src=self.path_relative.name),
+            description=f"{self.display}/{self.view} baked to a 3D LUT.",
+        )
@@ -2,22 +2,182 @@
 
 """
 from abc import ABC, abstractmethod
+import concurrent.futures
+import contextlib
+import hashlib
+import importlib
+import importlib.util
+import inspect
 import logging
+import os
+import sys
+import tempfile
+import types
 from pathlib import Path
 
 import PyOpenColorIO as ocio
 
 from .ingredients import *
+from .ingredients import OrderedSet
+from .. import optimize as optimizer
+from .. import setup
+from .. import tracing
 from .. import utils
 
 logger = logging.getLogger("mkc.config.recipe")
 
 
+def _code_fingerprint(function):
+    """
+    Args:
+        function(function or method):
+
+    Returns:
+        str: hash of the function's bytecode, independent of its position
+         in the source file.
+    """
+
+    def _hash_code(code, hasher):
+        hasher.update(code.co_code)
+        hasher.update(repr(code.co_names).encode("utf-8"))
+        for const in code.co_consts:
+            if isinstance(const, types.CodeType):
+                _hash_code(const, hasher)
+            else:
+                hasher.update(repr(const).encode("utf-8"))
+        return
+
+    hasher = hashlib.sha1()
+    _hash_code(getattr(function, "__func__", function).__code__, hasher)
+    return hasher.hexdigest()
+
+
+def _bake_view(config_data, working_dir, baked_view):
+    """
+    Executed in the worker processes : rebuild the config and bake the LUT.
+
+    Args:
+        config_data(str): serialized config
+        working_dir(str or None): directory where the disk dependencies
+            are written.
+        baked_view(BakedView):
+
+    Returns:
+        str: content of the LUT file.
+    """
+    config = ocio.Config.CreateFromStream(config_data)
+    if working_dir:
+        config.setWorkingDir(working_dir)
+    return baked_view.bake(config)
+
+
+class _ComponentList:
+    """
+    Descriptor of a public components list of BaseConfig, see
+    BaseConfig._components_list().
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance._components_list(self.name)
+
+    def __set__(self, instance, value):
+        instance._set_components_list(self.name, value)
+
+
 class BaseConfig(ABC):
     
     name = ""
 
-    def __init__(self):
+    # ! Order is important ! cook methods in their execution order.
+    phases = (
+        "cook_root",
+        "cook_colorspaces",
+        "cook_named_transform",
+        "cook_colorspaces_display",
+        "cook_looks",
+        "cook_viewtransforms",
+        "cook_display",
+        "cook_roles",
+        "cook_misc",
+    )
+
+    # component type: attribute holding the list of components of this type.
+    # Checked in order, put subclasses before their parent class.
+    _component_types = (
+        (Display, "displays"),
+        (Colorspace, "colorspaces"),
+        (Look, "looks"),
+        (ViewTransform, "viewtransforms"),
+        (NamedTransform, "namedtransforms"),
+        (BakedView, "baked_views"),
+        (DiskDependency, "disk_dependencies"),
+    )
+
+    # attributes holding the components lists
+    _component_lists = tuple([attribute for _, attribute in _component_types])
+
+    # lists of components, in the order they have been added. Components can
+    # be appended directly to them (like disk_dependencies).
+    colorspaces = _ComponentList()
+    displays = _ComponentList()
+    looks = _ComponentList()
+    viewtransforms = _ComponentList()
+    namedtransforms = _ComponentList()
+    disk_dependencies = _ComponentList()
+    baked_views = _ComponentList()
+
+    # type: attribute, filled when a new type is added. Each class has its
+    # own table, see __init_subclass__.
+    _component_dispatch = dict()
+
+    # phases that use components produced by other phases, they are re-cooked
+    # when one of their dependencies is re-cooked with recook().
+    # Override in subclasses if your recipe use components differently.
+    phase_dependencies = {
+        "cook_looks": (
+            "cook_colorspaces",
+            "cook_colorspaces_display",
+        ),
+        "cook_viewtransforms": (
+            "cook_colorspaces",
+            "cook_colorspaces_display",
+            "cook_looks",
+        ),
+        "cook_display": (
+            "cook_colorspaces",
+            "cook_colorspaces_display",
+            "cook_looks",
+            "cook_viewtransforms",
+        ),
+        "cook_roles": (
+            "cook_colorspaces",
+            "cook_colorspaces_display",
+        ),
+        "cook_misc": (
+            "cook_root",
+            "cook_colorspaces",
+            "cook_named_transform",
+            "cook_colorspaces_display",
+            "cook_looks",
+            "cook_viewtransforms",
+            "cook_display",
+            "cook_roles",
+        ),
+    }
+
+    def __init_subclass__(cls, **kwargs):
+
+        super().__init_subclass__(**kwargs)
+        # subclasses can map the types differently with _component_types
+        cls._component_dispatch = dict()
+        return
+
+    def __init__(self, trace=None, optimize=None):
         """
         Python object representing an ocio config.
 
@@ -27,19 +187,71 @@ class BaseConfig(ABC):
         Call validate() to check if the config is malformed.
 
         Call str() on this instance to get a ready-to-write string.
+
+        Call recook() to only rebuild the phases that changed.
+
+        Args:
+            trace(bool or str or Path or None):
+                True or a file path to record the duration of each cook/bake
+                phase and disk write as a Chrome trace file.
+                None to use the MKC_TRACE environment variable.
+            optimize(bool or None):
+                True to flatten the groups, precompose the matrices and remove
+                the redundant ops of the transforms when baked.
+                None to use setup.OPTIMIZE_TRANSFORMS.
         """
 
+        self.tracer = tracing.get_tracer(self.__class__.__name__, trace)
+        self.optimize = (
+            setup.OPTIMIZE_TRANSFORMS if optimize is None else optimize
+        )
+        # component name: [ops before, ops after] filled when optimize is True
+        self.optimize_stats = dict()
         self.config = ocio.Config()
+
+        # name: component for each components list, in the order they have
+        # been added, see get(). Source of the public lists.
+        self._registry = dict()
+        self._lists = dict()
+        # attribute: id of the components removed or replaced since the list
+        # has been rebuilt, see _components_list()
+        self._dropped = dict()
+
         self.colorspaces = list()
         self.displays = list()
         self.looks = list()
         self.viewtransforms = list()
         self.namedtransforms = list()
         self.disk_dependencies = list()
+        self.baked_views = list()
+
+        # LUTs DiskDependency and fallback (display, view, colorspace)
+        # produced by the last _bake_luts()
+        self._baked_luts = list()
+        self._baked_fallbacks = list()
+        self._active_views = None
+        # BakedView.cache_key(): LUT data, to only bake again the views
+        # whose processing changed on re-bake.
+        self._baked_data = dict()
+
+        # components (and disk dependencies) added or modified by each cook
+        # phase, and the operations performed to replay them.
+        self._phase_components = dict()
+        self._phase_operations = dict()
+        self._phase_fingerprints = dict()
+        self._current_phase = None
 
         # start building the config
         self.cook()  # has to be first
         self.bake()
+        self._write_trace()
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "[%s][__init__] Matrix cache: %s",
+                self.__class__.__name__,
+                utils.matrix_cache_info()
+            )
 
         return
 
@@ -50,6 +262,146 @@ class BaseConfig(ABC):
         """
         return self.config.serialize()
 
+    @classmethod
+    def _component_attribute(cls, component):
+        """
+        Args:
+            component(any):
+
+        Returns:
+            str: name of the attribute holding the list for this component.
+        """
+
+        component_type = type(component)
+        attribute = cls._component_dispatch.get(component_type)
+        if attribute:
+            return attribute
+
+        for base_type, attribute in cls._component_types:
+            if issubclass(component_type, base_type):
+                cls._component_dispatch[component_type] = attribute
+                return attribute
+
+        raise TypeError(
+            "<component> is not from a supported type."
+            f"Excpected Union{[base.__name__ for base, _ in cls._component_types]}"
+            f", got <{component_type}>"
+        )
+
+    def _component_kind(self, kind):
+        """
+        Args:
+            kind(type or str or None): component type or list attribute name.
+
+        Returns:
+            list of str: attributes to search for this kind of component.
+        """
+
+        if kind is None:
+            return list(self._component_lists)
+        if isinstance(kind, str):
+            if kind not in self._registry:
+                raise ValueError(
+                    f"kind <{kind}> must be one of {self._component_lists}"
+                )
+            return [kind]
+
+        for base_type, attribute in self._component_types:
+            if issubclass(kind, base_type):
+                return [attribute]
+
+        raise TypeError(f"<{kind}> is not a supported component type.")
+
+    def _record(self, operation, *components):
+        """
+        Record an operation performed by the current cook phase so it can be
+        replayed by recook().
+        """
+
+        if self._current_phase:
+            self._phase_operations[self._current_phase].append(
+                (operation,) + components
+            )
+            self._phase_components[self._current_phase].extend(components)
+
+        return
+
+    def _components_list(self, attribute):
+        """
+        Rebuild the list if components have been removed or replaced since
+        the last call, so a sequence of remove()/replace() only pays one
+        rebuild. The order is preserved, including for the components
+        appended directly to the list.
+
+        Args:
+            attribute(str): name of the components list.
+
+        Returns:
+            list: the components list, always the same object.
+        """
+
+        components = self._lists[attribute]
+        dropped = self._dropped.pop(attribute, None)
+        if dropped is None:
+            return components
+
+        rebuilt = list()
+        for component in components:
+            # follow the successive replacements, None if removed.
+            while component is not None and id(component) in dropped:
+                component = dropped[id(component)]
+            if component is not None:
+                rebuilt.append(component)
+
+        components[:] = rebuilt
+        return components
+
+    def _set_components_list(self, attribute, components):
+        """
+        Args:
+            attribute(str): name of the components list.
+            components(list): new list, the registry is rebuilt from it.
+        """
+
+        self._lists[attribute] = list(components)
+        self._registry[attribute] = {
+            str(component): component for component in components
+        }
+        self._dropped.pop(attribute, None)
+        return
+
+    def _apply(self, operation, attribute, component, new_component=None):
+        """
+        Modify the registry, O(1) for remove and replace : the list is
+        updated on its next access (see _components_list()). add appends to
+        the list directly.
+
+        Args:
+            operation(str): "add", "remove" or "replace"
+            attribute(str): name of the components list.
+            component(any):
+            new_component(any): for replace only.
+        """
+
+        registry = self._registry[attribute]
+
+        if operation == "add":
+            registry[str(component)] = component
+            # apply the pending remove()/replace() first, the component
+            # could be one of them.
+            self._components_list(attribute).append(component)
+        elif operation == "remove":
+            del registry[str(component)]
+            self._dropped.setdefault(attribute, dict())[id(component)] = None
+        elif operation == "replace":
+            registry[str(new_component)] = new_component
+            dropped = self._dropped.setdefault(attribute, dict())
+            dropped[id(component)] = new_component
+            # replaced back by a previous component
+            dropped.pop(id(new_component), None)
+
+        return
+
     def add(self, component):
         """
         Add an object to the config and let it guess how it should add it.
@@ -58,79 +410,200 @@ class BaseConfig(ABC):
 
         Args:
             component(any):
+
+        Raises:
+            TypeError: if the component type is not supported.
+            ValueError: if a component with the same name was already added.
         """
 
-        if isinstance(component, Display):
-            self.displays.append(component)
-            logger.debug(
-                f"[{self.__class__.__name__}][add] added Display <{component}>"
+        attribute = self._component_attribute(component)
+        if str(component) in self._registry[attribute]:
+            raise ValueError(
+                f"[{self.__class__.__name__}][add] A {type(component).__name__}"
+                f" named <{component}> has already been added, use replace()."
             )
-        elif isinstance(component, (Colorspace, ColorspaceDisplay)):
-            self.colorspaces.append(component)
+
+        self._apply("add", attribute, component)
+        self._record("add", component)
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(
-                f"[{self.__class__.__name__}][add] added Colorspace <{component}>"
+                "[%s][add] added %s <%s>",
+                self.__class__.__name__,
+                type(component).__name__,
+                component
             )
-        elif isinstance(component, Look):
-            self.looks.append(component)
+        return
+
+    def get(self, name, kind=None):
+        """
+        Args:
+            name(str): name of the component (path for DiskDependency,
+                display/view for BakedView) when it was added, components
+                renamed after are not re-indexed.
+            kind(type or str or None): component type or list attribute name
+                to search in, None to search in all of them.
+
+        Returns:
+            component or None: None if not found.
+        """
+
+        for attribute in self._component_kind(kind):
+            component = self._registry[attribute].get(str(name))
+            if component is not None:
+                return component
+
+        return None
+
+    def remove(self, component, kind=None):
+        """
+        Remove a component previously added.
+
+        Args:
+            component(any or str): component or its name.
+            kind(type or str or None): see get()
+
+        Returns:
+            component removed.
+
+        Raises:
+            KeyError: if the component has not been added.
+        """
+
+        if isinstance(component, str):
+            found = self.get(component, kind=kind)
+        else:
+            found = self.get(component, kind=type(component))
+            found = found if found is component else None
+        if found is None:
+            raise KeyError(f"<{component}> has not been added.")
+
+        self._apply("remove", self._component_attribute(found), found)
+        self._record("remove", found)
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(
-                f"[{self.__class__.__name__}][add] added Look <{component}>"
+                "[%s][remove] removed %s <%s>",
+                self.__class__.__name__,
+                type(found).__name__,
+                found
             )
-        elif isinstance(component, ViewTransform):
-            self.viewtransforms.append(component)
-            logger.debug(
-                f"[{self.__class__.__name__}][add] added ViewTransform <{component}>"
+        return found
+
+    def replace(self, component):
+        """
+        Replace the component with the same name and type, its position is
+        preserved.
+
+        Args:
+            component(any):
+
+        Returns:
+            component replaced.
+
+        Raises:
+            KeyError: if no component with this name has been added.
+        """
+
+        attribute = self._component_attribute(component)
+        previous = self._registry[attribute].get(str(component))
+        if previous is None:
+            raise KeyError(
+                f"<{component}> has not been added, can't be replaced."
             )
-        elif isinstance(component, NamedTransform):
-            self.namedtransforms.append(component)
+
+        self._apply("replace", attribute, previous, component)
+        self._record("replace", previous, component)
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(
-                f"[{self.__class__.__name__}][add] added NamedTransform <{component}>"
-            )
-        else:
-            raise TypeError(
-                "<component> is not from a supported type."
-                "Excpected Union[Display, Colorspace, ColorspaceDisplay, Look]"
-                f", got <{type(component)}>"
+                "[%s][replace] replaced %s <%s>",
+                self.__class__.__name__,
+                type(component).__name__,
+                component
             )
+        return previous
 
-        return
-    
     def bake(self):
         """
         Bake the various attributes holded by the class instance to the actual
         config (self.config)
         """
 
-        for colorspace in self.colorspaces:
-            self.config.addColorSpace(colorspace)
+        self.optimize_stats = dict()
+
+        with self.tracer.span("bake_colorspaces", "bake"):
+            self._bake_colorspaces(self.colorspaces)
+        with self.tracer.span("bake_displays", "bake"):
+            self._bake_displays(self.displays)
+        with self.tracer.span("bake_looks", "bake"):
+            self._bake_looks(self.looks)
+        with self.tracer.span("bake_viewtransforms", "bake"):
+            self._bake_viewtransforms(self.viewtransforms)
+        with self.tracer.span("bake_namedtransforms", "bake"):
+            self._bake_namedtransforms(self.namedtransforms)
+        # last as it needs the rest of the config
+        with self.tracer.span("bake_luts", "bake"):
+            self._bake_luts(self.baked_views)
 
-        for display in self.displays:
-            display.validate()
+        if self.optimize and logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "[%s][bake] Transforms optimized (number of ops):\n%s",
+                self.__class__.__name__,
+                optimizer.format_report(self.optimize_stats)
+            )
 
+        logger.debug("[%s][bake] Finished", self.__class__.__name__)
+        return
+
+    def _optimized(self, component):
+        """
+        Returns:
+            context manager: in which the component transforms are optimized,
+             if enabled.
+        """
+
+        if not self.optimize:
+            return contextlib.nullcontext()
+        return optimizer.optimized(component, self.optimize_stats)
+
+    def _bake_colorspaces(self, colorspaces):
+
+        for colorspace in colorspaces:
+            with self._optimized(colorspace):
+                self.config.addColorSpace(colorspace)
+
+        return
+
+    def _bake_displays(self, displays):
+        """
+        Each View is validated and each shared view registered only once,
+        then attached to all its displays.
+
+        Args:
+            displays(list of Display):
+        """
+
+        views = OrderedSet()
+        for display in displays:
+            for view in display.views:
+                views.add(view)
+
+        for view in views:
+            view.validate()
+            if not view.is_shared_view:
+                continue
+            self.config.addSharedView(
+                view=view.name,
+                viewTransformName=view.view_transform,
+                colorSpaceName=view.colorspace,
+                looks=view.looks,
+                ruleName=view.rule_name,
+                description=view.description
+            )
+
+        for display in displays:
             for view in display.views:
 
                 if view.is_shared_view:
-                    # this mean we will add the same view multiple times but
-                    # not an issue as it overwrite the previous one.
-                    self.config.addSharedView(
-                        view=view.name,
-                        viewTransformName=view.view_transform,
-                        colorSpaceName=view.colorspace,
-                        looks=view.looks,
-                        ruleName=view.rule_name,
-                        description=view.description
-                    )
-                    # this one tho, will raise an error if you add 2 time the
-                    # same view.
-                    try:
-                        self.config.addDisplaySharedView(
-                            display.name,
-                            view.name
-                        )
-                    except Exception as excp:
-                        logger.debug(
-                            f"[{self.__class__.__name__}][bake] Can't perform"
-                            f"self.config.addDisplaySharedView(): {excp}"
-                        )
+                    self.config.addDisplaySharedView(display.name, view.name)
 
                 else:
                     self.config.addDisplayView(
@@ -143,24 +616,177 @@ class BaseConfig(ABC):
                         description=view.description
                     )
 
-                continue
+        return
 
-            continue
+    def _bake_looks(self, looks):
+
+        for look in looks:
+            with self._optimized(look):
+                self.config.addLook(look)
+
+        return
+
+    def _bake_viewtransforms(self, viewtransforms):
+
+        for viewtransform in viewtransforms:
+            with self._optimized(viewtransform):
+                self.config.addViewTransform(viewtransform)
+
+        return
+
+    def _bake_namedtransforms(self, namedtransforms):
+
+        for namedtransform in namedtransforms:
+            with self._optimized(namedtransform):
+                self.config.addNamedTransform(namedtransform)
+
+        return
+
+    def _bake_luts(self, baked_views):
+        """
+        Bake the given display/views to LUTs in a pool of processes
+        (see setup.BAKE_WORKERS) and register them as disk dependencies.
+        The LUTs and fallback views of a previous call are replaced, LUTs
+        whose BakedView.cache_key() didn't change are not baked again.
+
+        Args:
+            baked_views(list of BakedView):
+        """
+
+        for dependency in self._baked_luts:
+            if dependency in self.disk_dependencies:
+                self._apply("remove", "disk_dependencies", dependency)
+        for display, view, colorspace in self._baked_fallbacks:
+            if view in self.config.getViews(display):
+                self.config.removeDisplayView(display, view)
+            if self.config.getColorSpace(colorspace):
+                self.config.removeColorSpace(colorspace)
+        if self._active_views is not None:
+            self.config.setActiveViews(self._active_views)
+        self._baked_luts = list()
+        self._baked_fallbacks = list()
+        self._active_views = None
 
-        for look in self.looks:
-            self.config.addLook(look)
+        if not baked_views:
+            self._baked_data = dict()
+            return
 
-        for viewtransform in self.viewtransforms:
-            self.config.addViewTransform(viewtransform)
+        keys = [baked_view.cache_key(self.config) for baked_view in baked_views]
+        to_bake = [
+            baked_view for baked_view, key in zip(baked_views, keys)
+            if key is None or key not in self._baked_data
+        ]
 
-        for namedtransform in self.namedtransforms:
-            self.config.addNamedTransform(namedtransform)
+        workers = setup.BAKE_WORKERS
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(to_bake))
 
-        logger.debug(
-            f"[{self.__class__.__name__}][bake] Finished"
+        baked = iter(self._bake_views(to_bake, workers) if to_bake else [])
+        luts = [
+            next(baked) if key is None or key not in self._baked_data
+            else self._baked_data[key]
+            for key in keys
+        ]
+        self._baked_data = {
+            key: lut for key, lut in zip(keys, luts) if key is not None
+        }
+
+        default_views = {
+            display: self.config.getDefaultView(display)
+            for display in self.config.getDisplays()
+        }
+        all_views = list()
+        for display in default_views:
+            for view in self.config.getViews(display):
+                if view not in all_views:
+                    all_views.append(view)
+
+        for baked_view, lut in zip(baked_views, luts):
+
+            dependency = DiskDependency(baked_view.path_relative, lut)
+            self._baked_luts.append(dependency)
+            self._apply("add", "disk_dependencies", dependency)
+
+            if not baked_view.fallback:
+                continue
+
+            search_path = str(baked_view.path_relative.parent)
+            if search_path not in self.config.getSearchPaths():
+                self.config.addSearchPath(search_path)
+
+            colorspace = baked_view.to_colorspace(self.config)
+            self.config.addColorSpace(colorspace)
+            self.config.addDisplayView(
+                baked_view.display,
+                view=baked_view.name,
+                viewTransform="",
+                displayColorSpaceName=colorspace.getName(),
+                description=colorspace.getDescription()
+            )
+            self._baked_fallbacks.append(
+                (baked_view.display, baked_view.name, colorspace.getName())
+            )
+
+        # display views are listed before shared views, so a fallback view
+        # can become the default one. Restore the order with the active views.
+        if any([
+            self.config.getDefaultView(display) != view
+            for display, view in default_views.items()
+        ]):
+            self._active_views = self.config.getActiveViews()
+            active_views = [
+                view.strip() for view in self._active_views.split(",")
+                if view.strip()
+            ] or all_views
+            for _, view, _ in self._baked_fallbacks:
+                if view not in active_views:
+                    active_views.append(view)
+            self.config.setActiveViews(", ".join(active_views))
+
+        logger.info(
+            "[%s][_bake_luts] Baked %s LUTs with %s workers, %s unchanged.",
+            self.__class__.__name__,
+            len(to_bake),
+            max(workers, 1),
+            len(luts) - len(to_bake)
         )
         return
 
+    def _bake_views(self, baked_views, workers):
+        """
+        Args:
+            baked_views(list of BakedView):
+            workers(int): number of processes, <= 1 to bake in this one.
+
+        Returns:
+            list of str: content of the LUT of each baked view.
+        """
+
+        config_data = self.config.serialize()
+
+        # the views might use the disk dependencies (ex: FileTransform)
+        with tempfile.TemporaryDirectory(prefix="mkc_bake_") as working_dir:
+
+            if self.disk_dependencies:
+                self._write_dependencies(Path(working_dir))
+            else:
+                working_dir = None
+
+            if workers <= 1:
+                return [
+                    _bake_view(config_data, working_dir, baked_view)
+                    for baked_view in baked_views
+                ]
+
+            with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+                return list(executor.map(
+                    _bake_view,
+                    [config_data] * len(baked_views),
+                    [working_dir] * len(baked_views),
+                    baked_views
+                ))
+
     def cook(self):
         """
         Create a new config and build its content.
@@ -170,17 +796,275 @@ class BaseConfig(ABC):
         # make sure the config is reset by creating a new instance
         self.config = ocio.Config()
 
-        # ! Order is important !
-        self.cook_root()
-        self.cook_colorspaces()
-        self.cook_named_transform()
-        self.cook_colorspaces_display()
-        self.cook_looks()
-        self.cook_viewtransforms()
-        self.cook_display()
-        self.cook_roles()
-        self.cook_misc()
+        for phase in self.phases:
+            self._cook_phase(phase)
+
+        return
+
+    def _cook_phase(self, phase):
+        """
+        Execute the given cook method and record what it produced.
+
+        Args:
+            phase(str): name of the cook method
+        """
+
+        method = getattr(self, phase)
+
+        self._phase_components[phase] = list()
+        self._phase_operations[phase] = list()
+        self._current_phase = phase
+        try:
+            with self.tracer.span(phase, "cook"):
+                method()
+
+            # disk dependencies can be directly appended to the list by recipes.
+            registry = self._registry["disk_dependencies"]
+            for dependency in self.disk_dependencies:
+                if registry.get(str(dependency)) is not dependency:
+                    registry[str(dependency)] = dependency
+                    self._record("add", dependency)
+        finally:
+            self._current_phase = None
+
+        self._phase_fingerprints[phase] = _code_fingerprint(method)
+
+        return
+
+    def dirty_phases(self):
+        """
+        Returns:
+            list of str: phases whose code changed since they were cooked.
+        """
+        return [
+            phase for phase in self.phases
+            if self._phase_fingerprints.get(phase)
+            != _code_fingerprint(getattr(self, phase))
+        ]
+
+    def _phases_to_recook(self, phases):
+        """
+        Args:
+            phases(list of str): phases that changed.
+
+        Returns:
+            list of str: given phases and all the phases depending on them,
+             in their execution order.
+        """
+
+        to_recook = list()
+        for phase in self.phases:
+            dependencies = self.phase_dependencies.get(phase, ())
+            if phase in phases or set(dependencies).intersection(to_recook):
+                to_recook.append(phase)
+
+        return to_recook
+
+    def recook(self, phases=None):
+        """
+        Incremental build : only re-cook the given phases and the phases
+        depending on them (see phase_dependencies), then re-bake the
+        sections of self.config they changed. self.config is kept.
+
+        Args:
+            phases(list of str or None):
+                name of the cook methods that changed. If None the phases
+                whose code changed are detected with dirty_phases(),
+                ex: after reloading the recipe module and assigning the
+                reloaded class to self.__class__.
+
+        Returns:
+            list of str: name of the phases that have been re-cooked.
+        """
+
+        if phases is None:
+            phases = self.dirty_phases()
+
+        to_recook = self._phases_to_recook(phases)
+        if not to_recook:
+            logger.debug(
+                "[%s][recook] Nothing to re-cook.",
+                self.__class__.__name__
+            )
+            return to_recook
+
+        untracked = self._untracked_components()
+
+        # remove the previous components from the lists before re-cooking
+        previous = list()
+        for phase in to_recook:
+            previous.extend(self._phase_components[phase])
+            self._phase_components[phase] = list()
+            self._phase_operations[phase] = list()
+        self._restore_lists(untracked)
+        self._reset_settings(to_recook)
+
+        for phase in to_recook:
+            self._cook_phase(phase)
+
+        self._restore_lists(untracked)
+
+        changed = previous.copy()
+        for phase in to_recook:
+            changed.extend(self._phase_components[phase])
+        self._rebake(changed, settings="cook_root" in to_recook)
+
+        logger.info(
+            "[%s][recook] Re-cooked %s",
+            self.__class__.__name__,
+            to_recook
+        )
+        return to_recook
+
+    def _untracked_components(self):
+        """
+        Returns:
+            dict: components in the lists that were not produced by a phase,
+             per list attribute name.
+        """
+
+        tracked = set()
+        for components in self._phase_components.values():
+            tracked.update(map(id, components))
+
+        return {
+            attribute: [
+                component for component in getattr(self, attribute)
+                if id(component) not in tracked
+            ]
+            for attribute in self._component_lists
+        }
+
+    def _restore_lists(self, untracked):
+        """
+        Rebuild the components lists and the registry with the untracked
+        components first, then replay the operations of the phases in
+        execution order, as a full cook would.
+
+        Args:
+            untracked(dict): as returned by _untracked_components()
+        """
+
+        for attribute in self._component_lists:
+            self._set_components_list(attribute, untracked[attribute])
+
+        for phase in self.phases:
+            for operation, *components in self._phase_operations.get(phase, []):
+                self._apply(
+                    operation,
+                    self._component_attribute(components[0]),
+                    *components
+                )
+
+        return
+
+    def _reset_settings(self, phases):
+        """
+        Reset the settings the given phases directly write on self.config,
+        as the new config created by cook() would have them :
+        - cook_root: name, description, version, search paths, environment,
+          family separator, luma coefficients, active and inactive lists.
+        - cook_roles: roles.
+        - cook_misc: file rules and viewing rules.
+
+        Args:
+            phases(list of str): phases about to be re-cooked.
+        """
+
+        default = ocio.Config()
+
+        if "cook_root" in phases:
+            self.config.setVersion(
+                default.getMajorVersion(),
+                default.getMinorVersion()
+            )
+            self.config.setName(default.getName())
+            self.config.setDescription(default.getDescription())
+            self.config.clearSearchPaths()
+            self.config.clearEnvironmentVars()
+            self.config.setEnvironmentMode(default.getEnvironmentMode())
+            self.config.setFamilySeparator(default.getFamilySeparator())
+            self.config.setDefaultLumaCoefs(default.getDefaultLumaCoefs())
+            self.config.setInactiveColorSpaces(default.getInactiveColorSpaces())
+            self.config.setActiveDisplays(default.getActiveDisplays())
+            self.config.setActiveViews(default.getActiveViews())
+            # recomputed by _bake_luts from the new active views
+            self._active_views = None
+
+        if "cook_roles" in phases:
+            for role in list(self.config.getRoleNames()):
+                self.config.setRole(role, None)
+
+        if "cook_misc" in phases:
+            self.config.setFileRules(default.getFileRules())
+            self.config.setViewingRules(default.getViewingRules())
+
+        return
+
+    def _rebake(self, changed, settings=False):
+        """
+        Clear and bake again the sections of self.config that contain one of
+        the given components. Order of the sections is preserved.
+
+        Args:
+            changed(list): components removed or added by a re-cook.
+            settings(bool):
+                True if the root settings have been reset, the LUTs fallback
+                views add search paths and active views to them.
+        """
+
+        def _has(kind):
+            return any(isinstance(component, kind) for component in changed)
+
+        if _has(Colorspace):
+            with self.tracer.span("bake_colorspaces", "bake"):
+                self.config.clearColorSpaces()
+                self._bake_colorspaces(self.colorspaces)
+
+        if _has(Display):
+            with self.tracer.span("bake_displays", "bake"):
+                self.config.clearDisplays()
+                for shared_view in list(self.config.getSharedViews()):
+                    self.config.removeSharedView(shared_view)
+                self._bake_displays(self.displays)
+
+        if _has(Look):
+            with self.tracer.span("bake_looks", "bake"):
+                self.config.clearLooks()
+                self._bake_looks(self.looks)
+
+        if _has(ViewTransform):
+            with self.tracer.span("bake_viewtransforms", "bake"):
+                self.config.clearViewTransforms()
+                self._bake_viewtransforms(self.viewtransforms)
+
+        if _has(NamedTransform):
+            with self.tracer.span("bake_namedtransforms", "bake"):
+                self.config.clearNamedTransforms()
+                self._bake_namedtransforms(self.namedtransforms)
+
+        # LUTs depend on the whole config
+        if (changed or settings) and (self.baked_views or self._baked_luts):
+            with self.tracer.span("bake_luts", "bake"):
+                self._bake_luts(self.baked_views)
+
+        return
+
+    def _write_trace(self):
+        """
+        Write the trace file and log the summary if tracing is enabled.
+        """
+
+        if not self.tracer.enabled:
+            return
 
+        self.tracer.write()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "[%s][_write_trace] Trace summary:\n%s",
+                self.__class__.__name__,
+                self.tracer.summary()
+            )
         return
 
     @utils.check_config_init
@@ -195,6 +1079,9 @@ class BaseConfig(ABC):
         """
         Write the config to disk as the config.ocio file.
 
+        Disk dependencies are written next to it using setup.WRITE_WORKERS
+        threads. Files whose content didn't change are not written again.
+
         Args:
             write_path(str or Path): object representing a path to the
                 config.ocio file.
@@ -202,19 +1089,56 @@ class BaseConfig(ABC):
         """
 
         write_path = Path(write_path).absolute()
-        write_path.write_text(self.__str__(), encoding="utf-8")
+        with self.tracer.span("serialize", "write"):
+            data = self.__str__()
+        with self.tracer.span("write_config", "write"):
+            DiskDependency(write_path.name, data).write(write_path.parent)
         logger.info(
             f"[{self.__class__.__name__}][write_to_disk]"
             f"Config written to <{write_path}>"
         )
 
         # to write luts and other dependencies that have been stored.
-        for dependency in self.disk_dependencies:
-            dependency.write(write_path)
+        self._write_dependencies(write_path.parent)
 
+        self._write_trace()
         logger.info(f"[{self.__class__.__name__}][write_to_disk] Finished.")
         return
 
+    def _write_dependencies(self, directory):
+        """
+        Write the disk dependencies in a pool of threads.
+
+        Args:
+            directory(Path): directory of the config.ocio file.
+        """
+
+        tracer = self.tracer
+
+        def _write(dependency):
+            # the span name is only formatted when tracing
+            if not tracer.enabled:
+                return dependency.write(directory)
+            with tracer.span(f"write <{dependency.path_relative}>", "write"):
+                return dependency.write(directory)
+
+        if not self.disk_dependencies:
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=setup.WRITE_WORKERS
+        ) as executor:
+            written = list(executor.map(_write, self.disk_dependencies))
+
+        logger.info(
+            "[%s][_write_dependencies] %s/%s disk dependencies written, "
+            "others were up-to-date.",
+            self.__class__.__name__,
+            sum(written),
+            len(written)
+        )
+        return
+
     @abstractmethod
     @utils.check_config_init
     def cook_root(self):
@@ -294,3 +1218,90 @@ class BaseConfig(ABC):
         FilesRules are an example.
         """
         pass
+
+
+def _import_source(source):
+    """
+    Args:
+        source(str or Path): "path/to/file.py" or "package.module"
+
+    Returns:
+        module: imported module
+    """
+
+    if not str(source).endswith(".py"):
+        return importlib.import_module(str(source))
+
+    path = Path(source).resolve()
+    module_spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(module_spec)
+    # make sibling modules importable by the recipe
+    if str(path.parent) not in sys.path:
+        sys.path.insert(0, str(path.parent))
+    module_spec.loader.exec_module(module)
+
+    return module
+
+
+def load_recipe(spec):
+    """
+    Import a BaseConfig subclass from the given specification.
+
+    Args:
+        spec(str):
+            "path/to/file.py:ClassName" or "package.module:ClassName"
+
+    Returns:
+        type: BaseConfig subclass
+    """
+
+    source, _, class_name = spec.rpartition(":")
+    if not source or not class_name:
+        raise ValueError(
+            f"Recipe <{spec}> must be formatted as <module:ClassName> or "
+            f"<path/to/file.py:ClassName>."
+        )
+
+    recipe = getattr(_import_source(source), class_name)
+    if not (isinstance(recipe, type) and issubclass(recipe, BaseConfig)):
+        raise TypeError(f"<{spec}> is not a BaseConfig subclass.")
+
+    return recipe
+
+
+def discover_recipes(path):
+    """
+    Find all the concrete BaseConfig subclasses defined in the given python
+    file, or in the python files of the given directory (recursive).
+
+    Args:
+        path(str or Path): python file or directory
+
+    Returns:
+        list of str: recipe specifications usable with load_recipe()
+    """
+
+    path = Path(path)
+    files = [path] if path.is_file() else sorted(path.rglob("*.py"))
+
+    specs = list()
+    for file_path in files:
+
+        try:
+            module = _import_source(file_path)
+        except Exception as excp:
+            logger.warning(
+                "[discover_recipes] Can't import <%s>: %s", file_path, excp
+            )
+            continue
+
+        for name, obj in vars(module).items():
+            if (
+                    isinstance(obj, type)
+                    and issubclass(obj, BaseConfig)
+                    and obj.__module__ == module.__name__
+                    and not inspect.isabstract(obj)
+            ):
+                specs.append(f"{file_path}:{name}")
+
+    return specs
@@ -0,0 +1,427 @@
+"""
+Structural diff between two configs.
+
+Components are compared section by section by name, by their definition and
+by the cacheID of the processor they produce. A component whose processor
+changed is "affected" : only those need to go through the regression suite
+or to be baked again, a description change for example is not.
+
+Usage :
+
+    python -m makeconfig.diff old/config.ocio new/config.ocio
+        --output changes.json
+"""
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+import PyOpenColorIO as ocio
+
+logger = logging.getLogger("mkc.diff")
+
+SECTIONS = (
+    "colorspaces",
+    "view_transforms",
+    "named_transforms",
+    "looks",
+    "displays",
+    "roles",
+    "file_rules",
+)
+
+CHANGES = ("added", "removed", "modified")
+
+
+def load_config(source):
+    """
+    Args:
+        source(ocio.Config or BaseConfig or str or Path):
+            config or path to a config.ocio file.
+
+    Returns:
+        ocio.Config:
+    """
+
+    if isinstance(source, ocio.Config):
+        return source
+    if isinstance(getattr(source, "config", None), ocio.Config):
+        return source.config
+
+    return ocio.Config.CreateFromFile(str(source))
+
+
+def processor_id(config, *transforms):
+    """
+    Args:
+        config(ocio.Config):
+        transforms(ocio.Transform or None): None are ignored.
+
+    Returns:
+        str or None: cacheID of the processor of each transform,
+         None if there is no transform.
+    """
+
+    ids = list()
+    for transform in transforms:
+        if transform is None:
+            continue
+        try:
+            ids.append(config.getProcessor(transform).getCacheID())
+        except ocio.Exception as excp:
+            ids.append(f"error: {excp}")
+
+    return "|".join(ids) if ids else None
+
+
+def _colorspaces(config):
+
+    snapshot = dict()
+    for name in config.getColorSpaceNames(
+            ocio.SEARCH_REFERENCE_SPACE_ALL,
+            ocio.COLORSPACE_ALL
+    ):
+        colorspace = config.getColorSpace(name)
+        snapshot[name] = {
+            "definition": str(colorspace),
+            "processor": processor_id(
+                config,
+                colorspace.getTransform(ocio.COLORSPACE_DIR_TO_REFERENCE),
+                colorspace.getTransform(ocio.COLORSPACE_DIR_FROM_REFERENCE),
+            ) or "",
+        }
+    return snapshot
+
+
+def _view_transforms(config):
+
+    snapshot = dict()
+    for view_transform in config.getViewTransforms():
+        snapshot[view_transform.getName()] = {
+            "definition": str(view_transform),
+            "processor": processor_id(
+                config,
+                view_transform.getTransform(
+                    ocio.VIEWTRANSFORM_DIR_TO_REFERENCE
+                ),
+                view_transform.getTransform(
+                    ocio.VIEWTRANSFORM_DIR_FROM_REFERENCE
+                ),
+            ) or "",
+        }
+    return snapshot
+
+
+def _named_transforms(config):
+
+    snapshot = dict()
+    for named_transform in config.getNamedTransforms(ocio.NAMEDTRANSFORM_ALL):
+        snapshot[named_transform.getName()] = {
+            "definition": str(named_transform),
+            "processor": processor_id(
+                config,
+                named_transform.getTransform(ocio.TRANSFORM_DIR_FORWARD),
+                named_transform.getTransform(ocio.TRANSFORM_DIR_INVERSE),
+            ) or "",
+        }
+    return snapshot
+
+
+def _looks(config):
+
+    snapshot = dict()
+    for look in config.getLooks():
+        snapshot[look.getName()] = {
+            "definition": str(look),
+            "processor": processor_id(
+                config,
+                look.getTransform(),
+                look.getInverseTransform(),
+            ) or "",
+        }
+    return snapshot
+
+
+def _displays(config, src):
+    """
+    One entry per display, holding its ordered list of active views, and one
+    per "display/view" whose processor is from src to the display/view.
+    """
+
+    snapshot = dict()
+    for display in config.getDisplays():
+
+        snapshot[display] = {
+            "definition": ", ".join(config.getViews(display)),
+            "processor": None,
+        }
+
+        for view_type in (ocio.VIEW_DISPLAY_DEFINED, ocio.VIEW_SHARED):
+            for view in config.getViews(view_type, display):
+
+                definition = {
+                    "shared": view_type == ocio.VIEW_SHARED,
+                    "view_transform":
+                        config.getDisplayViewTransformName(display, view),
+                    "colorspace":
+                        config.getDisplayViewColorSpaceName(display, view),
+                    "looks": config.getDisplayViewLooks(display, view),
+                    "rule": config.getDisplayViewRule(display, view),
+                    "description":
+                        config.getDisplayViewDescription(display, view),
+                }
+                try:
+                    processor = config.getProcessor(
+                        src,
+                        display,
+                        view,
+                        ocio.TRANSFORM_DIR_FORWARD
+                    ).getCacheID()
+                except ocio.Exception as excp:
+                    processor = f"error: {excp}"
+
+                snapshot[f"{display}/{view}"] = {
+                    "definition": json.dumps(definition, sort_keys=True),
+                    "processor": processor,
+                }
+
+    return snapshot
+
+
+def _roles(config, colorspaces):
+
+    return {
+        role: {
+            "definition": colorspace,
+            "processor": colorspaces.get(colorspace, {}).get("processor"),
+        }
+        for role, colorspace in config.getRoles()
+    }
+
+
+def _file_rules(config):
+
+    rules = config.getFileRules()
+    snapshot = dict()
+    for index in range(rules.getNumEntries()):
+        definition = {
+            "position": index,
+            "colorspace": rules.getColorSpace(index),
+            "pattern": rules.getPattern(index),
+            "extension": rules.getExtension(index),
+            "regex": rules.getRegex(index),
+        }
+        snapshot[rules.getName(index)] = {
+            "definition": json.dumps(definition, sort_keys=True),
+            "processor": None,
+        }
+    return snapshot
+
+
+def snapshot(config, src=ocio.ROLE_SCENE_LINEAR):
+    """
+    Args:
+        config(ocio.Config or BaseConfig or str or Path): see load_config()
+        src(str): colorspace or role the display/views are processed from.
+
+    Returns:
+        dict: {section: {name: {"definition": str, "processor": str or None}}}
+    """
+
+    config = load_config(config)
+    colorspaces = _colorspaces(config)
+
+    return {
+        "colorspaces": colorspaces,
+        "view_transforms": _view_transforms(config),
+        "named_transforms": _named_transforms(config),
+        "looks": _looks(config),
+        "displays": _displays(config, src),
+        "roles": _roles(config, colorspaces),
+        "file_rules": _file_rules(config),
+    }
+
+
+def diff(config_a, config_b, src=ocio.ROLE_SCENE_LINEAR):
+    """
+    Args:
+        config_a(ocio.Config or BaseConfig or str or Path): previous config
+        config_b(ocio.Config or BaseConfig or str or Path): new config
+        src(str): colorspace or role the display/views are processed from.
+
+    Returns:
+        list of dict:
+            one change per component that is not identical, in SECTIONS order.
+            {"section": str, "name": str, "change": one of CHANGES,
+            "affected": bool} where affected is True if the component
+            processes pixels differently (or has no processor and its
+            definition changed).
+    """
+
+    snapshot_a = snapshot(config_a, src=src)
+    snapshot_b = snapshot(config_b, src=src)
+
+    changes = list()
+    for section in SECTIONS:
+
+        components_a = snapshot_a[section]
+        components_b = snapshot_b[section]
+
+        for name, component in components_b.items():
+
+            previous = components_a.get(name)
+            if previous is None:
+                change = "added"
+                affected = True
+            elif previous != component:
+                change = "modified"
+                if component["processor"] is None:
+                    affected = True
+                else:
+                    affected = previous["processor"] != component["processor"]
+            else:
+                continue
+
+            changes.append({
+                "section": section,
+                "name": name,
+                "change": change,
+                "affected": affected,
+            })
+
+        for name in components_a:
+            if name not in components_b:
+                changes.append({
+                    "section": section,
+                    "name": name,
+                    "change": "removed",
+                    "affected": True,
+                })
+
+    logger.debug("[diff] %s changes found.", len(changes))
+    return changes
+
+
+def affected(changes, section):
+    """
+    Args:
+        changes(list of dict): as returned by diff()
+        section(str): one of SECTIONS
+
+    Returns:
+        set of str: names of the affected components of the section.
+    """
+    return set([
+        change["name"] for change in changes
+        if change["section"] == section and change["affected"]
+    ])
+
+
+def _reference_space(config, name):
+    """
+    Returns:
+        ocio.ReferenceSpaceType or None: of the colorspace or role.
+    """
+    colorspace = config.getColorSpace(name)
+    return colorspace.getReferenceSpaceType() if colorspace else None
+
+
+def affected_conversions(changes, conversions, src, config=None):
+    """
+    Args:
+        changes(list of dict): as returned by diff()
+        conversions(list of tuple): as returned by regression.list_conversions()
+        src(str): colorspace or role the conversions start from, the
+            display/views must have been compared from it in diff().
+        config(ocio.Config or None):
+            config the conversions are from. Colorspace conversions between
+            the scene and display reference spaces go through a view
+            transform, they are affected when a view transform is. Without
+            config all the colorspace conversions are considered crossing.
+
+    Returns:
+        list of tuple: conversions whose result might have changed.
+    """
+
+    colorspaces = affected(changes, "colorspaces") | affected(changes, "roles")
+    views = affected(changes, "displays")
+    if src in colorspaces:
+        return list(conversions)
+
+    crossing = set()
+    if affected(changes, "view_transforms"):
+        reference = _reference_space(config, src) if config else None
+        crossing = set([
+            conversion[0] for conversion in conversions
+            if conversion[0] is not None and (
+                config is None
+                or _reference_space(config, conversion[0]) != reference
+            )
+        ])
+
+    return [
+        conversion for conversion in conversions
+        if conversion[0] in colorspaces
+        or conversion[0] in crossing
+        or f"{conversion[1]}/{conversion[2]}" in views
+    ]
+
+
+def format_table(changes):
+    """
+    Args:
+        changes(list of dict): as returned by diff()
+
+    Returns:
+        str: human readable table.
+    """
+
+    lines = [f"{'section':<18} {'change':<10} {'affected':<9} name"]
+    for change in changes:
+        lines.append(
+            f"{change['section']:<18} {change['change']:<10} "
+            f"{'yes' if change['affected'] else 'no':<9} {change['name']}"
+        )
+
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Command line entry point.
+
+    Returns:
+        int: exit code, 1 if the configs are different.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="makeconfig.diff",
+        description="List the components that changed between two configs."
+    )
+    parser.add_argument("config_a", type=Path, help="previous config.ocio")
+    parser.add_argument("config_b", type=Path, help="new config.ocio")
+    parser.add_argument(
+        "--src",
+        default=ocio.ROLE_SCENE_LINEAR,
+        help="colorspace or role the display/views are processed from."
+    )
+    parser.add_argument("--output", type=Path, help="json file to write.")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("mkc").setLevel(args.log_level)
+
+    changes = diff(args.config_a, args.config_b, src=args.src)
+    print(format_table(changes))
+
+    if args.output:
+        args.output.write_text(json.dumps(changes, indent=4), encoding="utf-8")
+        print(f"Changes written to <{args.output}>")
+
+    return 1 if changes else 0
+
+
+if __name__ == '__main__':
+
+    sys.exit(main())
@@ -0,0 +1,386 @@
+"""
+Apply OCIO processors on images split in bands of scanlines processed in
+a pool of threads. OCIO release the GIL while processing so bands are
+processed in parallel.
+"""
+import concurrent.futures
+import logging
+import math
+import os
+import time
+from pathlib import Path
+
+import numpy
+import PyOpenColorIO as ocio
+
+logger = logging.getLogger("mkc.imaging")
+
+MIN_BAND_ROWS = 16  # avoid bands too small where the overhead dominate.
+
+# approximative size of the strips mapped at once by apply_processor_raw()
+STRIP_BYTES = 64 * 1024 * 1024
+
+# supported bit-depths and their numpy dtype.
+BIT_DEPTHS = {
+    "uint8": (ocio.BIT_DEPTH_UINT8, numpy.uint8),
+    "uint16": (ocio.BIT_DEPTH_UINT16, numpy.uint16),
+    "half": (ocio.BIT_DEPTH_F16, numpy.float16),
+    "float": (ocio.BIT_DEPTH_F32, numpy.float32),
+}
+
+
+def get_bitdepth(dtype):
+    """
+    Args:
+        dtype(numpy.dtype or str or type):
+
+    Returns:
+        ocio.BitDepth: bit-depth to use for arrays of this dtype.
+    """
+
+    dtype = numpy.dtype(dtype)
+    for bitdepth, bitdepth_dtype in BIT_DEPTHS.values():
+        if dtype == bitdepth_dtype:
+            return bitdepth
+
+    raise ValueError(
+        f"dtype <{dtype}> not supported, expected one of "
+        f"{[str(numpy.dtype(value[1])) for value in BIT_DEPTHS.values()]}"
+    )
+
+
+def to_float(image):
+    """
+    Args:
+        image(numpy.ndarray): array of any supported dtype.
+
+    Returns:
+        numpy.ndarray: float32 array, integers are normalized to [0-1].
+    """
+
+    if numpy.issubdtype(image.dtype, numpy.integer):
+        return image.astype(numpy.float32) / numpy.iinfo(image.dtype).max
+    return image.astype(numpy.float32)
+
+
+def from_float(image, dtype):
+    """
+    Args:
+        image(numpy.ndarray): float array.
+        dtype(numpy.dtype or str or type): one of the BIT_DEPTHS dtypes.
+
+    Returns:
+        numpy.ndarray: array converted to dtype, integers are quantized from
+         the [0-1] range.
+    """
+
+    dtype = numpy.dtype(dtype)
+    if numpy.issubdtype(dtype, numpy.integer):
+        maximum = numpy.iinfo(dtype).max
+        return numpy.rint(numpy.clip(image, 0.0, 1.0) * maximum).astype(dtype)
+    return image.astype(dtype)
+
+
+def _image_desc(array):
+    """
+    Args:
+        array(numpy.ndarray): C-contiguous array.
+
+    Returns:
+        ocio.PackedImageDesc: describing the array with its bit-depth.
+    """
+
+    channels = array.shape[-1]
+    height = array.shape[0]
+    width = array.size // (channels * height) if height else 0
+    item_size = array.itemsize
+
+    return ocio.PackedImageDesc(
+        array,
+        width,
+        height,
+        channels,
+        get_bitdepth(array.dtype),
+        item_size,
+        item_size * channels,
+        item_size * channels * width
+    )
+
+
+def split_bands(height, band_rows):
+    """
+    Args:
+        height(int): number of rows of the image.
+        band_rows(int): number of rows per band.
+
+    Returns:
+        list of tuple: (start row, end row) for each band.
+    """
+    return [
+        (start, min(start + band_rows, height))
+        for start in range(0, height, band_rows)
+    ]
+
+
+def _apply_band(cpu_processor, source, target):
+    """
+    Args:
+        cpu_processor(ocio.CPUProcessor):
+        source(numpy.ndarray): band to read.
+        target(numpy.ndarray): band to write, can be source to work in place.
+    """
+
+    if target.dtype != source.dtype:
+        cpu_processor.apply(_image_desc(source), _image_desc(target))
+        return
+
+    if target is not source:
+        target[...] = source
+
+    if target.shape[-1] == 4:
+        cpu_processor.applyRGBA(target)
+    else:
+        cpu_processor.applyRGB(target)
+
+    return
+
+
+def apply_processor(cpu_processor, image, out=None, band_rows=None,
+                    workers=None):
+    """
+    Apply the processor on the given image.
+
+    The image is split in bands of rows dispatched to a pool of threads.
+
+    Args:
+        cpu_processor(ocio.CPUProcessor):
+        image(numpy.ndarray):
+            C-contiguous (height, width, channels) or (pixels, channels)
+            array with 3 (RGB) or 4 (RGBA) channels. Its dtype must match
+            the processor input bit-depth (float32 for the default one),
+            see BIT_DEPTHS.
+        out(numpy.ndarray or None):
+            preallocated array with the same shape as image to write the
+            result into, its dtype must match the processor output
+            bit-depth. If None, image is modified in place.
+        band_rows(int or None):
+            number of rows per band, default to split the image in
+            4 bands per worker.
+        workers(int or None): number of threads, os.cpu_count() if None.
+
+    Returns:
+        dict: statistics about the processing (megapixels_per_second, ...)
+    """
+
+    if image.shape[-1] not in (3, 4):
+        raise ValueError(
+            f"Image must have 3 or 4 channels, got shape {image.shape}."
+        )
+    if out is None:
+        out = image
+    elif out.shape != image.shape:
+        raise ValueError(
+            f"out array {out.shape} doesn't match image {image.shape}."
+        )
+    if not (out.flags.c_contiguous and image.flags.c_contiguous):
+        raise ValueError("Array processed must be C-contiguous.")
+    if get_bitdepth(image.dtype) != cpu_processor.getInputBitDepth():
+        raise ValueError(
+            f"image dtype <{image.dtype}> doesn't match the processor input "
+            f"bit-depth <{cpu_processor.getInputBitDepth()}>."
+        )
+    if get_bitdepth(out.dtype) != cpu_processor.getOutputBitDepth():
+        raise ValueError(
+            f"out dtype <{out.dtype}> doesn't match the processor output "
+            f"bit-depth <{cpu_processor.getOutputBitDepth()}>."
+        )
+
+    workers = workers or os.cpu_count() or 1
+    height = image.shape[0]
+    if band_rows is None:
+        band_rows = max(math.ceil(height / (workers * 4)), MIN_BAND_ROWS)
+    bands = split_bands(height, band_rows)
+
+    start = time.perf_counter()
+
+    if workers == 1 or len(bands) == 1:
+        for band_start, band_end in bands:
+            _apply_band(
+                cpu_processor,
+                image[band_start:band_end],
+                out[band_start:band_end]
+            )
+    else:
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+            futures = [
+                executor.submit(
+                    _apply_band,
+                    cpu_processor,
+                    image[band_start:band_end],
+                    out[band_start:band_end]
+                )
+                for band_start, band_end in bands
+            ]
+            for future in futures:
+                future.result()
+
+    duration = time.perf_counter() - start
+    pixels = int(numpy.prod(image.shape[:-1]))
+
+    stats = {
+        "pixels": pixels,
+        "seconds": duration,
+        "megapixels_per_second": pixels / 1e6 / duration if duration else 0.0,
+        "bands": len(bands),
+        "workers": workers,
+    }
+    logger.debug(
+        "[apply_processor] %.2fMP processed in %.1fms (%.1fMP/s) "
+        "with %s bands on %s threads.",
+        pixels / 1e6,
+        duration * 1000,
+        stats["megapixels_per_second"],
+        len(bands),
+        workers
+    )
+    return stats
+
+
+def open_raw(path, shape, dtype=numpy.float32, mode="r", offset=0):
+    """
+    Memory-map a raw interleaved frame buffer, nothing is read until the
+    array is accessed.
+
+    Args:
+        path(str or Path): raw file.
+        shape(tuple): (height, width, channels)
+        dtype(numpy.dtype or str or type): one of the BIT_DEPTHS dtypes.
+        mode(str): numpy.memmap mode, "w+" create or overwrite the file.
+        offset(int): in bytes, size of a header to skip.
+
+    Returns:
+        numpy.memmap:
+    """
+    return numpy.memmap(
+        str(path),
+        dtype=numpy.dtype(dtype),
+        mode=mode,
+        offset=offset,
+        shape=tuple(shape)
+    )
+
+
+def apply_processor_raw(cpu_processor, source, shape, target=None,
+                        dtype=numpy.float32, out_dtype=None, source_offset=0,
+                        target_offset=0, strip_rows=None, workers=None):
+    """
+    Apply the processor on a raw frame buffer on disk, without loading it
+    in memory.
+
+    The image is processed strip by strip : each strip of the source and the
+    target files is memory-mapped, processed with apply_processor() then
+    unmapped, so the memory used stays around a few strips whatever the
+    size of the image.
+
+    Args:
+        cpu_processor(ocio.CPUProcessor):
+        source(str or Path): raw interleaved (height, width, channels) file.
+        shape(tuple): (height, width, channels) of the image.
+        target(str or Path or None):
+            raw file to write, created if needed. None to modify source in
+            place.
+        dtype(numpy.dtype or str or type): of the source, see BIT_DEPTHS.
+        out_dtype(numpy.dtype or str or type or None):
+            of the target, same as dtype if None.
+        source_offset(int): in bytes, size of a header to skip in source.
+        target_offset(int): in bytes, size of a header to skip in target.
+        strip_rows(int or None):
+            number of rows mapped at once, default to approximately
+            STRIP_BYTES per strip.
+        workers(int or None): number of threads, see apply_processor()
+
+    Returns:
+        dict: statistics about the processing (megapixels_per_second, ...)
+    """
+
+    height = shape[0]
+    row_shape = tuple(shape[1:])
+    dtype = numpy.dtype(dtype)
+    out_dtype = numpy.dtype(out_dtype or dtype)
+    row_items = int(numpy.prod(row_shape))
+
+    if target is None:
+        if out_dtype != dtype:
+            raise ValueError("out_dtype must be dtype to process in place.")
+        target = source
+        target_offset = source_offset
+
+    in_place = Path(target).resolve() == Path(source).resolve()
+    if in_place and target_offset != source_offset:
+        raise ValueError("Offsets must be the same to process in place.")
+
+    # create the target with its final size so strips can be mapped.
+    target_size = target_offset + height * row_items * out_dtype.itemsize
+    if not in_place:
+        with open(str(target), "ab") as target_file:
+            if target_file.tell() < target_size:
+                target_file.truncate(target_size)
+
+    if strip_rows is None:
+        row_bytes = row_items * max(dtype.itemsize, out_dtype.itemsize)
+        strip_rows = max(STRIP_BYTES // row_bytes, MIN_BAND_ROWS)
+
+    start = time.perf_counter()
+
+    for strip_start, strip_end in split_bands(height, strip_rows):
+
+        strip_shape = (strip_end - strip_start,) + row_shape
+        target_strip = open_raw(
+            target,
+            strip_shape,
+            dtype=out_dtype,
+            mode="r+",
+            offset=target_offset + strip_start * row_items * out_dtype.itemsize
+        )
+        if in_place:
+            source_strip = target_strip
+        else:
+            source_strip = open_raw(
+                source,
+                strip_shape,
+                dtype=dtype,
+                mode="r",
+                offset=source_offset + strip_start * row_items * dtype.itemsize
+            )
+
+        apply_processor(
+            cpu_processor,
+            source_strip,
+            out=target_strip,
+            workers=workers
+        )
+        target_strip.flush()
+        # unmap the strip before the next one
+        del source_strip
+        del target_strip
+
+    duration = time.perf_counter() - start
+    pixels = height * int(numpy.prod(row_shape[:-1]))
+
+    stats = {
+        "pixels": pixels,
+        "seconds": duration,
+        "megapixels_per_second": pixels / 1e6 / duration if duration else 0.0,
+        "strips": len(split_bands(height, strip_rows)),
+        "strip_rows": strip_rows,
+    }
+    logger.debug(
+        "[apply_processor_raw] %.2fMP processed in %.1fms (%.1fMP/s) "
+        "in %s strips of %s rows.",
+        pixels / 1e6,
+        duration * 1000,
+        stats["megapixels_per_second"],
+        stats["strips"],
+        strip_rows
+    )
+    return stats
@@ -1,57 +1,74 @@
 """
 
 """
+import atexit
 import logging
-import logging.config
-import os
+import sys
 
-import PyOpenColorIO as ocio
+from . import setup
 
 PCKG_ABBR = "mkc"  # package abbreviation
 
 logger = logging.getLogger(f"{PCKG_ABBR}.launcher")
 
+# QueueListener writing the records when the queue is used.
+_listener = None
 
-def _configure_logging():
+
+def _configure_logging(level=None):
     """
     Configure the python logging module.
+
+    Handlers are created directly instead of with logging.config.dictConfig()
+    as importing logging.config is most of the cost of importing the package.
+
+    Args:
+        level(str or int or None): of the package logger,
+            default to setup.LOG_LEVEL.
+    """
+
+    formatter = logging.Formatter(
+        f"[{PCKG_ABBR}][%(levelname)7s] "
+        "%(asctime)s [%(name)38s] //%(message)s"
+    )
+
+    hl_console = logging.StreamHandler(sys.stdout)
+    hl_console.setLevel(logging.DEBUG)
+    hl_console.setFormatter(formatter)
+
+    package_logger = logging.getLogger(PCKG_ABBR)
+    for handler in list(package_logger.handlers):
+        package_logger.removeHandler(handler)
+        handler.close()
+
+    package_logger.addHandler(hl_console)
+    package_logger.setLevel(level or setup.LOG_LEVEL)
+    package_logger.propagate = False
+
+    return
+
+
+def _start_queue():
     """
+    Move the handlers of the package logger behind a QueueHandler, records
+    are then written by a QueueListener thread.
+    """
+
+    import logging.handlers
+    import queue
+
+    global _listener
+
+    package_logger = logging.getLogger(PCKG_ABBR)
+    records = queue.SimpleQueue()
 
-    logging_config = {
-
-        "version": 1,
-        "disable_existing_loggers": False,
-        "formatters": {
-            "fmt_standard": {
-                "format": (
-                    f"[{PCKG_ABBR}][%(levelname)7s] "
-                    "%(asctime)s [%(name)38s] //%(message)s"
-                )
-            }
-        },
-
-        "handlers": {
-            "hl_console": {
-                "level": "DEBUG",
-                "formatter": "fmt_standard",
-                "class": "logging.StreamHandler",
-                "stream": "ext://sys.stdout"
-            },
-        },
-
-        "loggers": {
-            f"{PCKG_ABBR}": {
-                "handlers": [
-                    "hl_console",
-                ],
-                "level": os.environ.get("MCK_LOG_LVL", "DEBUG"),
-                "propagate": False
-            },
-        }
-    }
-
-    # register
-    logging.config.dictConfig(logging_config)
+    _listener = logging.handlers.QueueListener(
+        records,
+        *package_logger.handlers,
+        respect_handler_level=True
+    )
+    package_logger.handlers = [logging.handlers.QueueHandler(records)]
+    _listener.start()
 
     return
 
@@ -65,20 +82,57 @@ PUBLIC
 
 def launch():
 
+    import PyOpenColorIO as ocio
+
     setup_logging()
 
-    logger.info(f"[launch] Using OCIO version : {ocio.__version__}")
+    logger.info("[launch] Using OCIO version : %s", ocio.__version__)
 
     return
 
 
-def setup_logging():
+def setup_logging(level=None, use_queue=None):
     """
     Start the logging system
+
+    Args:
+        level(str or int or None): of the package logger,
+            default to setup.LOG_LEVEL.
+        use_queue(bool or None): True to write the records from a background
+            thread, default to setup.LOG_QUEUE.
     """
 
-    _configure_logging()
+    use_queue = setup.LOG_QUEUE if use_queue is None else use_queue
+
+    stop_logging_queue()
+    _configure_logging(level)
+    if use_queue:
+        _start_queue()
+
     logger.info("[setup_logging] Completed.")
 
     return
 
+
+def stop_logging_queue():
+    """
+    Write the records still in the queue and stop its thread. Nothing happens
+    if the queue is not used. Called at exit.
+    """
+
+    global _listener
+
+    if _listener is None:
+        return
+
+    listener = _listener
+    _listener = None
+
+    package_logger = logging.getLogger(PCKG_ABBR)
+    package_logger.handlers = list(listener.handlers)
+    listener.stop()
+
+    return
+
+
+atexit.register(stop_logging_queue)
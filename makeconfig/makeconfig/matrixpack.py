@@ -0,0 +1,291 @@
+"""
+Precomputed colorspace matrices stored in a numpy .npz file.
+
+Allow utils.matrix_colorspace_transform() to return results without
+importing colour-science, which is slow to import.
+
+Run this module to regenerate the pack at setup.MATRIX_PACK :
+
+    python -m makeconfig.matrixpack
+"""
+import functools
+import importlib.metadata
+import logging
+import threading
+from pathlib import Path
+
+import numpy
+
+from . import setup
+
+logger = logging.getLogger("mkc.matrixpack")
+
+PACK_VERSION = 1  # increment when the structure of the file change.
+
+
+@functools.lru_cache(maxsize=None)
+def _colour_version():
+    """
+    Read from the package metadata to not pay the import of colour-science.
+
+    Returns:
+        str: version of the installed colour-science, empty if not installed.
+    """
+    try:
+        return importlib.metadata.version("colour-science")
+    except importlib.metadata.PackageNotFoundError:
+        return ""
+
+
+class MatrixPack:
+    """
+    Serve colorspace conversion matrices from a pack generated with build().
+
+    Args:
+        path(str or Path): path to the .npz file.
+    """
+
+    def __init__(self, path):
+
+        self.path = Path(path)
+        self.hits = 0
+        self.misses = 0
+
+        data = numpy.load(str(self.path))
+
+        self.version = int(data["version"])
+        self.colour_version = str(data["colour_version"])
+        self.cat = str(data["cat"])
+        self.num_round = int(data["num_round"])
+
+        self.colorspaces = data["colorspaces"].tolist()  # type: list
+        self.whitepoint_names = data["whitepoint_names"].tolist()  # type: list
+        self.illuminants = data["illuminants"].tolist()  # type: list
+        self.table = data["table"]
+        self.rgb_to_xyz = data["rgb_to_xyz"]
+        self.xyz_to_rgb = data["xyz_to_rgb"]
+        self.cat_table = data["cat_table"]
+
+        self._cs_index = {
+            name: index for index, name in enumerate(self.colorspaces)
+        }
+        self._illum_index = {
+            name: index for index, name in enumerate(self.illuminants)
+        }
+
+        return
+
+    def is_compatible(self):
+        """
+        Returns:
+            bool: True if the pack has been built with the current setup
+             and colour-science version. Without colour-science the pack is
+             the only source of matrices so its version is not checked.
+        """
+        colour_version = _colour_version()
+        return (
+            self.version == PACK_VERSION
+            and self.cat == setup.CAT
+            and self.num_round == setup.NUM_ROUND
+            and (not colour_version or self.colour_version == colour_version)
+        )
+
+    def get(self,
+            source,
+            target,
+            source_whitepoint=None,
+            target_whitepoint=None):
+        """
+        Same arguments as utils.matrix_colorspace_transform().
+
+        Returns:
+            numpy.ndarray or None:
+                3x3 matrix or None if the pack can't provide it.
+        """
+
+        matrix = self._get(
+            source,
+            target,
+            source_whitepoint,
+            target_whitepoint
+        )
+
+        if matrix is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return matrix
+
+    def _get(self, source, target, source_whitepoint, target_whitepoint):
+
+        source_index = self._cs_index.get(source)
+        target_index = self._cs_index.get(target)
+        if source_index is None or target_index is None:
+            return None
+
+        # invalid combinations are left to the caller to raise errors.
+        if source == target == "XYZ":
+            return None
+
+        perform_cat = True if source_whitepoint or target_whitepoint else False
+
+        if not perform_cat:
+            return self.table[source_index, target_index].copy()
+
+        if target == "XYZ":
+
+            if not target_whitepoint:
+                return None
+            matrix = self.rgb_to_xyz[source_index].round(setup.NUM_ROUND)
+
+        elif source == "XYZ":
+
+            if not source_whitepoint:
+                return None
+            matrix = self.xyz_to_rgb[target_index].round(setup.NUM_ROUND)
+
+        else:
+
+            # same operation as colour.matrix_RGB_to_RGB without CAT
+            matrix = numpy.einsum(
+                "...ij,...jk->...ik",
+                self.xyz_to_rgb[target_index],
+                self.rgb_to_xyz[source_index]
+            )
+
+        source_whitepoint = source_whitepoint or self.whitepoint_names[source_index]
+        target_whitepoint = target_whitepoint or self.whitepoint_names[target_index]
+        source_wp_index = self._illum_index.get(source_whitepoint)
+        target_wp_index = self._illum_index.get(target_whitepoint)
+        if source_wp_index is None or target_wp_index is None:
+            return None
+
+        matrix_cat = self.cat_table[source_wp_index, target_wp_index]
+        matrix = numpy.dot(matrix_cat, matrix)
+
+        return matrix
+
+    def info(self):
+        """
+        Returns:
+            dict: statistics about the pack usage.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "path": str(self.path),
+            "compatible": self.is_compatible(),
+        }
+
+
+_PACK = None  # type: MatrixPack
+_PACK_LOCK = threading.Lock()
+
+
+def get_pack():
+    """
+    Load the pack at setup.MATRIX_PACK the first time it's called.
+
+    Returns:
+        MatrixPack or None: None if disabled, missing or not compatible.
+    """
+
+    global _PACK
+
+    if not setup.MATRIX_PACK:
+        return None
+
+    with _PACK_LOCK:
+
+        if _PACK is None or _PACK.path != Path(setup.MATRIX_PACK):
+
+            path = Path(setup.MATRIX_PACK)
+            if not path.exists():
+                logger.debug(f"[get_pack] No matrix pack found at <{path}>")
+                return None
+
+            _PACK = MatrixPack(path)
+
+            if not _PACK.is_compatible():
+                logger.warning(
+                    f"[get_pack] Matrix pack <{path}> has been built with "
+                    f"version={_PACK.version}, CAT={_PACK.cat}, "
+                    f"NUM_ROUND={_PACK.num_round}, "
+                    f"colour={_PACK.colour_version}. Not compatible with "
+                    f"current setup, it will be ignored."
+                )
+
+    if not _PACK.is_compatible():
+        return None
+
+    return _PACK
+
+
+def build(path=None, colorspaces=None):
+    """
+    Compute all the matrices and write them to a .npz file.
+    Require colour-science.
+
+    Args:
+        path(str or Path or None): .npz file path, setup.MATRIX_PACK if None.
+        colorspaces(list of str or None):
+            colorspaces names from colour.RGB_COLOURSPACES,
+            all of them if None.
+
+    Returns:
+        Path: path of the written file.
+    """
+
+    import colour
+
+    from . import utils
+
+    path = Path(path or setup.MATRIX_PACK)
+
+    if colorspaces is None:
+        colorspaces = list(colour.RGB_COLOURSPACES.keys())
+    colorspaces = [name for name in colorspaces if name != "XYZ"] + ["XYZ"]
+
+    illum_1931 = colour.CCS_ILLUMINANTS["CIE 1931 2 Degree Standard Observer"]
+    illuminants = list(illum_1931.keys())
+
+    rgb_cs = [colour.RGB_COLOURSPACES[name] for name in colorspaces[:-1]]
+    identity = numpy.identity(3)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    numpy.savez_compressed(
+        str(path),
+        version=PACK_VERSION,
+        colour_version=_colour_version() or colour.__version__,
+        cat=setup.CAT,
+        num_round=setup.NUM_ROUND,
+        colorspaces=numpy.array(colorspaces),
+        whitepoint_names=numpy.array(
+            [cs.whitepoint_name or "" for cs in rgb_cs] + [""]
+        ),
+        illuminants=numpy.array(illuminants),
+        table=utils.matrix_colorspace_table(colorspaces),
+        rgb_to_xyz=numpy.stack(
+            [cs.matrix_RGB_to_XYZ for cs in rgb_cs] + [identity]
+        ),
+        xyz_to_rgb=numpy.stack(
+            [cs.matrix_XYZ_to_RGB for cs in rgb_cs] + [identity]
+        ),
+        cat_table=utils.matrix_whitepoint_table(
+            numpy.stack([illum_1931[name] for name in illuminants]),
+            numpy.stack([illum_1931[name] for name in illuminants]),
+            transform=setup.CAT
+        ),
+    )
+
+    logger.info(
+        f"[build] Matrix pack with {len(colorspaces)} colorspaces and "
+        f"{len(illuminants)} illuminants written to <{path}>"
+    )
+    return path
+
+
+if __name__ == '__main__':
+
+    build()
@@ -0,0 +1,346 @@
+"""
+Optimization pass on the transforms of the config components, executed by
+BaseConfig.bake() when enabled (see setup.OPTIMIZE_TRANSFORMS) :
+
+- nested GroupTransforms are flattened.
+- consecutive MatrixTransforms are precomposed in a single one.
+- identity MatrixTransforms and RangeTransforms are removed.
+- a RangeTransform identical to the previous op is removed.
+
+Other transforms (BuiltinTransform, ColorSpaceTransform, ...) are kept as
+they are, they are only moved out of their nested groups.
+"""
+import contextlib
+import copy
+import logging
+
+import numpy
+import PyOpenColorIO as ocio
+
+from . import setup
+
+logger = logging.getLogger("mkc.optimize")
+
+_INVERSE = {
+    ocio.TRANSFORM_DIR_FORWARD: ocio.TRANSFORM_DIR_INVERSE,
+    ocio.TRANSFORM_DIR_INVERSE: ocio.TRANSFORM_DIR_FORWARD,
+}
+
+# bit-depths a MatrixTransform can have to be precomposed
+_FLOAT_BITDEPTHS = (ocio.BIT_DEPTH_UNKNOWN, ocio.BIT_DEPTH_F32)
+
+
+def count_ops(transform):
+    """
+    Args:
+        transform(ocio.Transform or None):
+
+    Returns:
+        int: number of transforms that are not a GroupTransform.
+    """
+
+    if transform is None:
+        return 0
+    if isinstance(transform, ocio.GroupTransform):
+        return sum([count_ops(child) for child in transform])
+    return 1
+
+
+def _flatten(transform, inverse=False):
+    """
+    Args:
+        transform(ocio.Transform):
+        inverse(bool): True if the transform is applied in inverse.
+
+    Returns:
+        list of ocio.Transform: ops in their execution order. Ops whose
+         direction had to be changed are copies, the given transform is
+         never modified.
+    """
+
+    if transform.getDirection() == ocio.TRANSFORM_DIR_INVERSE:
+        inverse = not inverse
+
+    if not isinstance(transform, ocio.GroupTransform):
+        if inverse == (transform.getDirection() == ocio.TRANSFORM_DIR_INVERSE):
+            return [transform]
+        transform = copy.deepcopy(transform)
+        transform.setDirection(_INVERSE[transform.getDirection()])
+        return [transform]
+
+    children = list(transform)
+    if inverse:
+        children.reverse()
+
+    ops = list()
+    for child in children:
+        # the child direction is handled in the recursion
+        ops.extend(_flatten(child, inverse))
+    return ops
+
+
+def _affine(transform):
+    """
+    Args:
+        transform(ocio.MatrixTransform):
+
+    Returns:
+        tuple or None: (4x4 matrix, offset) applied by the transform in its
+         direction. None if it can't be precomposed.
+    """
+
+    if (
+            transform.getFileInputBitDepth() not in _FLOAT_BITDEPTHS
+            or transform.getFileOutputBitDepth() not in _FLOAT_BITDEPTHS
+    ):
+        return None
+
+    matrix = numpy.array(transform.getMatrix(), dtype=numpy.float64)
+    matrix = matrix.reshape(4, 4)
+    offset = numpy.array(transform.getOffset(), dtype=numpy.float64)
+
+    if transform.getDirection() == ocio.TRANSFORM_DIR_INVERSE:
+        try:
+            matrix = numpy.linalg.inv(matrix)
+        except numpy.linalg.LinAlgError:
+            return None
+        offset = -matrix @ offset
+
+    return matrix, offset
+
+
+def _is_identity(transform):
+
+    if isinstance(transform, ocio.MatrixTransform):
+        affine = _affine(transform)
+        return (
+            affine is not None
+            and numpy.array_equal(affine[0], numpy.identity(4))
+            and not affine[1].any()
+        )
+
+    if isinstance(transform, ocio.RangeTransform):
+        values = [
+            (transform.hasMinInValue(), transform.hasMinOutValue()),
+            (transform.hasMaxInValue(), transform.hasMaxOutValue()),
+        ]
+        if not any([has_in or has_out for has_in, has_out in values]):
+            return True
+        return (
+            transform.getStyle() == ocio.RANGE_NO_CLAMP
+            and transform.getMinInValue() == transform.getMinOutValue()
+            and transform.getMaxInValue() == transform.getMaxOutValue()
+        )
+
+    return False
+
+
+def _is_clamp(transform):
+    """
+    Returns:
+        bool: True if the transform only clamps the values, applying it twice
+         is then the same as applying it once.
+    """
+
+    if not isinstance(transform, ocio.RangeTransform):
+        return False
+
+    if transform.getStyle() != ocio.RANGE_CLAMP:
+        return False
+
+    if transform.hasMinInValue() != transform.hasMinOutValue():
+        return False
+    if transform.hasMaxInValue() != transform.hasMaxOutValue():
+        return False
+    if (
+            transform.hasMinInValue()
+            and transform.getMinInValue() != transform.getMinOutValue()
+    ):
+        return False
+    if (
+            transform.hasMaxInValue()
+            and transform.getMaxInValue() != transform.getMaxOutValue()
+    ):
+        return False
+
+    return True
+
+
+def _simplify(ops):
+    """
+    Args:
+        ops(list of ocio.Transform): flat list of ops.
+
+    Returns:
+        list of ocio.Transform: ops with matrices precomposed and identity or
+         duplicated ops removed.
+    """
+
+    simplified = list()
+    for op in ops:
+
+        if _is_identity(op):
+            continue
+
+        previous = simplified[-1] if simplified else None
+
+        # only a clamp is idempotent, a range remapping values is not
+        if (
+                _is_clamp(op)
+                and isinstance(previous, ocio.RangeTransform)
+                and previous.equals(op)
+        ):
+            continue
+
+        if (
+                isinstance(op, ocio.MatrixTransform)
+                and isinstance(previous, ocio.MatrixTransform)
+        ):
+            affine_previous = _affine(previous)
+            affine = _affine(op)
+            if affine_previous is not None and affine is not None:
+                matrix = affine[0] @ affine_previous[0]
+                offset = affine[0] @ affine_previous[1] + affine[1]
+                simplified[-1] = ocio.MatrixTransform(
+                    matrix=numpy.round(matrix, setup.NUM_ROUND).ravel().tolist(),
+                    offset=numpy.round(offset, setup.NUM_ROUND).tolist(),
+                )
+                if _is_identity(simplified[-1]):
+                    simplified.pop()
+                continue
+
+        simplified.append(op)
+
+    return simplified
+
+
+def optimize_transform(transform):
+    """
+    Args:
+        transform(ocio.Transform or None): not modified.
+
+    Returns:
+        ocio.Transform or None: the given transform if nothing can be
+         optimized, else a new transform.
+    """
+
+    if transform is None:
+        return None
+
+    ops = _flatten(transform)
+    simplified = _simplify(ops)
+
+    nested = isinstance(transform, ocio.GroupTransform) and any([
+        isinstance(child, ocio.GroupTransform) for child in transform
+    ])
+    if len(simplified) == len(ops) and not nested:
+        return transform
+
+    if len(simplified) == 1 and not isinstance(transform, ocio.GroupTransform):
+        return simplified[0]
+    return ocio.GroupTransform(simplified)
+
+
+def _accessors(component):
+    """
+    Args:
+        component(ocio.ColorSpace or ocio.Look or ocio.ViewTransform or
+            ocio.NamedTransform):
+
+    Returns:
+        list of tuple: (getter, setter) of each transform of the component.
+    """
+
+    if isinstance(component, ocio.Look):
+        return [
+            (component.getTransform, component.setTransform),
+            (component.getInverseTransform, component.setInverseTransform),
+        ]
+
+    if isinstance(component, ocio.ColorSpace):
+        directions = (
+            ocio.COLORSPACE_DIR_TO_REFERENCE,
+            ocio.COLORSPACE_DIR_FROM_REFERENCE
+        )
+    elif isinstance(component, ocio.ViewTransform):
+        directions = (
+            ocio.VIEWTRANSFORM_DIR_TO_REFERENCE,
+            ocio.VIEWTRANSFORM_DIR_FROM_REFERENCE
+        )
+    elif isinstance(component, ocio.NamedTransform):
+        directions = (ocio.TRANSFORM_DIR_FORWARD, ocio.TRANSFORM_DIR_INVERSE)
+    else:
+        return list()
+
+    return [
+        (
+            lambda direction=direction: component.getTransform(direction),
+            lambda transform, direction=direction: component.setTransform(
+                transform,
+                direction
+            ),
+        )
+        for direction in directions
+    ]
+
+
+@contextlib.contextmanager
+def optimized(component, stats=None):
+    """
+    Temporarily replace the transforms of the component by their optimized
+    version, the original ones are restored on exit.
+
+    Args:
+        component(ocio.ColorSpace or ocio.Look or ocio.ViewTransform or
+            ocio.NamedTransform):
+        stats(dict or None):
+            {name: [ops before, ops after]} updated with the component.
+    """
+
+    originals = list()
+    try:
+
+        for getter, setter in _accessors(component):
+
+            transform = getter()
+            if transform is None:
+                continue
+
+            new_transform = optimize_transform(transform)
+            if stats is not None:
+                counts = stats.setdefault(component.getName(), [0, 0])
+                counts[0] += count_ops(transform)
+                counts[1] += count_ops(new_transform)
+
+            if new_transform is not transform:
+                originals.append((setter, transform))
+                setter(new_transform)
+
+        yield
+
+    finally:
+        for setter, transform in originals:
+            setter(transform)
+
+    return
+
+
+def format_report(stats):
+    """
+    Args:
+        stats(dict): {name: [ops before, ops after]} as filled by optimized()
+
+    Returns:
+        str: human readable table, only for the components optimized.
+    """
+
+    lines = [f"{'component':<40} {'before':>7} {'after':>7}"]
+    for name, (before, after) in stats.items():
+        if before != after:
+            lines.append(f"{name:<40} {before:>7} {after:>7}")
+
+    before = sum([counts[0] for counts in stats.values()])
+    after = sum([counts[1] for counts in stats.values()])
+    lines.append(f"{'total':<40} {before:>7} {after:>7}")
+
+    return "\n".join(lines)
@@ -0,0 +1,328 @@
+"""
+Profile the cost of every display/view and colorspace of a config : the
+latency to create its processor (without the OCIO processor cache), the CPU
+throughput on a synthetic frame and the number of ops of the processor.
+Results are ranked from the most expensive to the cheapest frame time so
+slow views can be caught before the config ships.
+
+Usage :
+
+    python -m makeconfig.profiler path/to/config.ocio
+    python -m makeconfig.profiler path/to/Versatile.py:Versatile
+        --width 3840 --height 2160 --top 10 --output profile.json
+"""
+import argparse
+import json
+import logging
+import platform
+import sys
+import tempfile
+from pathlib import Path
+
+import PyOpenColorIO as ocio
+
+from . import optimize
+from .benchmark_processors import make_image
+from .benchmark_processors import time_processor
+
+logger = logging.getLogger("mkc.profiler")
+
+KINDS = ("view", "colorspace")
+
+
+def load_config(source, working_dir=None):
+    """
+    Args:
+        source(BaseConfig or ocio.Config or str or Path):
+            config, path to a config.ocio or "path/to/file.py:ClassName".
+        working_dir(str or Path or None):
+            where the disk dependencies of a BaseConfig are written.
+
+    Returns:
+        ocio.Config: new config, with the processor cache disabled.
+    """
+
+    if isinstance(source, str) and not Path(source).exists() and ":" in source:
+        from .config.recipes import load_recipe
+        source = load_recipe(source)()
+
+    if isinstance(source, ocio.Config):
+        config = ocio.Config.CreateFromStream(source.serialize())
+        config.setWorkingDir(source.getWorkingDir())
+
+    elif isinstance(getattr(source, "config", None), ocio.Config):
+        config = ocio.Config.CreateFromStream(str(source))
+        if working_dir and source.disk_dependencies:
+            for dependency in source.disk_dependencies:
+                dependency.write(working_dir)
+            config.setWorkingDir(str(working_dir))
+
+    else:
+        config = ocio.Config.CreateFromFile(str(source))
+
+    config.setProcessorCacheFlags(ocio.PROCESSOR_CACHE_OFF)
+    return config
+
+
+def list_targets(config):
+    """
+    Args:
+        config(ocio.Config):
+
+    Returns:
+        list of tuple: (kind, name) with kind in KINDS, name is
+         "display/view" for views.
+    """
+
+    targets = [
+        ("view", f"{display}/{view}")
+        for display in config.getDisplays()
+        for view in config.getViews(display)
+    ]
+    targets += [
+        ("colorspace", name)
+        for name in config.getColorSpaceNames(
+            ocio.SEARCH_REFERENCE_SPACE_ALL,
+            ocio.COLORSPACE_ALL
+        )
+    ]
+    return targets
+
+
+def _create_processor(config, kind, name, src):
+    """
+    Returns:
+        ocio.Processor: for views from src to the display/view, for
+         colorspaces from the colorspace to its reference space.
+    """
+
+    if kind == "view":
+        display, _, view = name.partition("/")
+        return config.getProcessor(
+            src,
+            display,
+            view,
+            ocio.TRANSFORM_DIR_FORWARD
+        )
+
+    colorspace = config.getColorSpace(name)
+    transform = colorspace.getTransform(ocio.COLORSPACE_DIR_TO_REFERENCE)
+    if transform is not None:
+        return config.getProcessor(transform, ocio.TRANSFORM_DIR_FORWARD)
+
+    transform = colorspace.getTransform(ocio.COLORSPACE_DIR_FROM_REFERENCE)
+    if transform is not None:
+        return config.getProcessor(transform, ocio.TRANSFORM_DIR_INVERSE)
+
+    return config.getProcessor(ocio.GroupTransform())
+
+
+def measure(config, kind, name, src, image, repeat=3, workers=None):
+    """
+    Args:
+        config(ocio.Config): with the processor cache disabled.
+        kind(str): one of KINDS
+        name(str): colorspace name or "display/view"
+        src(str): colorspace or role the views are processed from.
+        image(numpy.ndarray): float32 frame, not modified.
+        repeat(int): number of timed executions, the fastest is kept.
+        workers(int or None): see imaging.apply_processor()
+
+    Returns:
+        dict: costs of this target.
+    """
+
+    result = {"kind": kind, "name": name, "error": None}
+    processors = list()
+
+    def _create():
+        processors[:] = [_create_processor(config, kind, name, src)]
+        return processors[-1].getDefaultCPUProcessor()
+
+    try:
+        timings, _ = time_processor(
+            _create,
+            image,
+            out=image.copy(),
+            repeat=repeat,
+            workers=workers
+        )
+    except ocio.Exception as excp:
+        result["error"] = str(excp)
+        return result
+
+    processor = processors[-1]
+    result.update(timings)
+    result.update({
+        "ops": optimize.count_ops(processor.createGroupTransform()),
+        # ops left after the OCIO optimization used by the CPU processor
+        "optimized_ops": optimize.count_ops(
+            processor.getOptimizedProcessor(
+                ocio.OPTIMIZATION_DEFAULT
+            ).createGroupTransform()
+        ),
+    })
+    return result
+
+
+def profile(source, src=ocio.ROLE_SCENE_LINEAR, width=3840, height=2160,
+            repeat=3, workers=None, kinds=KINDS):
+    """
+    Args:
+        source(BaseConfig or ocio.Config or str or Path): see load_config()
+        src(str): colorspace or role the views are processed from.
+        width(int): of the synthetic frame.
+        height(int): of the synthetic frame.
+        repeat(int): number of timed executions per target.
+        workers(int or None): see imaging.apply_processor()
+        kinds(tuple of str): targets to profile, see KINDS.
+
+    Returns:
+        dict: results ranked from the slowest frame time, ready to be
+         serialized to json.
+    """
+
+    image = make_image(width, height)
+
+    with tempfile.TemporaryDirectory(prefix="mkc_profiler_") as working_dir:
+
+        config = load_config(source, working_dir)
+        results = list()
+        for kind, name in list_targets(config):
+            if kind not in kinds:
+                continue
+            result = measure(
+                config,
+                kind,
+                name,
+                src,
+                image,
+                repeat=repeat,
+                workers=workers
+            )
+            if result["error"]:
+                logger.warning(
+                    "[profile] Can't create the processor of %s <%s>: %s",
+                    kind,
+                    name,
+                    result["error"]
+                )
+            else:
+                logger.debug(
+                    "[profile] %s <%s>: %.3fms creation, %.3fms per frame",
+                    kind,
+                    name,
+                    result["creation_ms"],
+                    result["frame_ms"]
+                )
+            results.append(result)
+
+    results.sort(key=lambda item: (
+        item["error"] is None,
+        -item.get("frame_ms", 0.0),
+        -item.get("creation_ms", 0.0),
+    ))
+
+    return {
+        "python": platform.python_version(),
+        "ocio": ocio.__version__,
+        "platform": platform.platform(),
+        "config": config.getName(),
+        "src": src,
+        "size": [width, height],
+        "results": results,
+    }
+
+
+def format_table(results, top=None):
+    """
+    Args:
+        results(dict): as returned by profile()
+        top(int or None): only the given number of most expensive targets.
+
+    Returns:
+        str: human readable table, ranked.
+    """
+
+    lines = [
+        f"{'rank':>4} {'kind':<10} {'name':<40} {'frame ms':>9} "
+        f"{'MP/s':>8} {'create ms':>9} {'ops':>4} {'opt':>4}"
+    ]
+    for rank, result in enumerate(results["results"][:top], 1):
+        if result["error"]:
+            lines.append(
+                f"{rank:>4} {result['kind']:<10} {result['name']:<40} "
+                f"ERROR {result['error']}"
+            )
+            continue
+        lines.append(
+            f"{rank:>4} {result['kind']:<10} {result['name']:<40} "
+            f"{result['frame_ms']:>9.2f} "
+            f"{result['megapixels_per_second']:>8.1f} "
+            f"{result['creation_ms']:>9.3f} "
+            f"{result['ops']:>4} {result['optimized_ops']:>4}"
+        )
+
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Command line entry point.
+
+    Returns:
+        int: exit code, 1 if a processor can't be created.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="makeconfig.profiler",
+        description="Rank the display/views and colorspaces of a config by "
+                    "processor creation latency and CPU cost."
+    )
+    parser.add_argument(
+        "config",
+        help="path to the config.ocio or path/to/file.py:ClassName"
+    )
+    parser.add_argument(
+        "--src",
+        default=ocio.ROLE_SCENE_LINEAR,
+        help="colorspace or role the views are processed from."
+    )
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--kinds",
+        nargs="+",
+        default=list(KINDS),
+        choices=list(KINDS),
+    )
+    parser.add_argument("--top", type=int, default=None)
+    parser.add_argument("--output", type=Path, help="json file to write.")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("mkc").setLevel(args.log_level)
+
+    results = profile(
+        args.config,
+        src=args.src,
+        width=args.width,
+        height=args.height,
+        repeat=args.repeat,
+        workers=args.workers,
+        kinds=tuple(args.kinds),
+    )
+    print(format_table(results, top=args.top))
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=4), encoding="utf-8")
+        print(f"Results written to <{args.output}>")
+
+    return 1 if any([result["error"] for result in results["results"]]) else 0
+
+
+if __name__ == '__main__':
+
+    sys.exit(main())
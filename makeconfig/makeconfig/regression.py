@@ -0,0 +1,717 @@
+"""
+Golden-image regression suite : every colorspace conversion and
+display/view of a config is applied on a corpus of images and compared to
+stored goldens.
+
+Results are cached by (config fingerprint, image hash, conversion, golden)
+so unchanged combinations are skipped on re-runs. The fingerprint include
+the content of the files used by FileTransforms.
+
+Delta E 2000 is only measured for display-referred SDR outputs, other
+outputs (linear, log, data, ...) are compared with the max absolute
+difference.
+
+Usage :
+
+    python -m makeconfig.regression path/to/config.ocio path/to/images/
+        --goldens path/to/goldens/ --src sRGB [--update]
+        [--since path/to/previous/config.ocio]
+"""
+import argparse
+import concurrent.futures
+import functools
+import hashlib
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy
+import PyOpenColorIO as ocio
+
+from . import diff
+from . import imaging
+from . import runtime
+from .cache import JsonStore
+
+logger = logging.getLogger("mkc.regression")
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".tif", ".tiff", ".exr")
+
+METRICS = ("max_abs", "delta_e_mean", "delta_e_max")
+
+# max absolute difference allowed for outputs without delta E, when no
+# max_abs_tolerance is given.
+MAX_ABS_TOLERANCE = 1e-4
+
+# encodings that can't be decoded as sRGB to compute a delta E.
+_NO_DELTA_E_ENCODINGS = ("display-linear", "hdr-video")
+
+# config loaded once per worker process
+_CONFIG = dict()
+
+
+def _iter_file_transforms(transform):
+
+    if isinstance(transform, ocio.GroupTransform):
+        for child in transform:
+            yield from _iter_file_transforms(child)
+    elif isinstance(transform, ocio.FileTransform):
+        yield transform
+
+    return
+
+
+def list_files(config):
+    """
+    Args:
+        config(ocio.Config):
+
+    Returns:
+        list of str: src of every FileTransform used in the config, sorted.
+    """
+
+    transforms = list()
+    for colorspace in config.getColorSpaces(
+            ocio.SEARCH_REFERENCE_SPACE_ALL,
+            ocio.COLORSPACE_ALL
+    ):
+        transforms.append(colorspace.getTransform(ocio.COLORSPACE_DIR_TO_REFERENCE))
+        transforms.append(colorspace.getTransform(ocio.COLORSPACE_DIR_FROM_REFERENCE))
+    for view_transform in config.getViewTransforms():
+        transforms.append(
+            view_transform.getTransform(ocio.VIEWTRANSFORM_DIR_TO_REFERENCE)
+        )
+        transforms.append(
+            view_transform.getTransform(ocio.VIEWTRANSFORM_DIR_FROM_REFERENCE)
+        )
+    for look in config.getLooks():
+        transforms.append(look.getTransform())
+        transforms.append(look.getInverseTransform())
+    for named_transform in config.getNamedTransforms(ocio.NAMEDTRANSFORM_ALL):
+        transforms.append(named_transform.getTransform(ocio.TRANSFORM_DIR_FORWARD))
+        transforms.append(named_transform.getTransform(ocio.TRANSFORM_DIR_INVERSE))
+
+    files = set()
+    for transform in transforms:
+        if transform is None:
+            continue
+        for file_transform in _iter_file_transforms(transform):
+            files.add(file_transform.getSrc())
+
+    return sorted(files)
+
+
+def config_fingerprint(config):
+    """
+    Args:
+        config(ocio.Config):
+
+    Returns:
+        str: hash of the serialized config, the OCIO version and the content
+         of the files used by FileTransforms.
+    """
+    hasher = hashlib.sha1(config.serialize().encode("utf-8"))
+    hasher.update(ocio.__version__.encode("utf-8"))
+
+    context = config.getCurrentContext()
+    for src in list_files(config):
+        hasher.update(src.encode("utf-8"))
+        try:
+            path = context.resolveFileLocation(src)
+        except ocio.Exception:
+            # missing files are reported as errors when the suite runs
+            hasher.update(b"missing")
+            continue
+        hasher.update(file_hash(path).encode("utf-8"))
+
+    return hasher.hexdigest()
+
+
+def file_hash(path):
+    """
+    Args:
+        path(str or Path):
+
+    Returns:
+        str: hash of the file content.
+    """
+
+    hasher = hashlib.sha1()
+    with open(str(path), "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def list_conversions(config, src):
+    """
+    Args:
+        config(ocio.Config):
+        src(str): colorspace of the images.
+
+    Returns:
+        list of tuple:
+            (dst colorspace, None, None) for each colorspace then
+            (None, display, view) for each display/view.
+    """
+
+    conversions = [
+        (colorspace, None, None)
+        for colorspace in config.getColorSpaceNames()
+        if colorspace != src
+    ]
+    conversions += [
+        (None, display, view)
+        for display in config.getDisplays()
+        for view in config.getViews(display)
+    ]
+    return conversions
+
+
+def conversion_id(src, conversion):
+    """
+    Args:
+        src(str):
+        conversion(tuple): as returned by list_conversions()
+
+    Returns:
+        str: identifier usable as file name.
+    """
+
+    dst, display, view = conversion
+    name = f"{src}__{dst}" if dst else f"{src}__{display}__{view}"
+    return "".join([
+        char if char.isalnum() or char in "-_." else "-" for char in name
+    ])
+
+
+def image_id(image_path):
+    """
+    Args:
+        image_path(str or Path):
+
+    Returns:
+        str: identifier usable as directory name, the image name followed by
+         a short hash of its path relative to the working directory so
+         images with the same name in different directories don't collide.
+    """
+
+    path = Path(image_path).resolve()
+    try:
+        path = Path(os.path.relpath(path))
+    except ValueError:
+        # on a different drive than the working directory
+        pass
+
+    digest = hashlib.sha1(path.as_posix().encode("utf-8")).hexdigest()
+    return f"{path.stem}-{digest[:8]}"
+
+
+def golden_path(goldens_dir, image_path, src, conversion):
+    """
+    Returns:
+        Path: .npy file storing the expected result.
+    """
+    return (
+        Path(goldens_dir)
+        / image_id(image_path)
+        / f"{conversion_id(src, conversion)}.npy"
+    )
+
+
+def has_delta_e(config, conversion):
+    """
+    Args:
+        config(ocio.Config):
+        conversion(tuple): as returned by list_conversions()
+
+    Returns:
+        bool: True if the output of the conversion is display-referred SDR
+         values, that can be decoded as sRGB to compute a delta E.
+    """
+
+    dst, display, view = conversion
+    if not dst:
+        dst = config.getDisplayViewColorSpaceName(display, view)
+        if dst == ocio.OCIO_VIEW_USE_DISPLAY_NAME:
+            dst = display
+
+    colorspace = config.getColorSpace(dst)
+    if colorspace is None:
+        return False
+
+    return (
+        colorspace.getReferenceSpaceType() == ocio.REFERENCE_SPACE_DISPLAY
+        and not colorspace.isData()
+        and colorspace.getEncoding() not in _NO_DELTA_E_ENCODINGS
+    )
+
+
+def delta_e_2000(rgb_a, rgb_b):
+    """
+    Both arrays are interpreted as sRGB encoded values.
+
+    Args:
+        rgb_a(numpy.ndarray): (..., 3)
+        rgb_b(numpy.ndarray): (..., 3)
+
+    Returns:
+        numpy.ndarray: per-pixel CIE 2000 delta E.
+    """
+
+    import colour  # slow import, only when needed
+
+    def _to_lab(rgb):
+        rgb = numpy.nan_to_num(rgb.astype(numpy.float64))
+        return colour.XYZ_to_Lab(colour.sRGB_to_XYZ(rgb))
+
+    return colour.delta_E(_to_lab(rgb_a), _to_lab(rgb_b), method="CIE 2000")
+
+
+def compare(result, golden, delta_e=True):
+    """
+    Args:
+        result(numpy.ndarray):
+        golden(numpy.ndarray):
+        delta_e(bool): False if the values are not sRGB encoded, the delta E
+            metrics are then None.
+
+    Returns:
+        dict: metric name: value, see METRICS
+    """
+
+    if result.shape != golden.shape:
+        raise ValueError(
+            f"result {result.shape} and golden {golden.shape} shapes differ."
+        )
+
+    difference = numpy.abs(result - golden)
+    if not delta_e:
+        return {
+            "max_abs": float(numpy.nanmax(difference)),
+            "delta_e_mean": None,
+            "delta_e_max": None,
+        }
+
+    # delta E is only computed where the pixels differ, it is 0 elsewhere.
+    differ = numpy.any(difference > 0.0, axis=-1)
+    delta_e = numpy.zeros(differ.shape)
+    if differ.any():
+        delta_e[differ] = delta_e_2000(result[differ], golden[differ])
+    return {
+        "max_abs": float(numpy.nanmax(difference)),
+        "delta_e_mean": float(numpy.nanmean(delta_e)),
+        "delta_e_max": float(numpy.nanmax(delta_e)),
+    }
+
+
+@functools.lru_cache(maxsize=4)
+def _read_image(path):
+    """
+    Returns:
+        numpy.ndarray: float32 RGB image, read-only as it is shared.
+    """
+
+    import colour  # slow import, only when needed
+
+    image = colour.read_image(str(path)).astype(numpy.float32)
+    image = numpy.ascontiguousarray(image[..., :3])
+    image.flags.writeable = False
+    return image
+
+
+def _init_worker(config_path, log_level):
+    """
+    Executed once when a worker process start.
+    """
+    logging.getLogger("mkc").setLevel(log_level)
+    _CONFIG["config"] = ocio.Config.CreateFromFile(str(config_path))
+    return
+
+
+def run_conversions(image_path, src, conversions, goldens_dir, update=False):
+    """
+    Apply the conversions on the image and compare them to their golden.
+    The config must have been loaded with _init_worker().
+
+    Args:
+        image_path(str or Path):
+        src(str): colorspace of the image.
+        conversions(list of tuple): see list_conversions()
+        goldens_dir(str or Path):
+        update(bool): True to write the results as the new goldens.
+
+    Returns:
+        list of dict: one result per conversion, same order.
+    """
+
+    config = _CONFIG["config"]
+    image = _read_image(str(image_path))
+    results = list()
+
+    for conversion in conversions:
+
+        dst, display, view = conversion
+        result = {
+            "image": str(image_path),
+            "conversion": conversion_id(src, conversion),
+            "error": None,
+        }
+        results.append(result)
+
+        try:
+            cpu = runtime.get_cpu_processor(
+                config,
+                src,
+                dst=dst,
+                display=display,
+                view=view
+            )
+            output = numpy.empty_like(image)
+            imaging.apply_processor(cpu, image, out=output, workers=1)
+
+            path = golden_path(goldens_dir, image_path, src, conversion)
+            if update:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                numpy.save(str(path), output)
+                result["status"] = "updated"
+                continue
+
+            if not path.exists():
+                result["status"] = "missing"
+                continue
+
+            result.update(
+                compare(
+                    output,
+                    numpy.load(str(path)),
+                    delta_e=has_delta_e(config, conversion)
+                )
+            )
+
+        except Exception as excp:
+            result["status"] = "error"
+            result["error"] = f"{type(excp).__name__}: {excp}"
+
+    return results
+
+
+class ResultStore(JsonStore):
+    """
+    Metrics of the previous runs, stored in a json file in setup.CACHE_DIR.
+
+    Args:
+        name(str): json file name on disk.
+    """
+
+    def __init__(self, name="regression_results"):
+        super().__init__(name)
+        return
+
+
+def _golden_key(path):
+    """
+    Returns:
+        str: cheap fingerprint of the golden file, empty if missing.
+    """
+    if not path.exists():
+        return ""
+    stat = path.stat()
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def run(config_path, images, goldens_dir, src, update=False, workers=None,
+        delta_e_tolerance=1.0, max_abs_tolerance=None, chunk_size=8,
+        use_cache=True, log_level="WARNING", only=None):
+    """
+    Run the regression suite in a pool of processes.
+
+    Args:
+        config_path(str or Path): config.ocio to test.
+        images(list of str or Path): reference images.
+        goldens_dir(str or Path): directory storing the goldens.
+        src(str): colorspace of the images.
+        update(bool): True to write the results as the new goldens.
+        workers(int or None):
+            number of processes, os.cpu_count() if None,
+            0 to run in the current process.
+        delta_e_tolerance(float): max delta E 2000 allowed.
+        max_abs_tolerance(float or None): max absolute difference allowed,
+            for outputs without delta E MAX_ABS_TOLERANCE is used if None.
+        chunk_size(int): number of conversions per task.
+        use_cache(bool): False to compute every combination.
+        log_level(str): level for the mkc logger in the workers.
+        only(list of tuple or None): conversions to run, as returned by
+            list_conversions(), default to all of them.
+
+    Returns:
+        list of dict: one result per image and conversion.
+    """
+
+    config = ocio.Config.CreateFromFile(str(config_path))
+    fingerprint = config_fingerprint(config)
+    conversions = list_conversions(config, src)
+    if only is not None:
+        only = set(only)
+        conversions = [
+            conversion for conversion in conversions if conversion in only
+        ]
+    store = ResultStore()
+
+    results = list()
+    cached = list()
+    tasks = list()
+
+    for image_path in images:
+
+        image_hash = file_hash(image_path)
+        to_run = list()
+
+        for conversion in conversions:
+
+            path = golden_path(goldens_dir, image_path, src, conversion)
+            key = (
+                fingerprint,
+                image_hash,
+                conversion_id(src, conversion),
+                _golden_key(path)
+            )
+            metrics = store.get(key) if use_cache and not update else None
+            if metrics is not None:
+                result = {
+                    "image": str(image_path),
+                    "conversion": conversion_id(src, conversion),
+                    "error": None,
+                    "cached": True,
+                }
+                result.update(metrics)
+                cached.append(result)
+            else:
+                to_run.append(conversion)
+
+        for index in range(0, len(to_run), chunk_size):
+            tasks.append(
+                (
+                    str(image_path),
+                    image_hash,
+                    to_run[index:index + chunk_size],
+                )
+            )
+
+    conversions_by_id = {
+        conversion_id(src, conversion): conversion
+        for conversion in conversions
+    }
+
+    def _process(task_results, image_hash):
+        for result in task_results:
+            if "max_abs" in result:
+                path = golden_path(
+                    goldens_dir,
+                    result["image"],
+                    src,
+                    conversions_by_id[result["conversion"]]
+                )
+                key = (
+                    fingerprint,
+                    image_hash,
+                    result["conversion"],
+                    _golden_key(path)
+                )
+                store.set(key, {metric: result[metric] for metric in METRICS})
+            results.append(result)
+        return
+
+    if workers == 0:
+        _init_worker(config_path, log_level)
+        for image_path, image_hash, task_conversions in tasks:
+            _process(
+                run_conversions(
+                    image_path, src, task_conversions, goldens_dir, update
+                ),
+                image_hash
+            )
+    elif tasks:
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(config_path, log_level),
+        ) as executor:
+            futures = [
+                (
+                    executor.submit(
+                        run_conversions,
+                        image_path,
+                        src,
+                        task_conversions,
+                        goldens_dir,
+                        update
+                    ),
+                    image_hash
+                )
+                for image_path, image_hash, task_conversions in tasks
+            ]
+            for future, image_hash in futures:
+                _process(future.result(), image_hash)
+
+    store.save()
+
+    results.extend(cached)
+    for result in results:
+        if result.get("status") in ("updated", "missing", "error"):
+            continue
+        if result["delta_e_max"] is None:
+            failed = result["max_abs"] > (
+                MAX_ABS_TOLERANCE if max_abs_tolerance is None
+                else max_abs_tolerance
+            )
+        else:
+            failed = result["delta_e_max"] > delta_e_tolerance or (
+                max_abs_tolerance is not None
+                and result["max_abs"] > max_abs_tolerance
+            )
+        result["status"] = "failed" if failed else "passed"
+
+    results.sort(key=lambda item: (item["image"], item["conversion"]))
+    logger.info(
+        "[run] %s combinations, %s from the cache.",
+        len(results),
+        len(cached)
+    )
+    return results
+
+
+def format_table(results):
+    """
+    Args:
+        results(list of dict): as returned by run()
+
+    Returns:
+        str: human readable table.
+    """
+
+    lines = [
+        f"{'image':<20} {'conversion':<48} {'status':<8} "
+        f"{'max abs':>10} {'dE mean':>9} {'dE max':>9}"
+    ]
+    for result in results:
+        metrics = " ".join([
+            f"{result[metric]:>{width}.4f}"
+            if result.get(metric) is not None
+            else " " * width
+            for metric, width in zip(METRICS, (10, 9, 9))
+        ])
+        lines.append(
+            f"{Path(result['image']).name:<20} {result['conversion']:<48} "
+            f"{result['status']:<8} {metrics}"
+            + (" (cached)" if result.get("cached") else "")
+        )
+        if result["error"]:
+            lines.append(f"    {result['error']}")
+
+    counts = dict()
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    lines.append(
+        ", ".join([f"{count} {status}" for status, count in counts.items()])
+    )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Command line entry point.
+
+    Returns:
+        int: exit code, 1 if a combination failed, is missing or errored.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="makeconfig.regression",
+        description="Compare every conversion of a config on reference "
+                    "images to stored goldens."
+    )
+    parser.add_argument("config", type=Path, help="path to the config.ocio")
+    parser.add_argument(
+        "images",
+        nargs="+",
+        type=Path,
+        help="reference images or directories of images."
+    )
+    parser.add_argument("--goldens", type=Path, required=True)
+    parser.add_argument(
+        "--src",
+        default="sRGB",
+        help="colorspace of the reference images."
+    )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="write the results as the new goldens."
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--delta-e", type=float, default=1.0)
+    parser.add_argument("--max-abs", type=float, default=None)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument(
+        "--since",
+        type=Path,
+        help="previous config.ocio, only the conversions affected by the "
+             "changes since it are run (see makeconfig.diff)."
+    )
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("mkc").setLevel(args.log_level)
+
+    images = list()
+    for path in args.images:
+        if path.is_dir():
+            images.extend(sorted([
+                child for child in path.iterdir()
+                if child.suffix.lower() in IMAGE_EXTENSIONS
+            ]))
+        else:
+            images.append(path)
+
+    start = time.perf_counter()
+
+    only = None
+    if args.since:
+        config = ocio.Config.CreateFromFile(str(args.config))
+        only = diff.affected_conversions(
+            diff.diff(args.since, config, src=args.src),
+            list_conversions(config, args.src),
+            args.src,
+            config=config
+        )
+        print(f"{len(only)} conversions affected since <{args.since}>")
+
+    results = run(
+        args.config,
+        images,
+        args.goldens,
+        args.src,
+        update=args.update,
+        workers=args.workers,
+        delta_e_tolerance=args.delta_e,
+        max_abs_tolerance=args.max_abs,
+        use_cache=not args.no_cache,
+        log_level=args.log_level,
+        only=only,
+    )
+    print(format_table(results))
+    print(f"Finished in {time.perf_counter() - start:.3f}s")
+
+    return 1 if any([
+        result["status"] in ("failed", "missing", "error")
+        for result in results
+    ]) else 0
+
+
+if __name__ == '__main__':
+
+    sys.exit(main())
@@ -0,0 +1,395 @@
+"""
+Check that every colorspace conversion matrix is the inverse of the matrix
+converting back, for the whole colour.RGB_COLOURSPACES catalogue at once.
+All the matrices are computed as (K,N,N,3,3) stacks with
+utils.matrix_colorspace_table() and checked with a single batched
+matmul/inverse, the worst pairs are reported.
+
+Combinations with different source and target whitepoints are reported in
+their own "cross-whitepoint" section with their own tolerance :
+utils.matrix_colorspace_transform() applies the chromatic adaptation after
+the RGB conversion so they are not expected to be exact inverses.
+
+Usage :
+
+    python -m makeconfig.roundtrip
+    python -m makeconfig.roundtrip --whitepoints D60 D65 --top 20
+        --tolerance 1e-6 --cross-tolerance 0.5 --output roundtrip.json
+    python -m makeconfig.roundtrip --time-budget 1.0
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy
+
+from . import utils
+
+logger = logging.getLogger("mkc.roundtrip")
+
+WHITEPOINTS = ("D50", "D60", "D65")
+
+# max absolute error accepted on a round-trip. Some colourspaces (sRGB,
+# ProPhoto RGB, ...) use their published rounded XYZ matrices which are not
+# exact inverses of each other, giving errors around 1e-4.
+TOLERANCE = 1e-3
+
+# max absolute error accepted on a round-trip with different source and
+# target whitepoints. The adaptation being applied after the RGB conversion,
+# errors up to ~0.24 are measured on the catalogue : only catch regressions.
+CROSS_TOLERANCE = 0.25
+
+
+def combinations(whitepoints=WHITEPOINTS):
+    """
+    Whitepoints combinations where converting back is the inverse of the
+    conversion : without explicit adaptation, or with the same source and
+    target whitepoint.
+
+    Args:
+        whitepoints(tuple of str): whitepoint names.
+
+    Returns:
+        list of tuple: (source_whitepoint, target_whitepoint)
+    """
+
+    return [(None, None)] + [(whitepoint, whitepoint) for whitepoint in whitepoints]
+
+
+def cross_combinations(whitepoints=WHITEPOINTS):
+    """
+    Whitepoints combinations with different source and target whitepoints.
+
+    Args:
+        whitepoints(tuple of str): whitepoint names.
+
+    Returns:
+        list of tuple: (source_whitepoint, target_whitepoint)
+    """
+
+    return [
+        (source_whitepoint, target_whitepoint)
+        for source_whitepoint in whitepoints
+        for target_whitepoint in whitepoints
+        if source_whitepoint != target_whitepoint
+    ]
+
+
+def build_tables(colorspaces, combinations):
+    """
+    Args:
+        colorspaces(list of str): names from colour.RGB_COLOURSPACES or "XYZ"
+        combinations(list of tuple): (source_whitepoint, target_whitepoint)
+
+    Returns:
+        tuple of numpy.ndarray:
+            forward and backward (K,N,N,3,3) stacks, [k, i, j] is the matrix
+            from colorspaces[i] to colorspaces[j] for combinations[k] and the
+            matrix converting it back.
+    """
+
+    forward = numpy.stack([
+        utils.matrix_colorspace_table(
+            colorspaces,
+            source_whitepoint=source_whitepoint,
+            target_whitepoint=target_whitepoint
+        )
+        for source_whitepoint, target_whitepoint in combinations
+    ])
+    backward = numpy.stack([
+        utils.matrix_colorspace_table(
+            colorspaces,
+            source_whitepoint=target_whitepoint,
+            target_whitepoint=source_whitepoint
+        )
+        for source_whitepoint, target_whitepoint in combinations
+    ])
+    # [k, i, j] must be from colorspaces[j] to colorspaces[i]
+    backward = numpy.swapaxes(backward, 1, 2)
+
+    return forward, backward
+
+
+def check_tables(forward, backward):
+    """
+    Args:
+        forward(numpy.ndarray): (...,3,3) stack
+        backward(numpy.ndarray): (...,3,3) stack, same shape as forward.
+
+    Returns:
+        tuple of numpy.ndarray:
+            roundtrip and inverse errors with the shape of forward without
+            the two last axes. Max absolute difference of backward.forward
+            with identity and of inverse(forward) with backward, the inverse
+            error is inf for singular matrices.
+    """
+
+    identity = numpy.identity(3)
+
+    roundtrip = numpy.abs(numpy.matmul(backward, forward) - identity)
+    roundtrip = roundtrip.max(axis=(-2, -1))
+
+    # singular matrices are replaced by the identity so the stack can be
+    # inverted in one call, their error is set after.
+    singular = numpy.abs(numpy.linalg.det(forward)) < 1e-12
+    safe = numpy.where(singular[..., numpy.newaxis, numpy.newaxis], identity, forward)
+    inverse = numpy.abs(numpy.linalg.inv(safe) - backward).max(axis=(-2, -1))
+    inverse[singular] = numpy.inf
+
+    return roundtrip, inverse
+
+
+def check_colorspaces(colorspaces):
+    """
+    Args:
+        colorspaces(list of str): names from colour.RGB_COLOURSPACES
+
+    Returns:
+        numpy.ndarray: (N,) max absolute difference of
+         matrix_XYZ_to_RGB.matrix_RGB_to_XYZ with identity for each
+         colorspace.
+    """
+
+    import colour  # slow import, only when needed
+
+    rgb_cs = [colour.RGB_COLOURSPACES[name] for name in colorspaces]
+    rgb_to_xyz = numpy.stack([cs.matrix_RGB_to_XYZ for cs in rgb_cs])
+    xyz_to_rgb = numpy.stack([cs.matrix_XYZ_to_RGB for cs in rgb_cs])
+
+    error = numpy.abs(numpy.matmul(xyz_to_rgb, rgb_to_xyz) - numpy.identity(3))
+    return error.max(axis=(-2, -1))
+
+
+def _check_section(colorspaces, pairs, top):
+    """
+    Args:
+        colorspaces(list of str): with "XYZ" last.
+        pairs(list of tuple): (source_whitepoint, target_whitepoint)
+        top(int or None): number of worst pairs to report, all if None.
+
+    Returns:
+        dict: errors of the given combinations, worst pairs ranked by error.
+    """
+
+    if not pairs:
+        return {
+            "combinations": [],
+            "matrices": 0,
+            "build_time": 0.0,
+            "check_time": 0.0,
+            "max_error": 0.0,
+            "worst": [],
+        }
+
+    start = time.perf_counter()
+    forward, backward = build_tables(colorspaces, pairs)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    roundtrip, inverse = check_tables(forward, backward)
+    check_time = time.perf_counter() - start
+
+    error = numpy.maximum(roundtrip, inverse)
+    ranked = numpy.argsort(error, axis=None)[::-1][:top]
+    worst = list()
+    for combination_index, source_index, target_index in zip(
+            *numpy.unravel_index(ranked, error.shape)
+    ):
+        source_whitepoint, target_whitepoint = pairs[combination_index]
+        index = (combination_index, source_index, target_index)
+        worst.append({
+            "source": colorspaces[source_index],
+            "target": colorspaces[target_index],
+            "source_whitepoint": source_whitepoint,
+            "target_whitepoint": target_whitepoint,
+            "roundtrip_error": float(roundtrip[index]),
+            "inverse_error": float(inverse[index]),
+        })
+
+    return {
+        "combinations": [list(pair) for pair in pairs],
+        "matrices": int(roundtrip.size),
+        "build_time": build_time,
+        "check_time": check_time,
+        "max_error": float(error.max()),
+        "worst": worst,
+    }
+
+
+def check(colorspaces=None, whitepoints=WHITEPOINTS, top=10):
+    """
+    Args:
+        colorspaces(list of str or None):
+            names from colour.RGB_COLOURSPACES, all of them if None.
+            "XYZ" is always added.
+        whitepoints(tuple of str): see combinations()
+        top(int or None): number of worst pairs to report, all if None.
+
+    Returns:
+        dict: worst pairs ranked by error, ready to be serialized to json.
+         Combinations with different whitepoints are in "cross_whitepoint".
+    """
+
+    import colour  # slow import, only when needed
+
+    if colorspaces is None:
+        colorspaces = list(colour.RGB_COLOURSPACES.keys())
+    # XYZ is always the last one
+    colorspaces = [name for name in colorspaces if name != "XYZ"] + ["XYZ"]
+
+    results = _check_section(colorspaces, combinations(whitepoints), top)
+    cross = _check_section(colorspaces, cross_combinations(whitepoints), top)
+    colorspace_errors = check_colorspaces(colorspaces[:-1])
+
+    logger.debug(
+        "[check] %s matrices built in %.3fs, checked in %.3fs",
+        results["matrices"] + cross["matrices"],
+        results["build_time"] + cross["build_time"],
+        results["check_time"] + cross["check_time"]
+    )
+
+    results.update({
+        "colour": colour.__version__,
+        "colorspaces": len(colorspaces),
+        "cross_whitepoint": cross,
+        # colorspaces whose own XYZ matrices are not inverses, the cause
+        # of most round-trip errors.
+        "colorspaces_inexact": {
+            colorspaces[index]: float(colorspace_errors[index])
+            for index in numpy.argsort(colorspace_errors)[::-1]
+            if colorspace_errors[index] > 1e-9
+        },
+    })
+    return results
+
+
+def _format_section(section):
+
+    lines = [
+        f"{section['matrices']} matrices, built in "
+        f"{section['build_time']:.3f}s, checked in "
+        f"{section['check_time']:.3f}s, max error {section['max_error']:.3e}",
+        f"{'source':<28} {'target':<28} {'whitepoints':<11} "
+        f"{'roundtrip':>10} {'inverse':>10}",
+    ]
+    for pair in section["worst"]:
+        whitepoints = f"{pair['source_whitepoint']}>{pair['target_whitepoint']}"
+        if pair["source_whitepoint"] is None:
+            whitepoints = "-"
+        lines.append(
+            f"{pair['source']:<28} {pair['target']:<28} {whitepoints:<11} "
+            f"{pair['roundtrip_error']:>10.3e} {pair['inverse_error']:>10.3e}"
+        )
+
+    return lines
+
+
+def format_table(results):
+    """
+    Args:
+        results(dict): as returned by check()
+
+    Returns:
+        str: human readable table of the worst pairs.
+    """
+
+    lines = _format_section(results)
+
+    if results["cross_whitepoint"]["matrices"]:
+        lines.append("cross-whitepoint :")
+        lines.extend(_format_section(results["cross_whitepoint"]))
+
+    if results["colorspaces_inexact"]:
+        lines.append("XYZ matrices not inverses of each other :")
+        for name, error in results["colorspaces_inexact"].items():
+            lines.append(f"    {name:<28} {error:.3e}")
+
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Command line entry point.
+
+    Returns:
+        int: exit code, 1 if an error is above its tolerance.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="makeconfig.roundtrip",
+        description="Check that every colorspace conversion matrix is the "
+                    "inverse of the matrix converting back."
+    )
+    parser.add_argument(
+        "--colorspaces",
+        nargs="+",
+        default=None,
+        help="colorspaces to check, all colour.RGB_COLOURSPACES by default."
+    )
+    parser.add_argument("--whitepoints", nargs="*", default=list(WHITEPOINTS))
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument(
+        "--cross-tolerance",
+        type=float,
+        default=CROSS_TOLERANCE,
+        help="tolerance for different source and target whitepoints."
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        help="max seconds to build and check all the matrices, excluding "
+             "the colour import."
+    )
+    parser.add_argument("--output", type=Path, help="json file to write.")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("mkc").setLevel(args.log_level)
+
+    results = check(
+        colorspaces=args.colorspaces,
+        whitepoints=tuple(args.whitepoints),
+        top=args.top,
+    )
+    print(format_table(results))
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=4), encoding="utf-8")
+        print(f"Results written to <{args.output}>")
+
+    exit_code = 0
+
+    if args.time_budget is not None:
+        duration = sum([
+            section["build_time"] + section["check_time"]
+            for section in (results, results["cross_whitepoint"])
+        ])
+        print(
+            f"Built and checked in {duration:.3f}s "
+            f"(budget {args.time_budget:.3f}s)"
+        )
+        if duration > args.time_budget:
+            exit_code = 1
+
+    for name, section, tolerance in [
+        ("", results, args.tolerance),
+        ("cross-whitepoint ", results["cross_whitepoint"], args.cross_tolerance),
+    ]:
+        if section["max_error"] > tolerance:
+            print(
+                f"{name}max error {section['max_error']:.3e} is above the "
+                f"tolerance {tolerance:.3e}"
+            )
+            exit_code = 1
+
+    return exit_code
+
+
+if __name__ == '__main__':
+
+    sys.exit(main())
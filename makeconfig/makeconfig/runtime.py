@@ -0,0 +1,258 @@
+"""
+Helpers for tools using the configs at runtime (viewers, batch tools, ...).
+"""
+import collections
+import logging
+import threading
+
+import PyOpenColorIO as ocio
+
+from . import setup
+
+logger = logging.getLogger("mkc.runtime")
+
+
+class _Entry:
+    """
+    Slot of the cache, the lock make sure the value is only built once even
+    if multiple threads request it at the same time.
+    """
+
+    __slots__ = ("lock", "value")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.value = None
+
+
+class ProcessorCache:
+    """
+    Thread-safe LRU cache of ocio.Processor and ocio.CPUProcessor.
+
+    Keys are built from the config cacheID so different configs (or the same
+    config modified) never share processors.
+
+    Args:
+        maxsize(int or None): max number of processors kept,
+            default to setup.PROCESSOR_CACHE_SIZE.
+    """
+
+    def __init__(self, maxsize=None):
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+        return
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key, factory):
+        """
+        Args:
+            key(tuple):
+            factory(callable): build the value if not cached.
+
+        Returns:
+            cached or newly built value.
+        """
+
+        maxsize = self.maxsize or setup.PROCESSOR_CACHE_SIZE
+
+        with self._lock:
+
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry()
+                self._entries[key] = entry
+                self.misses += 1
+                while len(self._entries) > maxsize:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        with entry.lock:
+
+            if entry.value is None:
+                try:
+                    entry.value = factory()
+                except Exception:
+                    with self._lock:
+                        if self._entries.get(key) is entry:
+                            del self._entries[key]
+                    raise
+
+            return entry.value
+
+    def get_processor(self,
+                      config,
+                      src,
+                      dst=None,
+                      display=None,
+                      view=None,
+                      direction=ocio.TRANSFORM_DIR_FORWARD):
+        """
+        Get a colorspace conversion processor (src -> dst) or a display/view
+        processor (src -> display/view).
+
+        Args:
+            config(ocio.Config):
+            src(str): source colorspace or role.
+            dst(str or None): destination colorspace or role.
+            display(str or None):
+            view(str or None):
+            direction(ocio.TransformDirection): for display/view only.
+
+        Returns:
+            ocio.Processor:
+        """
+
+        if dst is None and not (display and view):
+            raise ValueError("Please give a dst or a display and a view.")
+
+        key = (
+            "processor",
+            config.getCacheID(),
+            src,
+            dst,
+            display,
+            view,
+            direction,
+        )
+
+        def _factory():
+            if dst is not None:
+                return config.getProcessor(src, dst)
+            return config.getProcessor(src, display, view, direction)
+
+        return self._get(key, _factory)
+
+    def get_cpu_processor(self,
+                          config,
+                          src,
+                          dst=None,
+                          display=None,
+                          view=None,
+                          direction=ocio.TRANSFORM_DIR_FORWARD,
+                          optimization=None,
+                          in_bitdepth=None,
+                          out_bitdepth=None):
+        """
+        Same as get_processor() but return the CPUProcessor.
+
+        The default CPU processor is returned if no optimization or bit-depth
+        is given, else an optimized one.
+
+        Args:
+            config(ocio.Config):
+            src(str): source colorspace or role.
+            dst(str or None): destination colorspace or role.
+            display(str or None):
+            view(str or None):
+            direction(ocio.TransformDirection): for display/view only.
+            optimization(ocio.OptimizationFlags or None):
+            in_bitdepth(ocio.BitDepth or None): default to BIT_DEPTH_F32
+            out_bitdepth(ocio.BitDepth or None): default to BIT_DEPTH_F32
+
+        Returns:
+            ocio.CPUProcessor:
+        """
+
+        key = (
+            "cpu",
+            config.getCacheID(),
+            src,
+            dst,
+            display,
+            view,
+            direction,
+            optimization,
+            in_bitdepth,
+            out_bitdepth,
+        )
+
+        def _factory():
+            processor = self.get_processor(
+                config,
+                src,
+                dst=dst,
+                display=display,
+                view=view,
+                direction=direction
+            )
+            if optimization is None and in_bitdepth is None and out_bitdepth is None:
+                return processor.getDefaultCPUProcessor()
+            return processor.getOptimizedCPUProcessor(
+                in_bitdepth or ocio.BIT_DEPTH_F32,
+                out_bitdepth or ocio.BIT_DEPTH_F32,
+                ocio.OPTIMIZATION_DEFAULT if optimization is None else optimization
+            )
+
+        return self._get(key, _factory)
+
+    def clear(self):
+        """
+        Remove all processors and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+        return
+
+    def info(self):
+        """
+        Returns:
+            dict: statistics about the cache usage.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize or setup.PROCESSOR_CACHE_SIZE,
+        }
+
+
+# cache shared by the module functions
+PROCESSOR_CACHE = ProcessorCache()
+
+
+def get_processor(config, src, dst=None, display=None, view=None,
+                  direction=ocio.TRANSFORM_DIR_FORWARD):
+    """
+    See ProcessorCache.get_processor(), use the shared PROCESSOR_CACHE.
+    """
+    return PROCESSOR_CACHE.get_processor(
+        config,
+        src,
+        dst=dst,
+        display=display,
+        view=view,
+        direction=direction
+    )
+
+
+def get_cpu_processor(config, src, dst=None, display=None, view=None,
+                      direction=ocio.TRANSFORM_DIR_FORWARD, optimization=None,
+                      in_bitdepth=None, out_bitdepth=None):
+    """
+    See ProcessorCache.get_cpu_processor(), use the shared PROCESSOR_CACHE.
+    """
+    return PROCESSOR_CACHE.get_cpu_processor(
+        config,
+        src,
+        dst=dst,
+        display=display,
+        view=view,
+        direction=direction,
+        optimization=optimization,
+        in_bitdepth=in_bitdepth,
+        out_bitdepth=out_bitdepth
+    )
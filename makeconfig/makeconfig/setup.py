@@ -2,10 +2,53 @@
 
 """
 import logging
+import os
+from pathlib import Path
 
 logger = logging.getLogger("mkc.setup")
 
 
+# level of the "mkc" logger, INFO or WARNING for production builds.
+LOG_LEVEL = os.environ.get("MKC_LOG_LVL", "DEBUG")
+
+# emit the log records to a queue processed in a background thread so the
+# log I/O doesn't happen in the build thread.
+LOG_QUEUE = os.environ.get("MKC_LOG_QUEUE", "0") not in ("", "0")
+
+# max seconds for `import makeconfig`, see benchmark.time_import().
+IMPORT_BUDGET = 0.1
+
 NUM_ROUND = 12  # number of decimals values to keep for config numbers.
 
-CAT = "Bradford"  # chromatic adaption transform used for conversions.
\ No newline at end of file
+CAT = "Bradford"  # chromatic adaption transform used for conversions.
+
+WRITE_WORKERS = 8  # number of threads used to write disk dependencies.
+
+# number of processes baking LUTs, None for the number of cpus,
+# 0 to bake in the current process.
+BAKE_WORKERS = None
+
+CACHE_SIZE = 256  # max number of matrices kept in memory per cache.
+
+PROCESSOR_CACHE_SIZE = 64  # max number of processors kept by runtime.
+
+# directory where computed matrices are persisted between builds.
+# set to None (or MKC_CACHE_DIR to an empty string) to only keep them
+# in memory.
+CACHE_DIR = os.environ.get(
+    "MKC_CACHE_DIR",
+    Path.home() / ".cache" / "makeconfig"
+) or None
+
+BUILD_CACHE_SIZE = 16  # max number of builds kept by buildcache.
+
+# flatten groups, precompose matrices and remove redundant ops of the
+# transforms when baked, see makeconfig.optimize.
+OPTIMIZE_TRANSFORMS = os.environ.get("MKC_OPTIMIZE", "0") not in ("", "0")
+
+# precomputed matrices served before computing them with colour-science.
+# regenerate with `python -m makeconfig.matrixpack`, set to None to disable.
+MATRIX_PACK = os.environ.get(
+    "MKC_MATRIX_PACK",
+    Path(__file__).parent / "data" / "matrices.npz"
+) or None
@@ -0,0 +1,32 @@
+"""
+
+"""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from makeconfig import setup
+from makeconfig import utils
+
+
+@pytest.fixture(autouse=True, scope="session")
+def cache_dir():
+    """
+    Keep the caches written by the tests out of the user cache directory.
+    """
+
+    previous = setup.CACHE_DIR
+    with tempfile.TemporaryDirectory(prefix="mkc_tests_") as tmp_dir:
+
+        setup.CACHE_DIR = Path(tmp_dir)
+        try:
+            yield setup.CACHE_DIR
+            # pending matrices would be written to the restored directory
+            # when the interpreter exits.
+            utils.matrix_cache_clear()
+        finally:
+            setup.CACHE_DIR = previous
+
+    return
@@ -0,0 +1,79 @@
+"""
+
+"""
+
+import copy
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+import makeconfig
+from makeconfig import benchmark
+from makeconfig.config import recipes
+
+RECIPES_FILE = Path(__file__).parent / "test_recipes.py"
+SimpleConfig = recipes.load_recipe(f"{RECIPES_FILE}:SimpleConfig")
+
+
+class Tester01(unittest.TestCase):
+
+    def test_benchmark(self):
+
+        results = benchmark.run([SimpleConfig], warmup=1, repeat=3)
+        result = results["results"][0]
+
+        self.assertEqual(result["recipe"], "Simple")
+        self.assertEqual(tuple(result["stages"]), benchmark.STAGES)
+        for summary in result["stages"].values():
+            self.assertEqual(len(summary["samples"]), 3)
+            self.assertLessEqual(summary["min"], summary["median"])
+            self.assertLessEqual(summary["median"], summary["p99"])
+
+        self.assertEqual(benchmark.compare(results, results), [])
+
+        # baseline 10 times faster than the results
+        baseline = copy.deepcopy(results)
+        for summary in baseline["results"][0]["stages"].values():
+            summary["median"] /= 10.0
+        regressions = benchmark.compare(results, baseline, threshold=0.1)
+        self.assertEqual(len(regressions), len(benchmark.STAGES))
+
+        return
+
+    def test_import_budget(self):
+
+        # the budget itself is checked with `benchmark --import-budget`,
+        # wall-clock time is not reliable on loaded machines.
+        summary = benchmark.time_import(repeat=3)
+        self.assertGreater(summary["median"], 0.0)
+
+        # heavy dependencies are only imported when needed
+        process = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, makeconfig\n"
+                "from makeconfig.config.constants import Encodings\n"
+                "print(sorted(set(sys.modules) & "
+                "{'numpy', 'colour', 'PyOpenColorIO'}))\n"
+                "makeconfig.BaseConfig\n"
+                "print('PyOpenColorIO' in sys.modules)"
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(process.stdout.splitlines()[-2:], ["[]", "True"])
+
+        # every public module is declared, not only the ones imported
+        package = Path(makeconfig.__file__).parent
+        for path in package.glob("*.py"):
+            if not path.stem.startswith("_"):
+                self.assertIn(path.stem, makeconfig._LAZY_ATTRIBUTES)
+        return
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+
+"""
+
+import unittest
+
+import PyOpenColorIO as ocio
+
+from makeconfig import benchmark_processors
+
+
+class Tester01(unittest.TestCase):
+
+    def test_parse_bitdepths(self):
+
+        self.assertEqual(
+            benchmark_processors.parse_bitdepths("uint8"),
+            ("uint8", "uint8")
+        )
+        self.assertEqual(
+            benchmark_processors.parse_bitdepths("uint8:float"),
+            ("uint8", "float")
+        )
+        self.assertRaises(
+            ValueError,
+            benchmark_processors.parse_bitdepths,
+            "int8"
+        )
+        return
+
+    def test_time_processor(self):
+
+        config = ocio.Config.CreateRaw()
+        created = list()
+
+        def _create():
+            created.append(config.getProcessor(ocio.MatrixTransform()))
+            return created[-1].getDefaultCPUProcessor()
+
+        image = benchmark_processors.make_image(64, 32)
+        original = image.copy()
+        timings, cpu = benchmark_processors.time_processor(
+            _create,
+            image,
+            out=image.copy(),
+            repeat=2,
+            workers=1
+        )
+        self.assertEqual(len(created), 2)
+        self.assertIsInstance(cpu, ocio.CPUProcessor)
+        self.assertGreater(timings["megapixels_per_second"], 0.0)
+        self.assertGreater(timings["frame_ms"], 0.0)
+        self.assertGreaterEqual(timings["creation_ms"], 0.0)
+        self.assertTrue((image == original).all())
+
+        # a created processor is only executed
+        timings, prebuilt = benchmark_processors.time_processor(
+            cpu,
+            image,
+            repeat=2,
+            workers=1
+        )
+        self.assertIs(prebuilt, cpu)
+        self.assertEqual(len(created), 2)
+        self.assertIsNone(timings["creation_ms"])
+        self.assertGreater(timings["megapixels_per_second"], 0.0)
+        return
+
+    def test_run(self):
+
+        config = ocio.Config.CreateRaw()
+        results = benchmark_processors.run(
+            config,
+            src="raw",
+            bitdepths=[("float", "float"), ("uint8", "uint8")],
+            optimizations=["none", "draft"],
+            width=64,
+            height=32,
+            repeat=1,
+            workers=1
+        )
+        self.assertEqual(len(results["results"]), 1 * 2 * 2)
+
+        for result in results["results"]:
+            # raw is a no-op, the input is already quantized
+            self.assertEqual(result["max_error"], 0.0)
+
+        fastest = benchmark_processors.fastest(results, tolerance=1e-6)
+        self.assertIsNotNone(fastest["sRGB/Raw"])
+        fastest = benchmark_processors.fastest(results, tolerance=-1.0)
+        self.assertIsNone(fastest["sRGB/Raw"])
+        self.assertIn("sRGB/Raw", benchmark_processors.format_table(results))
+        return
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from makeconfig import buildcache
+from makeconfig import setup
+
+RECIPES_FILE = Path(__file__).parent / "test_recipes.py"
+
+
+class Tester01(unittest.TestCase):
+
+    def test_build_key(self):
+
+        key = buildcache.build_key([RECIPES_FILE])
+        self.assertEqual(key, buildcache.build_key([RECIPES_FILE]))
+        self.assertNotEqual(key, buildcache.build_key([]))
+
+        num_round = setup.NUM_ROUND
+        try:
+            setup.NUM_ROUND = num_round + 1
+            self.assertNotEqual(key, buildcache.build_key([RECIPES_FILE]))
+        finally:
+            setup.NUM_ROUND = num_round
+        return
+
+    def test_build(self):
+
+        spec = f"{RECIPES_FILE}:SimpleConfig"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            cache = buildcache.BuildCache(Path(tmp_dir) / "cache", maxsize=1)
+            config_path = Path(tmp_dir) / "build" / "config.ocio"
+
+            self.assertFalse(buildcache.build(spec, config_path, cache=cache))
+            expected = config_path.read_text()
+
+            config_path.unlink()
+            self.assertTrue(buildcache.build(spec, config_path, cache=cache))
+            self.assertEqual(config_path.read_text(), expected)
+
+            self.assertFalse(
+                buildcache.build(spec, config_path, use_cache=False, cache=cache)
+            )
+
+            # another key evict the previous one
+            buildcache.build(spec, config_path, cache=cache, sources=[])
+            self.assertEqual(len(list(cache.directory.iterdir())), 1)
+            self.assertFalse(buildcache.build(spec, config_path, cache=cache))
+
+        return
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from makeconfig import cli
+from makeconfig.config import recipes
+
+RECIPES_FILE = Path(__file__).parent / "test_recipes.py"
+
+
+class Tester01(unittest.TestCase):
+
+    def test_discover_recipes(self):
+
+        specs = recipes.discover_recipes(RECIPES_FILE)
+        self.assertEqual(specs, [f"{RECIPES_FILE}:SimpleConfig"])
+        self.assertEqual(recipes.load_recipe(specs[0]).name, "Simple")
+        return
+
+    def test_build_recipes(self):
+
+        spec = f"{RECIPES_FILE}:SimpleConfig"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            for workers in (0, 2):
+                # duplicated specs are only built once
+                results = cli.build_recipes(
+                    [spec, spec],
+                    output_dir=tmp_dir,
+                    workers=workers
+                )
+                self.assertEqual(len(results), 1)
+                self.assertIsNone(results[0]["error"])
+                self.assertEqual(
+                    Path(results[0]["output"]),
+                    Path(tmp_dir) / "test_recipes" / "SimpleConfig" / "config.ocio"
+                )
+                self.assertTrue(Path(results[0]["output"]).exists())
+
+            # same file stem and class name in another directory
+            self.assertRaises(
+                ValueError,
+                cli.build_recipes,
+                [spec, f"{Path(tmp_dir) / RECIPES_FILE.name}:SimpleConfig"],
+                output_dir=tmp_dir,
+                workers=0
+            )
+
+            results = cli.build_recipes(
+                [f"{RECIPES_FILE}:NotARecipe"],
+                output_dir=tmp_dir,
+                workers=0
+            )
+            self.assertIn("AttributeError", results[0]["error"])
+
+        return
+
+
+if __name__ == '__main__':
+
+    unittest.main()
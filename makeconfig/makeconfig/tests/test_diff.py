@@ -0,0 +1,141 @@
+"""
+
+"""
+
+import unittest
+
+import PyOpenColorIO as ocio
+
+from makeconfig import diff
+from makeconfig import regression
+
+
+def _make_config():
+
+    config = ocio.Config.CreateRaw()
+
+    for name in ("A", "B"):
+        colorspace = ocio.ColorSpace(name=name)
+        colorspace.setTransform(
+            ocio.MatrixTransform(),
+            ocio.COLORSPACE_DIR_TO_REFERENCE
+        )
+        config.addColorSpace(colorspace)
+
+    config.setRole(ocio.ROLE_SCENE_LINEAR, "A")
+    config.addDisplayView("sRGB", "A", colorSpaceName="A")
+    config.addDisplayView("sRGB", "B", colorSpaceName="B")
+    return config
+
+
+class Tester01(unittest.TestCase):
+
+    def test_diff(self):
+
+        config_a = _make_config()
+        self.assertEqual(diff.diff(config_a, _make_config()), [])
+
+        config_b = _make_config()
+        # only the description changes
+        colorspace = config_b.getColorSpace("A")
+        colorspace.setDescription("changed")
+        config_b.addColorSpace(colorspace)
+        # the processing changes
+        colorspace = config_b.getColorSpace("B")
+        colorspace.setTransform(
+            ocio.MatrixTransform(offset=[0.1, 0.0, 0.0, 0.0]),
+            ocio.COLORSPACE_DIR_TO_REFERENCE
+        )
+        config_b.addColorSpace(colorspace)
+        config_b.addDisplayView("sRGB", "C", colorSpaceName="A")
+        config_b.setRole("data", "B")
+
+        changes = diff.diff(config_a, config_b)
+        self.assertEqual(
+            [
+                (change["section"], change["name"], change["change"])
+                for change in changes
+            ],
+            [
+                ("colorspaces", "A", "modified"),
+                ("colorspaces", "B", "modified"),
+                ("displays", "sRGB", "modified"),
+                ("displays", "sRGB/B", "modified"),
+                ("displays", "sRGB/C", "added"),
+                ("roles", "data", "added"),
+            ]
+        )
+        self.assertEqual(diff.affected(changes, "colorspaces"), {"B"})
+        self.assertEqual(
+            diff.affected(changes, "displays"),
+            {"sRGB", "sRGB/B", "sRGB/C"}
+        )
+
+        conversions = regression.list_conversions(config_b, "A")
+        self.assertEqual(
+            diff.affected_conversions(changes, conversions, "A"),
+            [("B", None, None), (None, "sRGB", "B"), (None, "sRGB", "C")]
+        )
+        # all the colorspace conversions change with the source
+        self.assertEqual(
+            len(diff.affected_conversions(changes, conversions, "B")),
+            len(conversions)
+        )
+
+        removed = diff.diff(config_b, config_a)
+        self.assertIn(
+            {
+                "section": "displays",
+                "name": "sRGB/C",
+                "change": "removed",
+                "affected": True,
+            },
+            removed
+        )
+        return
+
+    def test_affected_view_transforms(self):
+
+        def _make_display_config(offset):
+
+            config = _make_config()
+            colorspace = ocio.ColorSpace(
+                ocio.REFERENCE_SPACE_DISPLAY,
+                name="D"
+            )
+            config.addColorSpace(colorspace)
+            view_transform = ocio.ViewTransform(
+                ocio.REFERENCE_SPACE_SCENE,
+                name="VT",
+                fromReference=ocio.MatrixTransform(
+                    offset=[offset, 0.0, 0.0, 0.0]
+                ),
+            )
+            config.addViewTransform(view_transform)
+            config.addDisplayView("P3", "V", viewTransform="VT",
+                                  displayColorSpaceName="D")
+            return config
+
+        config_a = _make_display_config(0.0)
+        config_b = _make_display_config(0.1)
+        changes = diff.diff(config_a, config_b, src="A")
+        self.assertEqual(diff.affected(changes, "view_transforms"), {"VT"})
+        self.assertEqual(diff.affected(changes, "colorspaces"), set())
+
+        conversions = regression.list_conversions(config_b, "A")
+        # the conversion to the display-referred colorspace use the view
+        # transform, not the one between scene-referred colorspaces.
+        self.assertEqual(
+            diff.affected_conversions(changes, conversions, "A", config_b),
+            [("D", None, None), (None, "P3", "V")]
+        )
+        self.assertIn(
+            ("B", None, None),
+            diff.affected_conversions(changes, conversions, "A")
+        )
+        return
+
+
+if __name__ == '__main__':
+
+    unittest.main()
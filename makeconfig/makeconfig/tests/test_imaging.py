@@ -0,0 +1,154 @@
+"""
+
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy
+import PyOpenColorIO as ocio
+
+from makeconfig import imaging
+
+
+def get_cpu_processor():
+
+    transform = ocio.ExponentTransform([2.2, 2.2, 2.2, 1.0])
+    processor = ocio.Config.CreateRaw().getProcessor(transform)
+    return processor.getDefaultCPUProcessor()
+
+
+class Tester01(unittest.TestCase):
+
+    def test_split_bands(self):
+
+        self.assertEqual(
+            imaging.split_bands(10, 4),
+            [(0, 4), (4, 8), (8, 10)]
+        )
+        return
+
+    def test_apply_processor(self):
+
+        cpu = get_cpu_processor()
+
+        for channels in (3, 4):
+
+            image = numpy.random.rand(123, 37, channels).astype(numpy.float32)
+            expected = image.copy()
+            if channels == 4:
+                cpu.applyRGBA(expected)
+            else:
+                cpu.applyRGB(expected)
+
+            out = numpy.empty_like(image)
+            stats = imaging.apply_processor(
+                cpu,
+                image,
+                out=out,
+                band_rows=16,
+                workers=3
+            )
+            numpy.testing.assert_array_equal(out, expected)
+            self.assertEqual(stats["bands"], 8)
+            self.assertEqual(stats["pixels"], 123 * 37)
+
+            # in place
+            imaging.apply_processor(cpu, image, workers=2)
+            numpy.testing.assert_array_equal(image, expected)
+
+        self.assertRaises(
+            ValueError,
+            imaging.apply_processor,
+            cpu,
+            numpy.zeros((4, 4, 2), dtype=numpy.float32)
+        )
+        return
+
+    def test_apply_processor_bitdepths(self):
+
+        transform = ocio.ExponentTransform([2.2, 2.2, 2.2, 1.0])
+        processor = ocio.Config.CreateRaw().getProcessor(transform)
+        image = numpy.random.rand(64, 32, 3).astype(numpy.float32)
+        expected = image.copy()
+        processor.getDefaultCPUProcessor().applyRGB(expected)
+
+        for in_bitdepth, out_bitdepth in [
+            ("uint8", "uint8"),
+            ("uint16", "float"),
+            ("half", "uint16"),
+        ]:
+            cpu = processor.getOptimizedCPUProcessor(
+                imaging.BIT_DEPTHS[in_bitdepth][0],
+                imaging.BIT_DEPTHS[out_bitdepth][0],
+                ocio.OPTIMIZATION_DEFAULT
+            )
+            source = imaging.from_float(image, imaging.BIT_DEPTHS[in_bitdepth][1])
+            out = numpy.empty(
+                image.shape,
+                dtype=imaging.BIT_DEPTHS[out_bitdepth][1]
+            )
+            imaging.apply_processor(cpu, source, out=out, band_rows=16)
+
+            # input quantization is amplified by the power function
+            numpy.testing.assert_allclose(
+                imaging.to_float(out),
+                expected,
+                atol=0.02
+            )
+
+        self.assertRaises(
+            ValueError,
+            imaging.apply_processor,
+            cpu,
+            numpy.zeros((4, 4, 3), dtype=numpy.float32)
+        )
+        return
+
+    def test_apply_processor_raw(self):
+
+        cpu = get_cpu_processor()
+        image = numpy.random.rand(100, 21, 3).astype(numpy.float32)
+        expected = image.copy()
+        cpu.applyRGB(expected)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            source_path = Path(tmp_dir) / "source.raw"
+            target_path = Path(tmp_dir) / "target.raw"
+            # with a header to skip
+            source_path.write_bytes(b"head" + image.tobytes())
+
+            stats = imaging.apply_processor_raw(
+                cpu,
+                source_path,
+                image.shape,
+                target=target_path,
+                source_offset=4,
+                strip_rows=16,
+                workers=2
+            )
+            self.assertEqual(stats["strips"], 7)
+            target = imaging.open_raw(target_path, image.shape)
+            numpy.testing.assert_array_equal(target, expected)
+            del target
+
+            # in place
+            imaging.apply_processor_raw(
+                cpu,
+                source_path,
+                image.shape,
+                source_offset=4,
+                strip_rows=16
+            )
+            source = imaging.open_raw(source_path, image.shape, offset=4)
+            numpy.testing.assert_array_equal(source, expected)
+            del source
+
+        return
+
+
+if __name__ == '__main__':
+
+    unittest.main()
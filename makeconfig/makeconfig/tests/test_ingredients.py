@@ -0,0 +1,49 @@
+"""
+
+"""
+
+import unittest
+
+from makeconfig.config.ingredients import *
+from makeconfig.config.ingredients import OrderedSet
+
+
+class Tester01(unittest.TestCase):
+
+    def test_ordered_set(self):
+
+        items = OrderedSet(["b", "a"])
+        self.assertTrue(items.add("c"))
+        self.assertFalse(items.add("a"))
+        self.assertEqual(list(items), ["b", "a", "c"])
+        self.assertEqual(items[-1], "c")
+        self.assertIn("a", items)
+        items.discard("a")
+        self.assertNotIn("a", items)
+        self.assertEqual(len(items), 2)
+        return
+
+    def test_display_views(self):
+
+        views = [View(f"view{index}", colorspace="Raw") for index in range(4)]
+        display = Display("sRGB", views + views[:2])
+        self.assertEqual(list(display.views), views)
+        self.assertFalse(views[0].is_shared_view)
+
+        view = View("Extra", colorspace="Raw", parents=display)
+        self.assertIs(display.views[-1], view)
+        display.add_view(view)
+        self.assertEqual(len(display.views), 5)
+
+        displays = [Display(f"display{index}", []) for index in range(3)]
+        attach_views(displays + [display], views)
+        for view in views:
+            self.assertEqual(list(view.parents), [display] + displays)
+            self.assertTrue(view.is_shared_view)
+        self.assertEqual(list(displays[0].views), views)
+        return
+
+
+if __name__ == '__main__':
+
+    unittest.main()
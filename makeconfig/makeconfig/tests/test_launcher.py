@@ -0,0 +1,56 @@
+"""
+
+"""
+
+import contextlib
+import io
+import logging
+import logging.handlers
+import unittest
+
+from makeconfig import launcher
+
+
+class Tester01(unittest.TestCase):
+
+    def tearDown(self):
+        launcher.setup_logging()
+        return
+
+    def test_level(self):
+
+        launcher.setup_logging(level="WARNING", use_queue=False)
+        logger = logging.getLogger("mkc.test")
+        self.assertFalse(logger.isEnabledFor(logging.DEBUG))
+        self.assertTrue(logger.isEnabledFor(logging.WARNING))
+        return
+
+    def test_queue(self):
+
+        stream = io.StringIO()
+        with contextlib.redirect_stdout(stream):
+            launcher.setup_logging(level="DEBUG", use_queue=True)
+
+            package_logger = logging.getLogger("mkc")
+            self.assertEqual(len(package_logger.handlers), 1)
+            self.assertIsInstance(
+                package_logger.handlers[0],
+                logging.handlers.QueueHandler
+            )
+
+            logging.getLogger("mkc.test").debug("[test_queue] %s", "queued")
+            launcher.stop_logging_queue()
+
+        self.assertIn("[test_queue] queued", stream.getvalue())
+        self.assertIsInstance(
+            package_logger.handlers[0],
+            logging.StreamHandler
+        )
+        # nothing to stop anymore
+        launcher.stop_logging_queue()
+        return
+
+
+if __name__ == '__main__':
+
+    unittest.main()
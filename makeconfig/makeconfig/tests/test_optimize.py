@@ -0,0 +1,153 @@
+"""
+
+"""
+
+import unittest
+
+import numpy
+import PyOpenColorIO as ocio
+
+from makeconfig import optimize
+
+
+def _apply(transform, pixels):
+
+    config = ocio.Config.CreateRaw()
+    processor = config.getProcessor(transform).getDefaultCPUProcessor()
+    result = pixels.copy()
+    processor.applyRGB(result)
+    return result
+
+
+class Tester01(unittest.TestCase):
+
+    def test_optimize_transform(self):
+
+        matrix = ocio.MatrixTransform(
+            matrix=[0.5, 0.2, 0.1, 0, 0.1, 0.8, 0.1, 0, 0, 0.1, 0.9, 0, 0, 0, 0, 1],
+            offset=[0.01, 0.0, 0.0, 0.0]
+        )
+        transform = ocio.GroupTransform([
+            ocio.GroupTransform([
+                matrix,
+                ocio.MatrixTransform(
+                    matrix=[2, 0, 0, 0, 0, 2, 0, 0, 0, 0, 2, 0, 0, 0, 0, 1],
+                    direction=ocio.TRANSFORM_DIR_INVERSE
+                ),
+            ]),
+            ocio.MatrixTransform(),
+            ocio.ExponentTransform([2.2, 2.2, 2.2, 1.0]),
+            ocio.RangeTransform(0, 1, 0, 1),
+            ocio.RangeTransform(0, 1, 0, 1),
+            ocio.GroupTransform(
+                [
+                    ocio.ExponentTransform([2.2, 2.2, 2.2, 1.0]),
+                    matrix,
+                ],
+                direction=ocio.TRANSFORM_DIR_INVERSE
+            ),
+        ])
+
+        optimized = optimize.optimize_transform(transform)
+        self.assertEqual(optimize.count_ops(transform), 8)
+        self.assertEqual(
+            [type(op).__name__ for op in optimized],
+            [
+                "MatrixTransform",
+                "ExponentTransform",
+                "RangeTransform",
+                "MatrixTransform",
+                "ExponentTransform",
+            ]
+        )
+        # the inverted ops are copies
+        self.assertEqual(matrix.getDirection(), ocio.TRANSFORM_DIR_FORWARD)
+
+        pixels = numpy.array(
+            [[0.01, 0.18, 0.5], [0.2, 0.4, 0.9]],
+            dtype=numpy.float32
+        )
+        numpy.testing.assert_allclose(
+            _apply(optimized, pixels),
+            _apply(transform, pixels),
+            rtol=1e-5
+        )
+
+        builtin = ocio.GroupTransform([
+            ocio.BuiltinTransform(style="ACEScct_to_ACES2065-1")
+        ])
+        self.assertIs(optimize.optimize_transform(builtin), builtin)
+        self.assertIsNone(optimize.optimize_transform(None))
+        return
+
+    def test_optimize_range(self):
+
+        transform = ocio.GroupTransform([
+            ocio.RangeTransform(
+                minInValue=0,
+                maxInValue=1,
+                minOutValue=0,
+                maxOutValue=0.5
+            ),
+            ocio.RangeTransform(
+                minInValue=0,
+                maxInValue=1,
+                minOutValue=0,
+                maxOutValue=0.5
+            ),
+        ])
+        optimized = optimize.optimize_transform(transform)
+        self.assertEqual(optimize.count_ops(optimized), 2)
+
+        pixels = numpy.array([[0.8, 0.4, 1.5]], dtype=numpy.float32)
+        numpy.testing.assert_allclose(
+            _apply(optimized, pixels),
+            [[0.2, 0.1, 0.25]],
+            rtol=1e-5
+        )
+        numpy.testing.assert_allclose(
+            _apply(optimized, pixels),
+            _apply(transform, pixels),
+            rtol=1e-5
+        )
+
+        clamp = ocio.GroupTransform([
+            ocio.RangeTransform(0, 1, 0, 1),
+            ocio.RangeTransform(0, 1, 0, 1),
+        ])
+        self.assertEqual(
+            optimize.count_ops(optimize.optimize_transform(clamp)),
+            1
+        )
+        return
+
+    def test_optimized(self):
+
+        transform = ocio.GroupTransform([
+            ocio.GroupTransform([ocio.MatrixTransform()]),
+            ocio.RangeTransform(0, 1, 0, 1),
+        ])
+        colorspace = ocio.ColorSpace(name="test")
+        colorspace.setTransform(transform, ocio.COLORSPACE_DIR_FROM_REFERENCE)
+
+        stats = dict()
+        with optimize.optimized(colorspace, stats):
+            optimized = colorspace.getTransform(
+                ocio.COLORSPACE_DIR_FROM_REFERENCE
+            )
+            self.assertEqual(optimize.count_ops(optimized), 1)
+
+        self.assertEqual(stats, {"test": [2, 1]})
+        self.assertEqual(
+            optimize.count_ops(
+                colorspace.getTransform(ocio.COLORSPACE_DIR_FROM_REFERENCE)
+            ),
+            2
+        )
+        self.assertIn("test", optimize.format_report(stats))
+        return
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+
+"""
+
+import unittest
+
+import PyOpenColorIO as ocio
+
+from makeconfig import profiler
+
+
+class Tester01(unittest.TestCase):
+
+    def test_profile(self):
+
+        config = ocio.Config.CreateRaw()
+        colorspace = ocio.ColorSpace(name="gamma")
+        colorspace.setTransform(
+            ocio.GroupTransform([
+                ocio.ExponentTransform([2.2, 2.2, 2.2, 1.0]),
+                ocio.RangeTransform(0, 1, 0, 1),
+            ]),
+            ocio.COLORSPACE_DIR_TO_REFERENCE
+        )
+        config.addColorSpace(colorspace)
+        config.addDisplayView("sRGB", "Gamma", colorSpaceName="gamma")
+        config.addDisplayView("sRGB", "Missing", colorSpaceName="missing")
+
+        results = profiler.profile(
+            config,
+            src="raw",
+            width=64,
+            height=32,
+            repeat=1,
+            workers=1
+        )
+        names = [result["name"] for result in results["results"]]
+        self.assertCountEqual(
+            names,
+            ["sRGB/Raw", "sRGB/Gamma", "sRGB/Missing", "raw", "gamma"]
+        )
+        # errors are ranked first
+        self.assertEqual(names[0], "sRGB/Missing")
+        self.assertTrue(results["results"][0]["error"])
+
+        gamma = results["results"][names.index("gamma")]
+        self.assertEqual(gamma["kind"], "colorspace")
+        self.assertEqual(gamma["ops"], 2)
+        self.assertGreater(gamma["megapixels_per_second"], 0.0)
+        frame_times = [
+            result["frame_ms"] for result in results["results"][1:]
+        ]
+        self.assertEqual(frame_times, sorted(frame_times, reverse=True))
+
+        table = profiler.format_table(results, top=2)
+        self.assertEqual(len(table.splitlines()), 3)
+        # the given config is not modified
+        self.assertEqual(len(list(config.getViews("sRGB"))), 3)
+        return
+
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,398 @@
+"""
+
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy
+import PyOpenColorIO as ocio
+
+from makeconfig import BaseConfig
+from makeconfig import tracing
+from makeconfig.config.ingredients import *
+
+
+class SimpleConfig(BaseConfig):
+
+    name = "Simple"
+
+    def cook_root(self):
+        self.config.setVersion(2, 0)
+        self.config.setName(self.name)
+
+    def cook_colorspaces(self):
+
+        self.cs_raw = Colorspace(
+            name="Raw",
+            description=ColorspaceDescription("none", "none", "none", ""),
+            encoding=Encodings.data,
+            family=Families.scene,
+            categories=[Categories.input],
+            is_data=True
+        )
+        self.add(self.cs_raw)
+
+        self.cs_lin = Colorspace(
+            name="Linear",
+            description=ColorspaceDescription("linear", "sRGB", "D65", ""),
+            encoding=Encodings.scene_linear,
+            family=Families.scene,
+            categories=[Categories.workspace],
+        )
+        self.add(self.cs_lin)
+
+    def cook_named_transform(self):
+        pass
+
+    def cook_colorspaces_display(self):
+
+        self.cs_srgb = ColorspaceDisplay(
+            name="sRGB",
+            description=ColorspaceDescription("sRGB", "sRGB", "D65", ""),
+            encoding=Encodings.sdr_video,
+            family=Families.display,
+            categories=[Categories.output],
+        )
+        self.add(self.cs_srgb)
+
+        self.cs_bt709 = ColorspaceDisplay(
+            name="Rec.709",
+            description=ColorspaceDescription("BT.1886", "BT.709", "D65", ""),
+            encoding=Encodings.sdr_video,
+            family=Families.display,
+            categories=[Categories.output],
+        )
+        self.add(self.cs_bt709)
+
+    def cook_looks(self):
+        pass
+
+    def cook_viewtransforms(self):
+
+        self.viewtm = ViewTransform(ocio.REFERENCE_SPACE_SCENE)
+        self.viewtm.setName("Passthrough")
+        self.viewtm.setTransform(
+            ocio.MatrixTransform(),
+            ocio.VIEWTRANSFORM_DIR_FROM_REFERENCE
+        )
+        self.add(self.viewtm)
+
+    def cook_display(self):
+
+        self.view_disp = View(
+            "Display",
+            view_transform=self.viewtm,
+            colorspace=ocio.OCIO_VIEW_USE_DISPLAY_NAME
+        )
+        self.view_raw = View("Raw", colorspace=self.cs_raw)
+        all_views = [self.view_disp, self.view_raw]
+
+        self.add(Display(self.cs_srgb.name, all_views))
+        self.add(Display(self.cs_bt709.name, all_views))
+
+    def cook_roles(self):
+        self.config.setRole(ocio.ROLE_DEFAULT, self.cs_raw.name)
+        self.config.setRole(ocio.ROLE_SCENE_LINEAR, self.cs_lin.name)
+
+    def cook_misc(self):
+        pass
+
+
+class Tester01(unittest.TestCase):
+
+    def test_build(self):
+
+        config = SimpleConfig()
+        config.validate()
+        self.assertIs(config.tracer, tracing.NULL_TRACER)
+        return
+
+    def test_trace(self):
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            trace_path = Path(tmp_dir) / "trace.json"
+            config = SimpleConfig(trace=trace_path)
+            config.write_to_disk(Path(tmp_dir) / "config.ocio")
+
+            trace = json.loads(trace_path.read_text(encoding="utf-8"))
+
+        names = [event["name"] for event in trace["traceEvents"]]
+        for name in [
+            "cook_root",
+            "cook_misc",
+            "bake_colorspaces",
+            "bake_displays",
+            "write_config",
+        ]:
+            self.assertIn(name, names)
+
+        self.assertIn("cook_display", config.tracer.summary())
+        return
+
+    def test_optimize(self):
+
+        config = SimpleConfig(optimize=True)
+        config.validate()
+        self.assertEqual(config.optimize_stats["Passthrough"], [1, 0])
+        # the components keep their original transforms
+        self.assertIsInstance(
+            config.viewtm.getTransform(ocio.VIEWTRANSFORM_DIR_FROM_REFERENCE),
+            ocio.MatrixTransform
+        )
+        self.assertEqual(SimpleConfig(optimize=False).optimize_stats, {})
+        return
+
+    def test_recook(self):
+
+        config = SimpleConfig()
+        expected = str(config)
+
+        recooked = config.recook(["cook_viewtransforms"])
+        self.assertEqual(
+            recooked,
+            ["cook_viewtransforms", "cook_display", "cook_misc"]
+        )
+        self.assertEqual(str(config), expected)
+        self.assertEqual(len(config.displays), 2)
+
+        self.assertEqual(config.recook(), [])
+
+        class EditedConfig(SimpleConfig):
+            def cook_roles(self):
+                self.config.setRole(ocio.ROLE_DEFAULT, self.cs_lin.name)
+                self.config.setRole(ocio.ROLE_SCENE_LINEAR, self.cs_lin.name)
+
+        config.__class__ = EditedConfig
+        self.assertEqual(config.dirty_phases(), ["cook_roles"])
+        self.assertEqual(config.recook(), ["cook_roles", "cook_misc"])
+        self.assertEqual(str(config), str(EditedConfig()))
+        config.validate()
+
+        # settings written directly on the config are reset
+        class RootConfig(EditedConfig):
+            def cook_root(self):
+                self.config.setVersion(2, 0)
+                self.config.setName("root")
+
+            def cook_roles(self):
+                self.config.setRole(ocio.ROLE_SCENE_LINEAR, self.cs_lin.name)
+
+        config.__class__ = RootConfig
+        self.assertEqual(
+            config.recook(),
+            ["cook_root", "cook_roles", "cook_misc"]
+        )
+        self.assertNotIn(ocio.ROLE_DEFAULT, config.config.getRoleNames())
+        self.assertEqual(str(config), str(RootConfig()))
+        return
+
+    def test_registry(self):
+
+        config = SimpleConfig()
+
+        self.assertIs(config.get("Linear"), config.cs_lin)
+        self.assertIs(config.get("sRGB", kind=Display), config.displays[0])
+        self.assertIs(config.get("sRGB", kind="colorspaces"), config.cs_srgb)
+        self.assertIsNone(config.get("Linear", kind=Display))
+        self.assertRaises(ValueError, config.add, config.cs_lin)
+        # displays with the same name are not merged anymore
+        self.assertRaises(ValueError, config.add, Display("sRGB", views=[]))
+        self.assertRaises(TypeError, config.add, "Linear")
+
+        linear = Colorspace(
+            name="Linear",
+            description=ColorspaceDescription("linear", "sRGB", "D65", "new"),
+            encoding=Encodings.scene_linear,
+            family=Families.scene,
+            categories=[Categories.workspace],
+        )
+        self.assertIs(config.replace(linear), config.cs_lin)
+        self.assertIs(config.colorspaces[1], linear)
+        self.assertIs(config.remove("Linear"), linear)
+        self.assertIsNone(config.get("Linear"))
+        self.assertRaises(KeyError, config.remove, "Linear")
+        self.assertRaises(KeyError, config.replace, linear)
+
+        # the list object is kept and updated, directly appended components
+        # are preserved.
+        colorspaces = config.colorspaces
+        dependency = DiskDependency("lut.spi1d", "data")
+        config.disk_dependencies.append(dependency)
+        config.add(DiskDependency("other.spi1d", "data"))
+        config.remove("Raw")
+        config.add(linear)
+        self.assertIs(config.colorspaces, colorspaces)
+        self.assertEqual(
+            [colorspace.name for colorspace in colorspaces],
+            ["sRGB", "Rec.709", "Linear"]
+        )
+        self.assertIn(dependency, config.disk_dependencies)
+
+        # directly appended components keep their position
+        config.add(DiskDependency("third.spi1d", "data"))
+        config.remove("other.spi1d")
+        self.assertEqual(
+            [str(component) for component in config.disk_dependencies],
+            ["lut.spi1d", "third.spi1d"]
+        )
+
+        # replaced back before the list is rebuilt
+        config.replace(config.cs_lin)
+        config.replace(linear)
+        self.assertIs(config.colorspaces[-1], linear)
+        self.assertEqual(len(config.colorspaces), 3)
+        return
+
+    def test_component_dispatch(self):
+
+        class LookAsColorspace(Look):
+            pass
+
+        class CustomConfig(SimpleConfig):
+            _component_types = (
+                (LookAsColorspace, "colorspaces"),
+            ) + SimpleConfig._component_types
+
+        look = LookAsColorspace(name="custom", processSpace="Linear")
+        self.assertEqual(
+            CustomConfig._component_attribute(look),
+            "colorspaces"
+        )
+        # the other recipes are not affected
+        self.assertEqual(SimpleConfig._component_attribute(look), "looks")
+        self.assertIsNot(
+            CustomConfig._component_dispatch,
+            SimpleConfig._component_dispatch
+        )
+        return
+
+    def test_recook_registry(self):
+
+        class EditedConfig(SimpleConfig):
+            def cook_misc(self):
+                cs_lin = Colorspace(
+                    name="Linear",
+                    description=ColorspaceDescription("linear", "sRGB", "D65", "new"),
+                    encoding=Encodings.scene_linear,
+                    family=Families.scene,
+                    categories=[Categories.workspace],
+                )
+                self.replace(cs_lin)
+                self.remove("Rec.709", kind=Display)
+
+        config = EditedConfig()
+        expected = str(config)
+        self.assertIn("new", config.get("Linear").getDescription())
+
+        self.assertEqual(config.recook(["cook_misc"]), ["cook_misc"])
+        self.assertEqual(str(config), expected)
+        self.assertEqual(
+            [colorspace.name for colorspace in config.colorspaces],
+            ["Raw", "Linear", "sRGB", "Rec.709"]
+        )
+
+        config.recook(["cook_colorspaces"])
+        self.assertEqual(str(config), expected)
+        self.assertEqual(len(config.displays), 1)
+        config.validate()
+        return
+
+    def test_write_to_disk(self):
+
+        config = SimpleConfig()
+        config.disk_dependencies = [
+            DiskDependency(f"luts/lut{index}.spi1d", f"data {index}")
+            for index in range(16)
+        ]
+        config.disk_dependencies.append(DiskDependency("bin.lut", b"\x00\x01"))
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            config_path = Path(tmp_dir) / "config.ocio"
+            config.write_to_disk(config_path)
+
+            lut_path = Path(tmp_dir) / "luts" / "lut3.spi1d"
+            self.assertEqual(lut_path.read_text(), "data 3")
+            self.assertEqual((Path(tmp_dir) / "bin.lut").read_bytes(), b"\x00\x01")
+            self.assertEqual(config_path.read_text(), str(config))
+
+            mtime = lut_path.stat().st_mtime_ns
+            self.assertFalse(config.disk_dependencies[3].write(tmp_dir))
+            config.write_to_disk(config_path)
+            self.assertEqual(lut_path.stat().st_mtime_ns, mtime)
+
+            config.disk_dependencies[3].data = "new data"
+            self.assertTrue(config.disk_dependencies[3].write(tmp_dir))
+            self.assertEqual(lut_path.read_text(), "new data")
+            self.assertEqual(
+                [path.name for path in lut_path.parent.iterdir()
+                 if path.suffix == ".tmp"],
+                []
+            )
+
+        return
+
+    def test_baked_view(self):
+
+        class BakedConfig(SimpleConfig):
+            def cook_misc(self):
+                self.add(BakedView(self.cs_srgb.name, self.view_disp))
+                self.add(
+                    BakedView(self.cs_bt709.name, self.view_disp, fallback=False)
+                )
+
+        config = BakedConfig()
+        config.validate()
+
+        self.assertEqual(
+            [str(dependency.path_relative) for dependency in config.disk_dependencies],
+            ["luts/sRGB_Display.cube", "luts/Rec.709_Display.cube"]
+        )
+        self.assertIn("Display (LUT)", config.config.getViews("sRGB"))
+        self.assertNotIn("Display (LUT)", config.config.getViews("Rec.709"))
+        self.assertEqual(config.config.getDefaultView("sRGB"), "Display")
+
+        # re-baked LUTs replace the previous ones, unchanged ones are reused
+        baked = list()
+        bake_views = config._bake_views
+        config._bake_views = lambda views, workers: (
+            baked.extend(views) or bake_views(views, workers)
+        )
+        config.recook(["cook_colorspaces"])
+        self.assertEqual(baked, [])
+        self.assertEqual(len(config.disk_dependencies), 2)
+        self.assertEqual(str(config), str(BakedConfig()))
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            config_path = Path(tmp_dir) / "config.ocio"
+            config.write_to_disk(config_path)
+            self.assertTrue((Path(tmp_dir) / "luts" / "sRGB_Display.cube").exists())
+
+            written = ocio.Config.CreateFromFile(str(config_path))
+            processor = written.getProcessor(
+                "Linear",
+                "sRGB",
+                "Display (LUT)",
+                ocio.TRANSFORM_DIR_FORWARD
+            ).getDefaultCPUProcessor()
+
+            # the view is a passthrough so the LUT must be close to identity
+            pixels = numpy.array(
+                [[0.01, 0.18, 0.5], [1.0, 2.0, 16.0]],
+                dtype=numpy.float32
+            )
+            result = pixels.copy()
+            processor.applyRGB(result)
+            numpy.testing.assert_allclose(result, pixels, rtol=0.01)
+
+        return
+
+
+if __name__ == '__main__':
+
+    unittest.main()
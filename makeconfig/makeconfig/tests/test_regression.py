@@ -0,0 +1,150 @@
+"""
+
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy
+import PyOpenColorIO as ocio
+
+from makeconfig import regression
+from makeconfig import setup
+
+
+class Tester01(unittest.TestCase):
+
+    def setUp(self):
+        self._cache_dir = setup.CACHE_DIR
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        setup.CACHE_DIR = Path(self._tmp_dir.name) / "cache"
+
+    def tearDown(self):
+        setup.CACHE_DIR = self._cache_dir
+        self._tmp_dir.cleanup()
+
+    def test_compare(self):
+
+        golden = numpy.random.rand(8, 8, 3).astype(numpy.float32)
+        metrics = regression.compare(golden.copy(), golden)
+        self.assertEqual(metrics["max_abs"], 0.0)
+        self.assertEqual(metrics["delta_e_max"], 0.0)
+
+        result = golden.copy()
+        result[2, 3] = [1.0, 0.0, 0.0]
+        result[5, 5] = [0.0, 1.0, 0.0]
+        metrics = regression.compare(result, golden)
+        self.assertGreater(metrics["delta_e_max"], 1.0)
+        self.assertAlmostEqual(
+            metrics["delta_e_mean"] * 64,
+            regression.delta_e_2000(result, golden).sum(),
+            places=5
+        )
+        return
+
+    def test_fingerprint(self):
+
+        root = Path(self._tmp_dir.name)
+        lut_path = root / "lut.spi1d"
+        lut_path.write_text(
+            "Version 1\nFrom 0.0 1.0\nLength 2\nComponents 1\n"
+            "{\n0.0\n1.0\n}\n"
+        )
+        config = ocio.Config.CreateRaw()
+        config.setWorkingDir(str(root))
+        config.setSearchPath(".")
+        colorspace = ocio.ColorSpace(name="lut")
+        colorspace.setTransform(
+            ocio.GroupTransform([ocio.FileTransform(src="lut.spi1d")]),
+            ocio.COLORSPACE_DIR_TO_REFERENCE
+        )
+        config.addColorSpace(colorspace)
+
+        self.assertEqual(regression.list_files(config), ["lut.spi1d"])
+        fingerprint = regression.config_fingerprint(config)
+        self.assertEqual(regression.config_fingerprint(config), fingerprint)
+
+        # an edited LUT must change the fingerprint
+        lut_path.write_text(lut_path.read_text().replace("1.0\n}", "0.5\n}"))
+        self.assertNotEqual(regression.config_fingerprint(config), fingerprint)
+        return
+
+    def test_has_delta_e(self):
+
+        config = ocio.Config.CreateRaw()
+        display = ocio.ColorSpace(
+            referenceSpace=ocio.REFERENCE_SPACE_DISPLAY,
+            name="sRGB Display"
+        )
+        config.addColorSpace(display)
+        config.addColorSpace(ocio.ColorSpace(name="linear"))
+        config.addDisplayView("sRGB Display", "Display", colorSpaceName="sRGB Display")
+
+        self.assertTrue(regression.has_delta_e(config, ("sRGB Display", None, None)))
+        self.assertTrue(regression.has_delta_e(config, (None, "sRGB Display", "Display")))
+        self.assertFalse(regression.has_delta_e(config, ("linear", None, None)))
+        self.assertFalse(regression.has_delta_e(config, (None, "sRGB", "Raw")))
+
+        golden = numpy.random.rand(8, 8, 3).astype(numpy.float32)
+        metrics = regression.compare(golden * 2.0, golden, delta_e=False)
+        self.assertIsNone(metrics["delta_e_max"])
+        self.assertGreater(metrics["max_abs"], 0.0)
+        return
+
+    def test_run(self):
+
+        import colour
+
+        root = Path(self._tmp_dir.name)
+        config_path = root / "config.ocio"
+        config_path.write_text(ocio.Config.CreateRaw().serialize())
+        image_path = root / "image.png"
+        colour.write_image(
+            numpy.random.rand(16, 16, 3).astype(numpy.float32),
+            str(image_path),
+            method="ImageIO",
+            bit_depth="uint8"
+        )
+        goldens = root / "goldens"
+
+        kwargs = {"src": "raw", "workers": 0}
+
+        results = regression.run(config_path, [image_path], goldens, **kwargs)
+        self.assertEqual([result["status"] for result in results], ["missing"])
+
+        results = regression.run(
+            config_path, [image_path], goldens, update=True, **kwargs
+        )
+        self.assertEqual([result["status"] for result in results], ["updated"])
+
+        results = regression.run(config_path, [image_path], goldens, **kwargs)
+        self.assertEqual([result["status"] for result in results], ["passed"])
+        self.assertFalse(results[0].get("cached"))
+
+        results = regression.run(config_path, [image_path], goldens, **kwargs)
+        self.assertTrue(results[0]["cached"])
+
+        # a new golden invalidate the cache
+        golden_path = next(goldens.rglob("*.npy"))
+        numpy.save(str(golden_path), numpy.load(str(golden_path)) * 0.5)
+        results = regression.run(config_path, [image_path], goldens, **kwargs)
+        self.assertEqual(results[0]["status"], "failed")
+        self.assertFalse(results[0].get("cached"))
+
+        # images with the same name don't share their goldens
+        conversion = (None, "sRGB", "Raw")
+        self.assertNotEqual(
+            regression.golden_path(goldens, "a/plate.exr", "raw", conversion),
+            regression.golden_path(goldens, "b/plate.exr", "raw", conversion)
+        )
+        self.assertEqual(
+            golden_path,
+            regression.golden_path(goldens, image_path, "raw", conversion)
+        )
+        return
+
+
+if __name__ == '__main__':
+
+    unittest.main()
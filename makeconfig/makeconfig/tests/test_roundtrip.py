@@ -0,0 +1,82 @@
+"""
+
+"""
+
+import unittest
+
+import numpy
+
+from makeconfig import roundtrip
+
+
+class Tester01(unittest.TestCase):
+
+    def test_check(self):
+
+        results = roundtrip.check(
+            ["ACEScg", "ACES2065-1", "Display P3", "sRGB"],
+            top=None
+        )
+        self.assertEqual(results["colorspaces"], 5)
+        self.assertEqual(results["matrices"], 4 * 5 * 5)
+        self.assertEqual(len(results["worst"]), 100)
+        self.assertLess(results["max_error"], roundtrip.TOLERANCE)
+        # sRGB use its published XYZ_to_RGB matrix
+        self.assertEqual(list(results["colorspaces_inexact"]), ["sRGB"])
+
+        errors = [
+            max(pair["roundtrip_error"], pair["inverse_error"])
+            for pair in results["worst"]
+        ]
+        self.assertEqual(errors, sorted(errors, reverse=True))
+        for pair in results["worst"]:
+            if "sRGB" not in (pair["source"], pair["target"]):
+                self.assertLess(pair["roundtrip_error"], 1e-9)
+
+        # the adaptation is applied after the conversion, different
+        # whitepoints are not inverses and are reported separately.
+        cross = results["cross_whitepoint"]
+        self.assertEqual(len(cross["combinations"]), 6)
+        self.assertEqual(cross["matrices"], 6 * 5 * 5)
+        self.assertGreater(cross["max_error"], roundtrip.TOLERANCE)
+        self.assertLess(cross["max_error"], roundtrip.CROSS_TOLERANCE)
+        self.assertNotEqual(
+            cross["worst"][0]["source_whitepoint"],
+            cross["worst"][0]["target_whitepoint"]
+        )
+
+        table = roundtrip.format_table(results)
+        self.assertIn("ACEScg", table)
+        self.assertIn("cross-whitepoint", table)
+        return
+
+    def test_check_catalogue(self):
+
+        # the time is checked with `roundtrip --time-budget`, wall-clock
+        # time is not reliable on loaded machines.
+        results = roundtrip.check(top=5)
+        self.assertLess(results["max_error"], roundtrip.TOLERANCE)
+        self.assertEqual(len(results["worst"]), 5)
+        self.assertEqual(roundtrip.main(["--top", "0"]), 0)
+        return
+
+    def test_check_tables(self):
+
+        forward = numpy.stack([
+            numpy.diag([2.0, 4.0, 0.5]),
+            numpy.diag([1.0, 0.0, 1.0]),
+        ])
+        backward = numpy.stack([
+            numpy.diag([0.5, 0.25, 2.0]),
+            numpy.identity(3),
+        ])
+        errors, inverse = roundtrip.check_tables(forward, backward)
+        numpy.testing.assert_allclose(errors, [0.0, 1.0])
+        self.assertEqual(inverse[0], 0.0)
+        self.assertEqual(inverse[1], numpy.inf)
+        return
+
+
+if __name__ == '__main__':
+
+    unittest.main()
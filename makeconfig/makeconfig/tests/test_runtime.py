@@ -0,0 +1,80 @@
+"""
+
+"""
+
+import concurrent.futures
+import threading
+import time
+import unittest
+
+import PyOpenColorIO as ocio
+
+from makeconfig import runtime
+
+
+class Tester01(unittest.TestCase):
+
+    def test_processor_cache(self):
+
+        config = ocio.Config.CreateRaw()
+        cache = runtime.ProcessorCache(maxsize=2)
+
+        processor = cache.get_processor(config, "raw", dst="raw")
+        self.assertIs(cache.get_processor(config, "raw", dst="raw"), processor)
+        self.assertEqual(cache.info()["hits"], 1)
+        self.assertEqual(cache.info()["misses"], 1)
+
+        cpu = cache.get_cpu_processor(config, "raw", display="sRGB", view="Raw")
+        self.assertIs(
+            cache.get_cpu_processor(config, "raw", display="sRGB", view="Raw"),
+            cpu
+        )
+        optimized = cache.get_cpu_processor(
+            config,
+            "raw",
+            display="sRGB",
+            view="Raw",
+            in_bitdepth=ocio.BIT_DEPTH_UINT8,
+            out_bitdepth=ocio.BIT_DEPTH_UINT8,
+        )
+        self.assertIsNot(optimized, cpu)
+        self.assertEqual(optimized.getInputBitDepth(), ocio.BIT_DEPTH_UINT8)
+        self.assertEqual(len(cache), 2)
+
+        self.assertRaises(ValueError, cache.get_processor, config, "raw")
+        self.assertRaises(
+            ocio.Exception,
+            cache.get_processor,
+            config,
+            "raw",
+            dst="missing"
+        )
+        return
+
+    def test_concurrent_build(self):
+
+        cache = runtime.ProcessorCache()
+        calls = list()
+        lock = threading.Lock()
+
+        def factory():
+            time.sleep(0.01)
+            with lock:
+                calls.append(1)
+            return object()
+
+        with concurrent.futures.ThreadPoolExecutor(8) as executor:
+            values = list(executor.map(
+                lambda _: cache._get(("key",), factory),
+                range(32)
+            ))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(set(map(id, values))), 1)
+        self.assertEqual(cache.info()["hits"], 31)
+        return
+
+
+if __name__ == '__main__':
+
+    unittest.main()
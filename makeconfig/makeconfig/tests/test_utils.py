@@ -2,9 +2,14 @@
 
 """
 
+import tempfile
 import unittest
 
+import numpy
 
+from makeconfig import cache
+from makeconfig import matrixpack
+from makeconfig import setup
 from makeconfig import utils
 
 
@@ -77,6 +82,180 @@ class Tester01(unittest.TestCase):
         print("[test_matrix_colorspace_transform] Finished")
         return
 
+    def test_matrix_cache(self):
+
+        cache_dir = setup.CACHE_DIR
+        matrix_pack = setup.MATRIX_PACK
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            setup.CACHE_DIR = tmp_dir
+            setup.MATRIX_PACK = None
+            utils.matrix_cache_clear()
+            try:
+
+                matrix = utils.matrix_colorspace_transform(
+                    "sRGB",
+                    "ACEScg",
+                    target_whitepoint="D65"
+                )
+                info = utils.matrix_cache_info()["matrix_colorspace_transform"]
+                self.assertEqual(info["hits"], 0)
+                self.assertEqual(info["misses"], 1)
+
+                # modifying the result must not corrupt the cache
+                matrix[0][0] = 0.0
+                cached = utils.matrix_colorspace_transform(
+                    "sRGB",
+                    "ACEScg",
+                    target_whitepoint="D65"
+                )
+                info = utils.matrix_cache_info()["matrix_colorspace_transform"]
+                self.assertEqual(info["hits"], 1)
+                self.assertNotEqual(cached[0][0], 0.0)
+
+                # memory is cleared, result should come from disk
+                utils.matrix_cache_clear()
+                from_disk = utils.matrix_colorspace_transform(
+                    "sRGB",
+                    "ACEScg",
+                    target_whitepoint="D65"
+                )
+                info = utils.matrix_cache_info()["matrix_colorspace_transform"]
+                self.assertEqual(info["disk_hits"], 1)
+                numpy.testing.assert_array_equal(from_disk, cached)
+
+                # the disk can be enabled after entries have been added
+                setup.CACHE_DIR = None
+                store = cache.MatrixCache("test_matrix_cache")
+                store.set(("identity",), numpy.identity(3))
+                self.assertIsNone(store.path)
+                setup.CACHE_DIR = tmp_dir
+                store.save()
+                self.assertTrue(store.path.exists())
+
+            finally:
+                setup.CACHE_DIR = cache_dir
+                setup.MATRIX_PACK = matrix_pack
+                utils.matrix_cache_clear()
+
+        return
+
+    def test_matrix_pack(self):
+
+        matrix_pack = setup.MATRIX_PACK
+        with tempfile.TemporaryDirectory() as tmp_dir:
+
+            setup.MATRIX_PACK = matrixpack.build(
+                path=f"{tmp_dir}/matrices.npz",
+                colorspaces=["sRGB", "ACEScg", "Display P3"]
+            )
+            try:
+
+                pack = matrixpack.get_pack()
+                self.assertTrue(pack.is_compatible())
+
+                for arguments in [
+                    ("sRGB", "XYZ", None, None),
+                    ("XYZ", "Display P3", "D65", None),
+                    ("sRGB", "ACEScg", None, "D65"),
+                    ("sRGB", "XYZ", "D60", "D65"),
+                ]:
+                    from_pack = pack.get(*arguments)
+                    setup.MATRIX_PACK = None
+                    computed = utils.matrix_colorspace_transform(*arguments)
+                    setup.MATRIX_PACK = pack.path
+                    numpy.testing.assert_array_equal(from_pack, computed)
+
+                # not in the pack or invalid
+                self.assertIsNone(pack.get("sRGB", "ACES2065-1"))
+                self.assertIsNone(pack.get("sRGB", "XYZ", "D65", None))
+
+                # built with another colour-science version
+                pack.colour_version = "0.0.0"
+                self.assertFalse(pack.is_compatible())
+                self.assertIsNone(matrixpack.get_pack())
+
+            finally:
+                setup.MATRIX_PACK = matrix_pack
+
+        return
+
+    def test_matrix_colorspace_table(self):
+
+        colorspaces = ["sRGB", "ACEScg", "ACES2065-1", "Display P3", "XYZ"]
+
+        table = utils.matrix_colorspace_table(colorspaces)
+        self.assertEqual(table.shape, (5, 5, 3, 3))
+
+        for source_index, source in enumerate(colorspaces):
+            for target_index, target in enumerate(colorspaces):
+                if source == target == "XYZ":
+                    continue
+                numpy.testing.assert_allclose(
+                    table[source_index, target_index],
+                    utils.matrix_colorspace_transform(source, target),
+                    rtol=0,
+                    atol=1e-15
+                )
+
+        table = utils.matrix_colorspace_table(
+            colorspaces,
+            source_whitepoint="D60",
+            target_whitepoint="D65"
+        )
+        numpy.testing.assert_allclose(
+            table[0, 1],
+            utils.matrix_colorspace_transform(
+                "sRGB",
+                "ACEScg",
+                source_whitepoint="D60",
+                target_whitepoint="D65"
+            ),
+            rtol=0,
+            atol=1e-15
+        )
+
+        self.assertRaises(
+            ValueError,
+            utils.matrix_colorspace_table,
+            colorspaces,
+            target_whitepoint="D65"
+        )
+        return
+
+    def test_matrix_format_ocio(self):
+
+        matrix = utils.matrix_colorspace_transform("sRGB", "XYZ")
+        expected = [
+            *matrix[0], 0.0,
+            *matrix[1], 0.0,
+            *matrix[2], 0.0,
+            0.0, 0.0, 0.0, 1.0
+        ]
+        self.assertEqual(utils.matrix_format_ocio(matrix), expected)
+
+        stack = utils.matrix_colorspace_table(["sRGB", "ACEScg", "XYZ"])
+        stack = stack.reshape(-1, 3, 3)
+        formatted = utils.matrix_format_ocio(stack)
+        self.assertEqual(len(formatted), 9)
+        for index, params in enumerate(formatted):
+            self.assertEqual(params, utils.matrix_format_ocio(stack[index]))
+
+        self.assertEqual(
+            utils.matrix_3x3_to_4x4(stack).shape,
+            (9, 4, 4)
+        )
+
+        # every value of a preallocated buffer is written
+        out = numpy.full((9, 4, 4), numpy.nan)
+        utils.matrix_3x3_to_4x4(stack, out=out)
+        numpy.testing.assert_array_equal(out, utils.matrix_3x3_to_4x4(stack))
+        self.assertEqual(
+            utils.matrix_3x3_to_4x4(stack.astype(numpy.float32)).dtype,
+            numpy.float32
+        )
+        return
+
 
 if __name__ == '__main__':
 
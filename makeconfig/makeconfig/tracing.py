@@ -0,0 +1,214 @@
+"""
+
+"""
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger("mkc.tracing")
+
+ENV_VAR = "MKC_TRACE"  # "1" to enable tracing, or the path of the trace file.
+
+
+class _Span:
+    """
+    Context manager recording the duration of its block to a Tracer.
+    """
+
+    __slots__ = ("tracer", "name", "category", "start")
+
+    def __init__(self, tracer, name, category):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        end = time.perf_counter()
+        self.tracer.add_event(self.name, self.category, self.start, end)
+        return False
+
+
+class _NullSpan:
+    """
+    Context manager doing nothing, used when tracing is disabled.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullTracer:
+    """
+    Tracer used when tracing is disabled, record nothing.
+    """
+
+    enabled = False
+    path = None
+
+    def span(self, name, category=""):
+        return _NULL_SPAN
+
+    def write(self, path=None):
+        return None
+
+    def summary(self):
+        return ""
+
+
+NULL_TRACER = NullTracer()
+
+
+class Tracer:
+    """
+    Record the duration of named blocks of code and export them as a
+    Chrome/Perfetto trace (chrome://tracing or https://ui.perfetto.dev).
+
+    Args:
+        name(str): name of the traced process.
+        path(str or Path or None): default path of the trace file.
+    """
+
+    enabled = True
+
+    def __init__(self, name, path=None):
+
+        self.name = name
+        self.path = Path(path) if path else Path(f"{name}.trace.json")
+        self.events = list()
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+        return
+
+    def span(self, name, category=""):
+        """
+        Args:
+            name(str): name of the traced block.
+            category(str): arbitrary category to group events.
+
+        Returns:
+            context manager timing its block.
+        """
+        return _Span(self, name, category)
+
+    def add_event(self, name, category, start, end):
+        """
+        Args:
+            name(str):
+            category(str):
+            start(float): time.perf_counter() value
+            end(float): time.perf_counter() value
+        """
+
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - self._origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        with self._lock:
+            self.events.append(event)
+
+        return
+
+    def to_chrome(self):
+        """
+        Returns:
+            dict: trace in the Chrome trace event format.
+        """
+
+        metadata = {
+            "name": "process_name",
+            "ph": "M",
+            "pid": os.getpid(),
+            "args": {"name": self.name},
+        }
+        with self._lock:
+            events = [metadata] + list(self.events)
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path=None):
+        """
+        Write the trace to disk.
+
+        Args:
+            path(str or Path or None): self.path if None.
+
+        Returns:
+            Path: path of the written file.
+        """
+
+        path = Path(path or self.path).absolute()
+        path.write_text(json.dumps(self.to_chrome()), encoding="utf-8")
+
+        logger.info(f"[Tracer][write] Trace written to <{path}>")
+        return path
+
+    def summary(self):
+        """
+        Returns:
+            str: table with the total duration of each traced name.
+        """
+
+        totals = dict()
+        with self._lock:
+            for event in self.events:
+                count, duration = totals.get(event["name"], (0, 0.0))
+                totals[event["name"]] = (count + 1, duration + event["dur"])
+
+        lines = [f"{'name':<32} {'count':>6} {'total ms':>10} {'mean ms':>10}"]
+        for name, (count, duration) in sorted(
+                totals.items(),
+                key=lambda item: item[1][1],
+                reverse=True
+        ):
+            lines.append(
+                f"{name:<32} {count:>6} {duration / 1000:>10.3f} "
+                f"{duration / 1000 / count:>10.3f}"
+            )
+
+        return "\n".join(lines)
+
+
+def get_tracer(name, trace=None):
+    """
+    Args:
+        name(str): name of the traced process.
+        trace(bool or str or Path or None):
+            True or a file path to enable tracing, False to disable it,
+            None to use the MKC_TRACE environment variable.
+
+    Returns:
+        Tracer or NullTracer:
+    """
+
+    if trace is None:
+        trace = os.environ.get(ENV_VAR) or False
+        if trace in ("0", "1"):
+            trace = bool(int(trace))
+
+    if not trace:
+        return NULL_TRACER
+
+    path = None if trace is True else trace
+    return Tracer(name, path=path)
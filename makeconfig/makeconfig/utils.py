@@ -1,15 +1,20 @@
 """
 
 """
+import functools
 import logging
 
-import colour
 import numpy
 
+from . import cache
+from . import matrixpack
 from . import setup
 
 logger = logging.getLogger("mkc.utils")
 
+_CACHE_WHITEPOINT = cache.MatrixCache("matrix_whitepoint_transform")
+_CACHE_COLORSPACE = cache.MatrixCache("matrix_colorspace_transform")
+
 
 def check_config_init(func: classmethod):
     """
@@ -21,6 +26,7 @@ def check_config_init(func: classmethod):
         function: wrapper function that execute passed func
     """
 
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
 
         if not args[0].config:
@@ -35,7 +41,7 @@ def check_config_init(func: classmethod):
     return wrapper
 
 
-def matrix_3x3_to_4x4(matrix):
+def matrix_3x3_to_4x4(matrix, out=None):
     """
     Convert a 3x3 matrix to a 4x4 matrix as such :
 
@@ -44,23 +50,53 @@ def matrix_3x3_to_4x4(matrix):
      [ value  value  value  0. ]
      [ 0.     0.     0.    1. ]]
 
+    Also accept a (N,3,3) stack of matrices, in which case a (N,4,4) stack
+    is returned.
+
     Args:
-        matrix(numpy.ndarray):
+        matrix(numpy.ndarray): 3x3 matrix or (N,3,3) stack
+        out(numpy.ndarray or None):
+            preallocated array of shape (4,4) or (N,4,4) to write into,
+            every value is written. Default to the dtype of the matrix if
+            floating, else float64.
 
     Returns:
-        numpy.ndarray: 4x4 matrix
+        numpy.ndarray: 4x4 matrix or (N,4,4) stack
     """
 
-    output = numpy.append(matrix, [[0], [0], [0]], axis=1)
-    output = numpy.append(output, [[0, 0, 0, 1]], axis=0)
+    matrix = numpy.asarray(matrix)
 
-    return output
+    if out is None:
+        out = numpy.empty(
+            matrix.shape[:-2] + (4, 4),
+            dtype=_float_dtype(matrix)
+        )
+
+    out[..., :3, :3] = matrix
+    out[..., :3, 3] = 0.0
+    out[..., 3, :3] = 0.0
+    out[..., 3, 3] = 1.0
+
+    return out
+
+
+def _float_dtype(array):
+    """
+    Returns:
+        numpy.dtype: of the array if floating, else float64.
+    """
+    if numpy.issubdtype(array.dtype, numpy.floating):
+        return array.dtype
+    return numpy.dtype(numpy.float64)
 
 
 def matrix_format_oneline(matrix):
     """
     Convert the matrix to a one line list (no nested list).
 
+    Also accept a (N,X,X) stack of matrices, in which case a list of N
+    single depth lists is returned.
+
     Args:
         matrix(numpy.ndarray):
 
@@ -68,7 +104,8 @@ def matrix_format_oneline(matrix):
         list: matrix as a single depth list.
     """
 
-    output = numpy.concatenate(matrix).tolist()
+    matrix = numpy.asarray(matrix)
+    output = matrix.reshape(matrix.shape[:-2] + (-1,)).tolist()
 
     return output
 
@@ -77,13 +114,24 @@ def matrix_format_ocio(matrix):
     """
     Format the given 3x3 matrix to an OCIO parameters complient list.
 
+    Also accept a (N,3,3) stack of matrices, in which case a list of N
+    parameters lists is returned. All the matrices are written in a
+    single (N,16) buffer.
+
     Args:
-        matrix(numpy.ndarray): 3x3 matrix
+        matrix(numpy.ndarray): 3x3 matrix or (N,3,3) stack
 
     Returns:
         list: 4x4 matrix in a single line list.
     """
-    return matrix_format_oneline(matrix_3x3_to_4x4(matrix))
+
+    matrix = numpy.asarray(matrix)
+    buffer = numpy.empty(matrix.shape[:-2] + (16,), dtype=_float_dtype(matrix))
+
+    # the 4x4 view share the memory of the (N,16) buffer
+    matrix_3x3_to_4x4(matrix, out=buffer.reshape(matrix.shape[:-2] + (4, 4)))
+
+    return buffer.tolist()
 
 
 def matrix_whitepoint_transform(source_whitepoint,
@@ -102,12 +150,25 @@ def matrix_whitepoint_transform(source_whitepoint,
          to reference viewing conditions. A 3x3 matrix.
     """
 
+    import colour  # slow import, only when needed
+
+    cache_key = (
+        tuple(numpy.ravel(source_whitepoint).tolist()),
+        tuple(numpy.ravel(target_whitepoint).tolist()),
+        transform,
+        colour.__version__,
+    )
+    matrix = _CACHE_WHITEPOINT.get(cache_key)
+    if matrix is not None:
+        return matrix
+
     matrix = colour.adaptation.matrix_chromatic_adaptation_VonKries(
         colour.xy_to_XYZ(source_whitepoint),
         colour.xy_to_XYZ(target_whitepoint),
         transform=transform
     )
 
+    _CACHE_WHITEPOINT.set(cache_key, matrix)
     return matrix
 
 
@@ -122,6 +183,11 @@ def matrix_colorspace_transform(source,
      In that case it is recommended to pass a whitepoint as source or target
      (depnds what XYZ is) to perform chromatic adaptation.
 
+     Results are first looked up in the precomputed matrix pack
+     (see setup.MATRIX_PACK) then cached in memory and on disk
+     (see setup.CACHE_DIR) so the same conversion is only computed once.
+     colour-science is only imported if the result needs to be computed.
+
     Args:
         source(str): source colorspace, use "XYZ" for CIE-XYZ.
         target(str): target colorspace, use "XYZ" for CIE-XYZ.
@@ -132,6 +198,32 @@ def matrix_colorspace_transform(source,
         numpy.ndarray: 3x3 matrix
     """
 
+    pack = matrixpack.get_pack()
+    if pack:
+        matrix = pack.get(
+            source,
+            target,
+            source_whitepoint,
+            target_whitepoint
+        )
+        if matrix is not None:
+            return matrix
+
+    import colour  # slow import, only when needed
+
+    cache_key = (
+        source,
+        target,
+        source_whitepoint,
+        target_whitepoint,
+        setup.CAT,
+        setup.NUM_ROUND,
+        colour.__version__,
+    )
+    matrix = _CACHE_COLORSPACE.get(cache_key)
+    if matrix is not None:
+        return matrix
+
     illum_1931 = colour.CCS_ILLUMINANTS["CIE 1931 2 Degree Standard Observer"]
 
     perform_cat = True if source_whitepoint or target_whitepoint else False
@@ -175,4 +267,183 @@ def matrix_colorspace_transform(source,
 
         matrix = numpy.dot(matrix_cat, matrix)
 
-    return matrix
\ No newline at end of file
+    _CACHE_COLORSPACE.set(cache_key, matrix)
+    return matrix
+
+
+def matrix_whitepoint_table(source_whitepoints,
+                            target_whitepoints,
+                            transform="Bradford"):
+    """ Vectorized version of matrix_whitepoint_transform() computing the
+    chromatic adaptation matrix for every source/target whitepoint pair.
+
+    Args:
+        source_whitepoints(numpy.ndarray): (N,2) stack of xy coordinates
+        target_whitepoints(numpy.ndarray): (M,2) stack of xy coordinates
+        transform(str): method to use.
+
+    Returns:
+        numpy.ndarray: (N,M,3,3) stack where [i, j] adapts from
+         source_whitepoints[i] to target_whitepoints[j].
+    """
+
+    import colour  # slow import, only when needed
+
+    matrix_cat = colour.adaptation.CHROMATIC_ADAPTATION_TRANSFORMS[transform]
+
+    # cone responses of each whitepoint, (N,3) and (M,3)
+    lms_source = numpy.einsum(
+        "...i,...ij->...j",
+        colour.xy_to_XYZ(numpy.asarray(source_whitepoints)),
+        numpy.transpose(matrix_cat)
+    )
+    lms_target = numpy.einsum(
+        "...i,...ij->...j",
+        colour.xy_to_XYZ(numpy.asarray(target_whitepoints)),
+        numpy.transpose(matrix_cat)
+    )
+    # (N,M,3) diagonal of the Von Kries scaling matrix
+    gain = lms_target[numpy.newaxis, :, :] / lms_source[:, numpy.newaxis, :]
+
+    # inv(M) . diag(gain) . M
+    matrix = numpy.linalg.inv(matrix_cat) * gain[..., numpy.newaxis, :]
+    matrix = numpy.matmul(matrix, matrix_cat)
+
+    return matrix
+
+
+def matrix_colorspace_table(colorspaces=None,
+                            source_whitepoint=None,
+                            target_whitepoint=None):
+    """ Compute the conversion matrix for every pair of the given colorspaces
+    at once. Give the same results as calling matrix_colorspace_transform()
+    on each pair.
+
+    You can use "XYZ" in colorspaces. Same rules as
+    matrix_colorspace_transform() apply for the whitepoints.
+
+    Args:
+        colorspaces(list of str or None):
+            colorspaces names from colour.RGB_COLOURSPACES,
+            all of them if None.
+        source_whitepoint(str): whitepoint name for all sources,
+        target_whitepoint(str): whitepoint name for all targets,
+
+    Returns:
+        numpy.ndarray: (N,N,3,3) stack where [i, j] is the matrix from
+         colorspaces[i] to colorspaces[j].
+    """
+
+    import colour  # slow import, only when needed
+
+    if colorspaces is None:
+        colorspaces = list(colour.RGB_COLOURSPACES.keys())
+
+    illum_1931 = colour.CCS_ILLUMINANTS["CIE 1931 2 Degree Standard Observer"]
+
+    perform_cat = True if source_whitepoint or target_whitepoint else False
+    is_xyz = numpy.array([name == "XYZ" for name in colorspaces])
+
+    if perform_cat and is_xyz.any():
+        if not target_whitepoint:
+            raise ValueError("Please give a target_whitepoint")
+        if not source_whitepoint:
+            raise ValueError("Please give a source_whitepoint")
+
+    identity = numpy.identity(3)
+    rgb_cs = [
+        None if name == "XYZ" else colour.RGB_COLOURSPACES[name]
+        for name in colorspaces
+    ]
+    rgb_to_xyz = numpy.stack([
+        identity if cs is None else cs.matrix_RGB_to_XYZ for cs in rgb_cs
+    ])
+    xyz_to_rgb = numpy.stack([
+        identity if cs is None else cs.matrix_XYZ_to_RGB for cs in rgb_cs
+    ])
+
+    if perform_cat:
+
+        # same as the scalar function : no native adaptation, explicit
+        # adaptation applied after using whitepoint names.
+        matrix = numpy.matmul(
+            xyz_to_rgb[numpy.newaxis, :],
+            rgb_to_xyz[:, numpy.newaxis]
+        )
+        source_wp = numpy.stack([
+            illum_1931[source_whitepoint or cs.whitepoint_name]
+            for cs in rgb_cs
+        ])
+        target_wp = numpy.stack([
+            illum_1931[target_whitepoint or cs.whitepoint_name]
+            for cs in rgb_cs
+        ])
+
+    else:
+
+        whitepoints = numpy.stack([
+            illum_1931["D65"] if cs is None else cs.whitepoint
+            for cs in rgb_cs
+        ])
+        matrix_cat = matrix_whitepoint_table(
+            whitepoints,
+            whitepoints,
+            transform=setup.CAT
+        )
+        # XYZ has no whitepoint so no adaptation is performed with it
+        matrix_cat[is_xyz, :] = identity
+        matrix_cat[:, is_xyz] = identity
+        matrix = numpy.matmul(matrix_cat, rgb_to_xyz[:, numpy.newaxis])
+        matrix = numpy.matmul(xyz_to_rgb[numpy.newaxis, :], matrix)
+
+    # conversions from/to XYZ use rounded matrices, in one pass.
+    rounded_rgb_to_xyz = rgb_to_xyz.round(setup.NUM_ROUND)
+    rounded_xyz_to_rgb = xyz_to_rgb.round(setup.NUM_ROUND)
+    matrix[:, is_xyz] = rounded_rgb_to_xyz[:, numpy.newaxis]
+    matrix[is_xyz, :] = rounded_xyz_to_rgb[numpy.newaxis, :]
+    matrix[numpy.ix_(is_xyz, is_xyz)] = identity
+
+    if perform_cat:
+        matrix = numpy.matmul(
+            matrix_whitepoint_table(source_wp, target_wp, transform=setup.CAT),
+            matrix
+        )
+
+    return matrix
+
+
+def matrix_cache_info():
+    """
+    Returns:
+        dict: hits/misses statistics for each matrix cache.
+    """
+    info = {
+        _CACHE_WHITEPOINT.name: _CACHE_WHITEPOINT.info(),
+        _CACHE_COLORSPACE.name: _CACHE_COLORSPACE.info(),
+    }
+    pack = matrixpack.get_pack()
+    if pack:
+        info["matrix_pack"] = pack.info()
+    return info
+
+
+def matrix_cache_save():
+    """
+    Write the newly computed matrices to the disk cache.
+    Called automatically when the interpreter exits.
+    """
+    _CACHE_WHITEPOINT.save()
+    _CACHE_COLORSPACE.save()
+    return
+
+
+def matrix_cache_clear(disk=False):
+    """
+    Empty the matrix caches.
+
+    Args:
+        disk(bool): if True also delete the cache files stored on disk.
+    """
+    _CACHE_WHITEPOINT.clear(disk=disk)
+    _CACHE_COLORSPACE.clear(disk=disk)
+    return
\ No newline at end of file
@@ -1,6 +1,7 @@
 """
 
 """
+import argparse
 import logging
 import os
 import sys
@@ -11,9 +12,9 @@ mck_dir = Path(__file__).parent.parent.parent.parent / "makeconfig"
 sys.path.append(str(mck_dir))
 
 # configure env before staring makeconfig
-os.environ["MKC_LOG_LVL"] = "INFO"  # TODO doesn't work
+os.environ["MKC_LOG_LVL"] = "INFO"
 
-from Versatile import Versatile
+from makeconfig import buildcache
 
 # configure logging
 logger = logging.getLogger("create_config")
@@ -26,22 +27,33 @@ _handler.setFormatter(
 logger.addHandler(_handler)
 
 
-def cook():
+RECIPE = f"{Path(__file__).parent / 'Versatile.py'}:Versatile"
+WRITE_PATH = Path(__file__).parent.parent.parent / "config" / "config.ocio"
 
-    versatile = Versatile()
-    versatile.validate()
 
-    # logger.debug(
-    #     "\n\n"
-    #     "--- config.ocio -----------------\n\n"
-    #     f"{versatile}"
-    # )
+def cook(use_cache=True):
+    """
+    Args:
+        use_cache(bool):
+            False to always cook Versatile, else the config is restored
+            from the build cache if nothing changed since the last build.
+    """
 
-    versatile.write_to_disk("../../config/config.ocio")
+    restored = buildcache.build(RECIPE, WRITE_PATH, use_cache=use_cache)
+    logger.info(
+        f"[cook] config {'restored from cache' if restored else 'cooked'} "
+        f"to <{WRITE_PATH.resolve()}>"
+    )
 
     return
 
 
 if __name__ == '__main__':
 
-    cook()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always cook the config, ignoring the build cache."
+    )
+    cook(use_cache=not parser.parse_args().no_cache)
\ No newline at end of file
@@ -4,11 +4,20 @@ testA
 decode and encode a 8bit sRGB image
 output should look the same as input
 """
+import sys
 from pathlib import Path
 
+import numpy
 import PyOpenColorIO as ocio
 import colour
 
+# register makeconfig package source
+mck_dir = Path(__file__).parent.parent.parent.parent.parent / "makeconfig"
+sys.path.append(str(mck_dir))
+
+from makeconfig import imaging
+from makeconfig import runtime
+
 CONFIG_PATH = Path("../../../config/config.ocio").resolve()
 IMG_BOB = Path("./input/img/bob_ross.jpg")
 WRITE_ROOT = Path("./output/testA")
@@ -20,9 +29,8 @@ def log(message):
     return
 
 
-def apply_op(img, processor):
+def apply_op(img, cpu, out=None):
 
-    cpu = processor.getDefaultCPUProcessor()
     log(
         f"[appy_op] got cpu processor :\n"
         f"  in bitdepth<{cpu.getInputBitDepth()}>\n"
@@ -31,43 +39,53 @@ def apply_op(img, processor):
     )
 
     # apply conversion
-    cpu.applyRGBA(img)
-    log(f"[appy_op] processor applied.")
+    stats = imaging.apply_processor(cpu, img, out=out)
+    log(
+        f"[appy_op] processor applied "
+        f"({stats['megapixels_per_second']:.1f}MP/s)."
+    )
 
     return
 
 
-def apply_cs_op(img, config, csin, csout):
+def apply_cs_op(img, config, csin, csout, out=None,
+                optimization=ocio.OPTIMIZATION_DEFAULT):
 
-    processor = config.getProcessor(
+    # processor specialized for the bit-depths of the arrays
+    cpu = runtime.get_cpu_processor(
+        config,
         csout,
-        csin,
+        dst=csin,
+        optimization=optimization,
+        in_bitdepth=imaging.get_bitdepth(img.dtype),
+        out_bitdepth=imaging.get_bitdepth((img if out is None else out).dtype),
     )
     log(f"[apply_cs_op] processor from <{csin}> to <{csout}>")
 
-    apply_op(img=img, processor=processor)
+    apply_op(img=img, cpu=cpu, out=out)
 
     return
 
 
-def apply_display_op(img, config, display, view, direction):
+def apply_display_op(img, config, display, view, direction, out=None):
 
-    processor = config.getProcessor(
+    cpu = runtime.get_cpu_processor(
+        config,
         ocio.ROLE_SCENE_LINEAR,
-        display,
-        view,
-        direction
+        display=display,
+        view=view,
+        direction=direction
     )
     log(f"[apply_display_op] processor from display:<{display}> to view:<{view}>")
 
-    apply_op(img=img, processor=processor)
+    apply_op(img=img, cpu=cpu, out=out)
     return
 
 
 def get_source():
 
-    # source array
-    img = colour.read_image(str(IMG_BOB))
+    # source array, kept in 8bit as the processor can directly read it
+    img = colour.read_image(str(IMG_BOB), bit_depth="uint8")
     log(f"[get_source] Image <{IMG_BOB.name}> read :<{img.shape}>")
 
     return img
@@ -85,13 +103,14 @@ def run_versatile():
     log(f"[{loggername}] Config validated")
 
     img = get_source()
-    img_out = img.copy()
+    img_out = numpy.empty(img.shape, dtype=numpy.float32)
 
     apply_cs_op(
-        img_out,
+        img,
         config=config,
         csin="sRGB",
-        csout="sRGB - linear"
+        csout="sRGB - linear",
+        out=img_out
     )
     apply_display_op(
         img_out,
@@ -110,11 +129,65 @@ def run_versatile():
         bit_depth='uint8'
     )
     log(f"[{loggername}] Image written to <{img_out_path.resolve()}>")
+    log(f"[{loggername}] Processor cache: {runtime.PROCESSOR_CACHE.info()}")
     log(f"[{loggername}] Finished")
     return
 
 
+def run_versatile_streaming():
+    """
+    Same as run_versatile() but the image is processed from a raw float
+    buffer on disk, strip by strip, as for frames too big for the memory.
+    """
+
+    loggername = "run_versatile_streaming"
+
+    config = ocio.Config().CreateFromFile(str(CONFIG_PATH))  # type: ocio.Config
+    log(f"[{loggername}] Using OCIO config <{config.getName()}>")
+
+    # simulate a huge frame already stored as a raw buffer
+    img = colour.read_image(str(IMG_BOB)).astype(numpy.float32)
+    raw_path = WRITE_ROOT / "bobross.raw"
+    img.tofile(str(raw_path))
+    shape = img.shape
+    del img
+
+    for csin, csout, display in [
+        ("sRGB", "sRGB - linear", None),
+        (None, None, "sRGB"),
+    ]:
+        if display:
+            cpu = runtime.get_cpu_processor(
+                config,
+                ocio.ROLE_SCENE_LINEAR,
+                display=display,
+                view="Display",
+                direction=ocio.TRANSFORM_DIR_INVERSE
+            )
+        else:
+            cpu = runtime.get_cpu_processor(config, csout, dst=csin)
+
+        # processed in place, only a few strips are mapped at once.
+        stats = imaging.apply_processor_raw(cpu, raw_path, shape)
+        log(
+            f"[{loggername}] {stats['strips']} strips processed "
+            f"({stats['megapixels_per_second']:.1f}MP/s)."
+        )
+
+    img_out_path = WRITE_ROOT / "bobross.versatile.streaming.jpg"
+    colour.write_image(
+        imaging.open_raw(raw_path, shape),
+        str(img_out_path),
+        method="ImageIO",
+        bit_depth='uint8'
+    )
+    raw_path.unlink()
+    log(f"[{loggername}] Image written to <{img_out_path.resolve()}>")
+    return
+
+
 if __name__ == '__main__':
 
     run_versatile()
+    # run_versatile_streaming()
     # run_rs()
\ No newline at end of file